@@ -2,7 +2,7 @@
 # This code runs the app
 
 from src.common import create_parser, read_config
-from src.ui import run_app
+from src.ui import run_app, warm_up_app
 
 # parsed_args = create_parser()  # Create parsed arguments
 config = read_config("config.yml")  # Get config data
@@ -10,6 +10,9 @@ app = run_app(config)  # Run app including design engine as backend
 server = app.server
 
 if __name__ == "__main__":
+    # Warm up the engine, gunicorn does this in every worker (see gunicorn.conf.py)
+    warm_up_app(config)
+
     # Run app
     app.run_server(host=config["app"]["host"],
                    port=config["app"]["port"])
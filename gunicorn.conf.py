@@ -0,0 +1,24 @@
+# Gunicorn reads this file from the working directory of the app
+
+from src.common import read_config
+
+# Threads let a worker answer requests with a busy response while designs are computed,
+# the admission control of the app limits the engine calls per worker to fewer calls than threads
+threads = read_config("config.yml")["app"]["threads"]
+
+
+def on_starting(server):
+    """Clears the store of the previous deploy and preloads the shared topology once in the master process before the workers start."""
+    from src.common import read_config
+    from src.engine import open_store
+
+    open_store(read_config("config.yml"), clear=True)
+
+
+def post_worker_init(worker):
+    """Warms up the engine of a worker after it loaded the app and before it accepts requests."""
+    # The app module is already imported by the worker
+    import app
+    from src.ui import warm_up_app
+
+    warm_up_app(app.config)
@@ -0,0 +1,177 @@
+from typing import Dict, Iterator, List
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import time
+import flask
+
+
+class AdmissionController:
+    """Limits the engine calls of a worker process. A limited number of calls run at once,
+       further calls wait in a bounded queue and calls beyond the queue are rejected at once.
+       Every client has a token bucket which limits its rate of calls.
+    """
+
+    def __init__(self, max_concurrent: int = 2, max_queued: int = 4, queue_timeout: float = 10., rate: float = 1., burst: int = 5, max_clients: int = 10000):
+        """Creates an admission controller.
+
+        Args:
+            max_concurrent (int, optional): Number of engine calls running at once. Defaults to 2.
+            max_queued (int, optional): Number of engine calls waiting for a slot. Defaults to 4.
+            queue_timeout (float, optional): Seconds a call waits for a slot before it is rejected. Defaults to 10..
+            rate (float, optional): Calls per second refilled into the bucket of a client. Defaults to 1..
+            burst (int, optional): Size of the bucket of a client. Defaults to 5.
+            max_clients (int, optional): Number of client buckets kept, the least recent are dropped. Defaults to 10000.
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+
+        self.condition = threading.Condition()
+        self.active = 0
+        self.queued = 0
+        self.buckets = OrderedDict()
+        self.counts = {"admitted": 0, "busy": 0, "timeout": 0, "rate_limited": 0}
+
+    def allow(self, client: str) -> bool:
+        """Takes a token from the bucket of a client, must be called holding the condition.
+
+        Args:
+            client (str): Identifier of the client, e.g. its address.
+
+        Returns:
+            bool: Whether the client had a token left.
+        """
+
+        # Refill the bucket by the time since the last call
+        now = time.monotonic()
+        tokens, last = self.buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+        # Keep the bucket as most recent and drop the least recent buckets
+        allowed = tokens >= 1
+        self.buckets[client] = (tokens - 1 if allowed else tokens, now)
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+
+        return allowed
+
+    def acquire(self, client: str, slots: int = 1) -> str:
+        """Admits an engine call, waiting in the queue if all slots are taken.
+
+        Args:
+            client (str): Identifier of the client, e.g. its address.
+            slots (int, optional): Number of slots of the call, e.g. one per process it runs on. Defaults to 1.
+
+        Returns:
+            str: "admitted", "rate_limited", "busy" if the queue is full or "timeout" if no slot was free in time.
+        """
+
+        if slots > self.max_concurrent:
+            raise ValueError(f"A call of {slots} slots is never admitted with {self.max_concurrent} slots")
+
+        with self.condition:
+            if not self.allow(client):
+                status = "rate_limited"
+            elif self.active + slots <= self.max_concurrent:
+                status = "admitted"
+            elif self.queued >= self.max_queued:
+                status = "busy"
+            else:
+                # Wait for enough slots
+                self.queued += 1
+                free = self.condition.wait_for(lambda: self.active + slots <= self.max_concurrent, self.queue_timeout)
+                self.queued -= 1
+                status = "admitted" if free else "timeout"
+
+            if status == "admitted":
+                self.active += slots
+            self.counts[status] += 1
+
+        return status
+
+    def release(self, slots: int = 1):
+        """Releases the slots of an admitted engine call.
+
+        Args:
+            slots (int, optional): Number of slots of the call. Defaults to 1.
+        """
+
+        with self.condition:
+            self.active -= slots
+            self.condition.notify_all()
+
+    @contextmanager
+    def admit(self, client: str, slots: int = 1) -> Iterator[str]:
+        """Holds slots for the engine calls of the context if the call is admitted.
+
+        Args:
+            client (str): Identifier of the client, e.g. its address.
+            slots (int, optional): Number of slots of the call, e.g. one per process it runs on. Defaults to 1.
+
+        Yields:
+            Iterator[str]: Status of the admission, see acquire.
+        """
+
+        status = self.acquire(client, slots)
+        try:
+            yield status
+        finally:
+            if status == "admitted":
+                self.release(slots)
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Gets the current load and the counts of admitted and rejected calls.
+
+        Returns:
+            Dict[str, int]: Metrics of the controller.
+        """
+
+        with self.condition:
+            return {
+                "active": self.active,
+                "queued": self.queued,
+                "max_concurrent": self.max_concurrent,
+                "max_queued": self.max_queued,
+                "clients": len(self.buckets),
+                **self.counts,
+            }
+
+
+def check_threads(admissions: List[dict], threads: int):
+    """Checks that the engine calls which run or wait leave a thread of the worker free,
+       which answers other requests and rejects calls beyond the limits at once.
+
+    Args:
+        admissions (List[dict]): Settings of the admission controllers of a worker.
+        threads (int): Number of threads of a worker.
+
+    Raises:
+        ValueError: If the admitted and queued calls can take all threads.
+    """
+
+    blocking = sum(admission["max_concurrent"] + admission["max_queued"] for admission in admissions)
+    if blocking >= threads:
+        raise ValueError(f"Admission lets {blocking} engine calls run or wait, but a worker has only {threads} threads")
+
+
+def get_client(trusted_proxies: int = 0) -> str:
+    """Gets the address of the client of the current request. Clients can send any X-Forwarded-For header,
+       hence the header is only read behind proxies, each of which appends the address it received the request from.
+
+    Args:
+        trusted_proxies (int, optional): Number of proxies in front of the app, e.g. 1 on Azure App Service. Defaults to 0.
+
+    Returns:
+        str: Address of the client.
+    """
+
+    # The address appended by the outermost trusted proxy is the first one which is not sent by the client
+    forwarded = [address.strip() for address in flask.request.headers.get("X-Forwarded-For", "").split(",") if address.strip()]
+    if trusted_proxies > 0 and len(forwarded) >= trusted_proxies:
+        return forwarded[-trusted_proxies]
+
+    return str(flask.request.remote_addr)
@@ -0,0 +1,203 @@
+from typing import Dict, Optional, Tuple
+import json
+import numpy as np
+import matplotlib.tri as mtri
+
+from src.engine import get_store, mesh_design
+from src.mesh import is_watertight
+from src.store import get_key
+
+
+def get_area_vectors(points: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculates the cross products of the edges of triangles, whose lengths are twice the areas of the triangles.
+       Coordinates are stored component wise, which makes gathering the corners and the products faster.
+
+    Args:
+        points (np.ndarray): Points with shape (3, num_points).
+        triangles (np.ndarray): Vertex indices of the triangles with shape (num_triangles, 3).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: First corners and cross products of the triangles with shape (3, num_triangles).
+    """
+
+    first, second, third = points[:, triangles[:, 0]], points[:, triangles[:, 1]], points[:, triangles[:, 2]]
+    u, v = second - first, third - first
+
+    cross = np.stack([u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]])
+
+    return first, cross
+
+
+def get_volume(first: np.ndarray, cross: np.ndarray) -> float:
+    """Calculates the enclosed volume of a closed mesh as the sum of the signed volumes of the tetrahedra
+       spanned by the origin and every triangle. The triple product of the corners equals the product
+       of the first corner and the cross product of the edges, hence the cross products are reused.
+
+    Args:
+        first (np.ndarray): First corners of the triangles with shape (3, num_triangles).
+        cross (np.ndarray): Cross products of the edges of the triangles with shape (3, num_triangles).
+
+    Returns:
+        float: Volume, independent of the orientation of the winding.
+    """
+
+    return abs(float(np.einsum("ij,ij->", first, cross))) / 6
+
+
+def get_vertex_vectors(num_points: int, triangles: np.ndarray, areas: np.ndarray, cross: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distributes the areas and area weighted normals of triangles onto their vertices.
+
+    Args:
+        num_points (int): Number of points.
+        triangles (np.ndarray): Vertex indices of the triangles with shape (num_triangles, 3).
+        areas (np.ndarray): Area of every triangle.
+        cross (np.ndarray): Cross products of the edges of the triangles with shape (3, num_triangles),
+                            which are the area weighted normals.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Area and unit normal of every vertex with shape (num_points, 3).
+    """
+
+    # Every vertex gets a third of the area of its triangles, bincount is much faster than np.add.at
+    indices = triangles.ravel()
+    vertex_areas = np.bincount(indices, np.repeat(areas / 3, 3), minlength=num_points)
+
+    # Sum the normals component wise
+    vertex_normals = np.stack([np.bincount(indices, np.repeat(component, 3), minlength=num_points) for component in cross], axis=-1)
+    vertex_normals /= np.maximum(np.linalg.norm(vertex_normals, axis=-1, keepdims=True), np.finfo(np.float64).tiny)
+
+    return vertex_areas, vertex_normals
+
+
+def find_thin_walls(points: np.ndarray, vertex_areas: np.ndarray, vertex_normals: np.ndarray, min_thickness: float = 1.0, num_samples: int = 1000, num_neighbours: int = 16) -> Tuple[float, Optional[float]]:
+    """Finds walls thinner than the printer can build. A wall is thin at a vertex if a vertex of the opposite
+       side of the wall, whose normal points the other way, is nearer than the minimum thickness.
+       Vertices are sampled by their area, hence the thin fraction approximates the thin fraction of the surface.
+
+    Args:
+        points (np.ndarray): Points with shape (num_points, 3).
+        vertex_areas (np.ndarray): Area of every vertex.
+        vertex_normals (np.ndarray): Unit normal of every vertex.
+        min_thickness (float, optional): Minimum wall thickness of the printer. Defaults to 1.0.
+        num_samples (int, optional): Number of sampled vertices. Defaults to 1000.
+        num_neighbours (int, optional): Number of nearest vertices searched for the opposite side. Defaults to 16.
+
+    Returns:
+        Tuple[float, Optional[float]]: Fraction of the surface with thin walls, nan if the mesh has no area,
+                                       and the thinnest wall found or None if no wall is thinner than the minimum.
+    """
+
+    # Imported on first use, which keeps the startup of the app fast
+    from scipy.spatial import cKDTree
+
+    # Degenerate meshes have no surface to sample
+    total = vertex_areas.sum()
+    if not total > 0:
+        return float("nan"), None
+
+    # Sample vertices reproducibly, so the hint of a design does not change,
+    # vertices of degenerate triangles only have no area and are never sampled
+    generator = np.random.default_rng(0)
+    num_samples = min(num_samples, int(np.count_nonzero(vertex_areas)))
+    samples = generator.choice(len(points), size=num_samples, replace=False, p=vertex_areas / total)
+
+    # An unbalanced tree builds much faster and is queried only once
+    tree = cKDTree(points, balanced_tree=False, compact_nodes=False)
+
+    # Search the nearest vertices within the minimum thickness, missing neighbours get an infinite distance
+    distances, neighbours = tree.query(points[samples], k=num_neighbours, distance_upper_bound=min_thickness)
+    found = np.isfinite(distances)
+    neighbours[~found] = 0
+
+    # Keep neighbours on the opposite side of the wall
+    opposite = found & (np.einsum("ij,ikj->ik", vertex_normals[samples], vertex_normals[neighbours]) < -0.5)
+    thickness = np.where(opposite, distances, np.inf).min(axis=-1)
+    thin = np.isfinite(thickness)
+
+    return float(thin.mean()), float(thickness[thin].min()) if thin.any() else None
+
+
+def analyze_mesh(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, config: dict, closed: bool = True) -> Dict[str, Optional[float]]:
+    """Calculates the print metrics of a mesh in millimeters.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the mesh.
+        y (np.ndarray): y-coordinates of the points of the mesh.
+        z (np.ndarray): z-coordinates of the points of the mesh.
+        triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
+        config (dict): Config of the paramter space read from the yaml file.
+        closed (bool, optional): Whether the mesh is free of self-intersections and encloses a volume. Defaults to True.
+
+    Returns:
+        Dict[str, Optional[float]]: Bounding box size, volume (mm³), surface area (mm²), material (g, m of filament),
+                                    the thin wall fraction and thickness, see find_thin_walls, and whether the mesh is closed.
+    """
+
+    analytics_config = config["app"]["analytics"]
+    points = np.stack([x, y, z]).astype(np.float64)
+    indices = triangles.triangles
+
+    # Center the points, which keeps the tetrahedra of the volume small and its sum precise
+    lower, upper = points.min(axis=1), points.max(axis=1)
+    points -= ((lower + upper) / 2)[:, None]
+
+    # Size, area and volume, the volume of self-intersecting meshes is meaningless
+    size = upper - lower
+    first, cross = get_area_vectors(points, indices)
+    areas = np.sqrt(np.einsum("ij,ij->j", cross, cross)) / 2
+    area = float(areas.sum())
+    volume = get_volume(first, cross) if closed else None
+
+    # A print is a shell of solid walls filled by a sparse infill
+    shell = area * analytics_config["shell_thickness"]
+    material = shell if volume is None else min(volume, shell + max(volume - shell, 0) * analytics_config["infill"])
+    filament = material / (np.pi * (analytics_config["filament_diameter"] / 2) ** 2)
+
+    # Thin walls
+    vertex_areas, vertex_normals = get_vertex_vectors(points.shape[1], indices, areas, cross)
+    thin_fraction, thinnest = find_thin_walls(points.T, vertex_areas, vertex_normals, analytics_config["min_wall_thickness"])
+
+    return {
+        "size_x": float(size[0]),
+        "size_y": float(size[1]),
+        "size_z": float(size[2]),
+        "volume": volume,
+        "area": area,
+        "material": material * analytics_config["density"] / 1000,
+        "filament": filament / 1000,
+        "thin_fraction": thin_fraction,
+        "thinnest": thinnest,
+        "closed": bool(closed),
+    }
+
+
+def analyze_design(parameters: dict, config: dict, model: str = "csym", valid: Optional[bool] = None) -> Dict[str, Optional[float]]:
+    """Calculates the print metrics of the exported mesh of a design, which are shared with the other workers through the store.
+
+    Args:
+        parameters (dict): Parameters of the design including the seed of the random stages.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        valid (Optional[bool], optional): Validation of the exported mesh, see validate_design.
+                                          Only its watertightness is checked if not validated. Defaults to None.
+
+    Returns:
+        Dict[str, Optional[float]]: Print metrics, see analyze_mesh.
+    """
+
+    # Identify the metrics like the exported mesh
+    store = get_store()
+    key = get_key("analytics", model, parameters, valid, config["engine"]["mesh"], config["models"][model]["periodic"], config["app"]["analytics"])
+    data = store.get_bytes(key) if store is not None else None
+    if data is not None:
+        return json.loads(data)
+
+    # Measure the mesh which is downloaded, an open mesh encloses no volume
+    mesh = mesh_design(parameters, config, model, "export")
+    closed = is_watertight(mesh[3].triangles) if valid is None else valid
+    metrics = analyze_mesh(*mesh, config, closed=closed)
+
+    if store is not None:
+        store.put(key, data=json.dumps(metrics).encode())
+
+    return metrics
@@ -0,0 +1,19 @@
+// Retries thumbnails of the gallery which the server rejected while it rendered other thumbnails,
+// the server renders one thumbnail at a time and answers further requests with 503 and Retry-After.
+document.addEventListener("error", function(event) {
+    var image = event.target;
+    if (!image.classList || !image.classList.contains("thumbnail")) {
+        return;
+    }
+
+    // Give up after a few retries, e.g. if the server is down
+    var retries = Number(image.dataset.retries || 0);
+    if (retries >= 30) {
+        return;
+    }
+    image.dataset.retries = retries + 1;
+
+    setTimeout(function() {
+        image.src = image.src.split("?")[0] + "?retry=" + (retries + 1);
+    }, 1000);
+}, true);
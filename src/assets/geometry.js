@@ -0,0 +1,85 @@
+// Decodes geometry updates of the Leonardo engine and keeps the decoded arrays by their digest,
+// so unchanged arrays like the triangle indices are only sent once.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    leonardo: {
+        cache: {},
+        cache_size: 12,
+
+        decode: function(item) {
+            // Templates are plain JSON
+            if (item.type === "json") {
+                return item.data;
+            }
+
+            // Decode base64 to a typed array
+            var binary = atob(item.data);
+            var bytes = new Uint8Array(binary.length);
+            for (var n = 0; n < binary.length; n++) {
+                bytes[n] = binary.charCodeAt(n);
+            }
+            if (item.type === "int32") {
+                // Split triangles into the vertex indices of the mesh
+                var triangles = new Int32Array(bytes.buffer);
+                var count = triangles.length / 3;
+                var i = new Int32Array(count), j = new Int32Array(count), k = new Int32Array(count);
+                for (var t = 0; t < count; t++) {
+                    i[t] = triangles[3 * t];
+                    j[t] = triangles[3 * t + 1];
+                    k[t] = triangles[3 * t + 2];
+                }
+                return {i: i, j: j, k: k};
+            }
+            if (item.type === "float64") {
+                return new Float64Array(bytes.buffer);
+            }
+            return new Float32Array(bytes.buffer);
+        },
+
+        update_figure: function(update) {
+            var no_update = window.dash_clientside.no_update;
+            var self = window.dash_clientside.leonardo;
+            if (!update) {
+                return [no_update, no_update, no_update];
+            }
+
+            // Decode sent arrays and look up held arrays
+            var arrays = {};
+            for (var name in update) {
+                var item = update[name];
+                if (item.data !== null) {
+                    delete self.cache[item.digest];
+                    self.cache[item.digest] = self.decode(item);
+                }
+                if (!(item.digest in self.cache)) {
+                    // Evicted while the update was computed, request the current geometry with all arrays
+                    self.cache = {};
+                    return [no_update, [], Date.now()];
+                }
+                arrays[name] = self.cache[item.digest];
+            }
+
+            // Evict the oldest arrays which are not used by the current figure
+            var digests = Object.keys(self.cache);
+            var used = Object.keys(update).map(function(name) { return update[name].digest; });
+            for (var d = 0; d < digests.length && Object.keys(self.cache).length > self.cache_size; d++) {
+                if (used.indexOf(digests[d]) < 0) {
+                    delete self.cache[digests[d]];
+                }
+            }
+
+            // Combine the template with the arrays
+            var trace = Object.assign({}, arrays.template.trace, {
+                x: arrays.x,
+                y: arrays.y,
+                z: arrays.z,
+                i: arrays.triangles.i,
+                j: arrays.triangles.j,
+                k: arrays.triangles.k,
+                intensity: arrays.z
+            });
+            var figure = {data: [trace], layout: arrays.template.layout};
+
+            return [figure, Object.keys(self.cache), no_update];
+        }
+    }
+});
@@ -0,0 +1,120 @@
+from typing import Dict, Iterator, Optional
+from contextlib import contextmanager
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+
+# Trace of the request handled by the current thread, see trace
+TRACE = threading.local()
+
+
+@contextmanager
+def trace() -> Iterator[Dict[str, dict]]:
+    """Collects the timings of the engine steps and the state of the stages called by the current thread.
+
+    Yields:
+        Iterator[Dict[str, dict]]: Seconds by step and "computed" or "reused" by stage, filled until the context exits.
+    """
+
+    TRACE.record = {"timings": {}, "stages": {}}
+    try:
+        yield TRACE.record
+    finally:
+        TRACE.record = None
+
+
+def add_timing(name: str, seconds: float):
+    """Adds the seconds of an engine step to the trace of the current thread, if it is traced.
+
+    Args:
+        name (str): Name of the step, repeated steps are summed.
+        seconds (float): Duration in seconds.
+    """
+
+    record = getattr(TRACE, "record", None)
+    if record is not None:
+        record["timings"][name] = record["timings"].get(name, 0.) + seconds
+
+
+def add_stages(report: Dict[str, str]):
+    """Adds the state of pipeline stages to the trace of the current thread, if it is traced.
+
+    Args:
+        report (Dict[str, str]): Whether each stage was "computed" or "reused", see Pipeline.evaluate.
+    """
+
+    record = getattr(TRACE, "record", None)
+    if record is not None:
+        record["stages"].update(report)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Adds the seconds of the context to the trace of the current thread.
+
+    Args:
+        name (str): Name of the step.
+    """
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - start)
+
+
+class RequestLog:
+    """Writes a JSON line for every design request to a rotating file, which the replay tool reads (see src.replay).
+       Every worker process writes its own file, as processes cannot rotate a shared file safely.
+    """
+
+    def __init__(self, path: str = "logs/requests-{pid}.jsonl", max_bytes: int = 10_000_000, backup_count: int = 5):
+        """Opens a request log.
+
+        Args:
+            path (str, optional): Path of the file, {pid} is replaced by the process id. Defaults to "logs/requests-{pid}.jsonl".
+            max_bytes (int, optional): Size at which the file is rotated. Defaults to 10_000_000.
+            backup_count (int, optional): Number of rotated files kept. Defaults to 5.
+        """
+        self.path = path.format(pid=os.getpid())
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # A logger of its own, so the lines are not propagated to other handlers
+        self.logger = logging.getLogger(f"leonardo.requests.{self.path}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        if not self.logger.handlers:
+            handler = logging.handlers.RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def write(self, entry: dict):
+        """Writes an entry as a JSON line.
+
+        Args:
+            entry (dict): JSON serializable entry, numpy scalars are converted.
+        """
+
+        self.logger.info(json.dumps(entry, default=lambda value: value.item() if hasattr(value, "item") else str(value)))
+
+
+def open_request_log(config: dict) -> Optional[RequestLog]:
+    """Opens the request log of the worker process if capturing is enabled.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        Optional[RequestLog]: The log or None if it is disabled.
+    """
+
+    capture_config = config["app"]["capture"]
+    if not capture_config["enabled"]:
+        return None
+
+    return RequestLog(capture_config["path"], capture_config["max_bytes"], capture_config["backup_count"])
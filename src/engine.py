@@ -1,22 +1,124 @@
-from typing import Tuple
+from typing import Dict, Optional, Tuple
+import functools
+import time
 import numpy as np
-from scipy import signal
-from sklearn.preprocessing import SplineTransformer
 import matplotlib.tri as mtri
-from stl import mesh
 
 from typing import Tuple
 import numpy as np
 import matplotlib.tri as mtri
 
+from src.mesh import close_mesh, select_grid, is_watertight
+from src.validation import find_self_intersections
+from src.pipeline import Pipeline, Stage
+from src.plan import ModelPlan, get_plan_digest
+from src.store import SharedStore, get_key
+from src.capture import add_stages, add_timing, timed
+
+# Store shared by the worker processes, see open_store
+STORE: Optional[SharedStore] = None
+
+# Version of the designs of seeds, increment it if a change of the engine changes the design of a seed
+GEOMETRY_VERSION = 3
+
+
+def open_store(config: dict, clear: bool = False) -> Optional[SharedStore]:
+    """Opens the store shared by the worker processes and preloads the topology of the models.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        clear (bool, optional): Removes the entries of previous runs, which may have been created by other code.
+                                Only safe before the workers start. Defaults to False.
+
+    Returns:
+        Optional[SharedStore]: The store or None if it is disabled.
+    """
+
+    global STORE
+
+    store_config = config["engine"]["store"]
+    if store_config["enabled"] and STORE is None:
+        STORE = SharedStore(store_config["directory"], store_config["max_bytes"])
+        if clear:
+            STORE.clear()
+
+        # Triangulate the grid of every model once for all workers
+        for model in config["models"]:
+            generate_grid_topology(config["models"][model]["parameters"]["num_points"])
+
+    return STORE
+
+
+def get_store() -> Optional[SharedStore]:
+    """Gets the store shared by the worker processes.
+
+    Returns:
+        Optional[SharedStore]: The store or None if it is not opened or disabled.
+    """
+
+    return STORE
+
+
+def share_triangulation(x: np.ndarray, y: np.ndarray, triangles: np.ndarray) -> mtri.triangulation.Triangulation:
+    """Creates a triangulation which references the given triangles, e.g. the shared topology or a memory-mapped
+       mesh of the store. The constructor of matplotlib copies the triangles, which would give every design a copy of its own.
+
+    Args:
+        x (np.ndarray): First coordinates of the points.
+        y (np.ndarray): Second coordinates of the points.
+        triangles (np.ndarray): Vertex indices of the triangles.
+
+    Returns:
+        mtri.triangulation.Triangulation: Triangulation of the points.
+    """
+
+    triangulation = mtri.Triangulation(x, y, triangles=triangles)
+
+    # Keep the shared array if it has the layout of the copy
+    if triangles.dtype == triangulation.triangles.dtype and triangles.flags["C_CONTIGUOUS"]:
+        triangulation.triangles = triangles
+
+    return triangulation
+
+
+@functools.lru_cache(maxsize=4)
+def generate_grid_topology(num_points: int = 256) -> np.ndarray:
+    """Triangulates a grid of indices once per grid size. The grids of generate_grid are
+       axis-aligned scalings of the index grid, hence they share its triangulation.
+       If the store is open, all workers share a single copy.
+
+    Args:
+        num_points (int, optional): Number of points per grid component. Defaults to 256.
+
+    Returns:
+        np.ndarray: Read-only vertex indices of the triangles.
+    """
+
+    # Map the topology triangulated by another worker
+    key = f"topology-{num_points}"
+    if STORE is not None:
+        arrays = STORE.get_arrays(key, pinned=True)
+        if arrays is not None:
+            return arrays["triangles"]
+
+    a, b = np.meshgrid(np.arange(num_points, dtype=np.float64), np.arange(num_points, dtype=np.float64))
+    triangles = mtri.Triangulation(a.flatten(), b.flatten()).triangles
+    triangles.setflags(write=False)
+
+    if STORE is not None:
+        STORE.put(key, {"triangles": triangles}, pinned=True)
+
+    return triangles
+
 
-def generate_grid(a_max: float = np.nan, b_max: float = np.nan, num_points: int = 256) -> Tuple[np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+def generate_grid(a_max: float = np.nan, b_max: float = np.nan, num_points: int = 256, dtype: str = "float64") -> Tuple[np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
     """Generates a 2D-grid from 2 max values and returns flattened arrays including triangulation.
 
     Args:
         a_max (float, optional): Upper limit of first grid component. Defaults to NaN.
         b_max (float, optional): Upper limit of second grid component. Defaults to NaN.
         num_points (int, optional): Number of points per grid component. Defaults to 256.
+        dtype (str, optional): Floating point type of the returned grid. Defaults to "float64".
 
     Returns:
         Tuple[np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
@@ -41,7 +143,10 @@ def generate_grid(a_max: float = np.nan, b_max: float = np.nan, num_points: int
 
     a, b = np.meshgrid(a, b)  # Generate meshgrid from linespaces
     a, b = a.flatten(), b.flatten()  # Flatten to array
-    triangles = mtri.Triangulation(a, b)  # Create triangles
+    triangles = share_triangulation(a, b, generate_grid_topology(num_points))  # Create triangles sharing the topology
+
+    # Cast after triangulation so the topology does not depend on the precision
+    a, b = a.astype(dtype), b.astype(dtype)
 
     return a, b, triangles
 
@@ -100,11 +205,38 @@ def generate_torus(theta: np.ndarray, phi: np.ndarray, r_ratio: float = 0.5) ->
     return x, y, z
 
 
-def generate_spline(array: np.ndarray, order_max: int = 30, knots_max: int = 7, offset: int = 0) -> np.ndarray:
+@functools.lru_cache(maxsize=32)
+def generate_spline_basis(values: bytes, knots: int, order: int) -> np.ndarray:
+    """Gets the spline transform coefficients of normalized values.
+       Uniform knots span the range of the values, hence the basis does not change
+       if the values are shifted or scaled and is cached by the normalized values.
+
+    Args:
+        values (bytes): Buffer of the distinct double precision values normalized to [0, 1].
+        knots (int): Number of knots of the spline.
+        order (int): Order of the spline.
+
+    Returns:
+        np.ndarray: Read-only spline transform coefficients of shape (values, coefficients).
+    """
+
+    # Imported on first use, which keeps the startup of the app fast
+    from sklearn.preprocessing import SplineTransformer
+
+    # Create spline object and get spline transform coefficients
+    spline = SplineTransformer(knots, order)
+    basis = spline.fit_transform(np.expand_dims(np.frombuffer(values), -1))
+    basis.setflags(write=False)
+
+    return basis
+
+
+def generate_spline(array: np.ndarray, rng: np.random.Generator, order_max: int = 30, knots_max: int = 7, offset: int = 0) -> np.ndarray:
     """Generates a spline transformation from an array.
 
     Args:
         array (np.ndarray): Input array to be spline transformed.
+        rng (np.random.Generator): Random generator of the stage.
         order_max (int, optional): Upper limit for spline order (Keep below 50, otherwise super slow!). Defaults to 30.
         knots_max (int, optional): Upper limit for knot order in spline (Keep below 10, otherwise super slow!). Defaults to 7.
         offset (int, optional): Offset value added to spline transform. Defaults to 0.
@@ -114,32 +246,35 @@ def generate_spline(array: np.ndarray, order_max: int = 30, knots_max: int = 7,
     """
 
     # Generate a random spline order and knot number
-    order = np.random.randint(order_max)
-    knots = np.random.randint(2, knots_max)
-
-    # Create spline object
-    spline = SplineTransformer(knots, order)
+    order = int(rng.integers(order_max))
+    knots = int(rng.integers(2, knots_max))
 
-    # Get spline transform coefficients
-    p = spline.fit_transform(np.expand_dims(array, -1))
+    # Grid arrays repeat their values, hence transform the distinct values only
+    # (high spline orders are ill-conditioned in single precision)
+    values, inverse = np.unique(array.astype(np.float64, copy=False), return_inverse=True)
+    span = values[-1] - values[0]
+    if span > 0:
+        values = (values - values[0]) / span
+    p = generate_spline_basis(np.round(values, 9).tobytes(), knots, order)
 
     # Create random scale coefficent matrix for each spline coefficents
-    A = np.random.uniform(-1, 1, size=(1, p.shape[-1]))
-    A = np.repeat(A, len(array), axis=0)
+    A = rng.uniform(-1, 1, size=(1, p.shape[-1]))
 
     # Calculate the randum modulator for the input array
-    modulator = np.sum(A * p, axis=-1) + offset
+    modulator = (p @ A[0])[inverse.reshape(-1)] + offset
 
-    return modulator
+    # Keep the precision of the input array
+    return modulator.astype(array.dtype, copy=False)
 
 
-def generate_twist(x: np.ndarray, y: np.ndarray, twist_frequency: float, num_points: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+def generate_twist(x: np.ndarray, y: np.ndarray, twist_frequency: float, rng: np.random.Generator, num_points: int = 256) -> Tuple[np.ndarray, np.ndarray]:
     """Generates a rotation for points specified in x and y.
 
     Args:
         x (np.ndarray): First component of the input array.
         y (np.ndarray): First component of the input array.
         twist_frequency (float): Strength of roation.
+        rng (np.random.Generator): Random generator of the stage.
         num_points (int, optional): Number of points per grid component. Defaults to 256.
 
     Returns:
@@ -147,20 +282,23 @@ def generate_twist(x: np.ndarray, y: np.ndarray, twist_frequency: float, num_poi
     """
 
     # Choose if rotation is made or not
-    rotation_flag = np.random.choice([False, True])
+    rotation_flag = rng.choice([False, True])
     # Choose if roation is linear or fuzzy (=spline transformed)
-    fuzzy_flag = np.random.choice([False, True])
+    fuzzy_flag = rng.choice([False, True])
 
-    if rotation_flag:
+    # Without a twist the angle is constant, which leaves nothing to rotate or spline transform
+    if rotation_flag and twist_frequency != 0:
         # Create linear rotation angle
         alpha = np.linspace(0, 2 * np.pi * twist_frequency,
-                            num_points) * np.random.choice([-1, 1])
+                            num_points) * rng.choice([-1, 1])
         # Create copys of array for every point in the grid and flatten
         alpha = np.kron(alpha, np.ones((num_points, 1))).flatten()
+        # Keep the precision of the input points
+        alpha = alpha.astype(x.dtype, copy=False)
 
         # Create spline transform of angle array
         if fuzzy_flag:
-            alpha = generate_spline(alpha)
+            alpha = generate_spline(alpha, rng)
 
         # Create copys of x,y to perform roation
         x_temp = x
@@ -173,13 +311,14 @@ def generate_twist(x: np.ndarray, y: np.ndarray, twist_frequency: float, num_poi
     return x, y
 
 
-def generate_tilt(x: np.ndarray, y: np.ndarray, z: np.ndarray, x_tilt: float = 1., y_tilt: float = 1.) -> Tuple[np.ndarray, np.ndarray]:
+def generate_tilt(x: np.ndarray, y: np.ndarray, z: np.ndarray, rng: np.random.Generator, x_tilt: float = 1., y_tilt: float = 1.) -> Tuple[np.ndarray, np.ndarray]:
     """Generates a spline transformed shift of x,y-points along a z-dimension.
 
     Args:
         x (np.ndarray): x-coordinate of the points.
         y (np.ndarray): y-coordinate of the points.
         z (np.ndarray): z-axis along which to generate the tilt.
+        rng (np.random.Generator): Random generator of the stage.
         x_tilt (float, optional): Tilt factor of x-coordinate of the points. Defaults to 1..
         y_tilt (float, optional): Tilt factor of y-coordinate of the points. Defaults to 1..
 
@@ -188,8 +327,8 @@ def generate_tilt(x: np.ndarray, y: np.ndarray, z: np.ndarray, x_tilt: float = 1
     """
 
     # Generate splines and tilt x,y
-    x += x_tilt * generate_spline(z)
-    y += y_tilt * generate_spline(z)
+    x += x_tilt * generate_spline(z, rng)
+    y += y_tilt * generate_spline(z, rng)
 
     return x, y
 
@@ -207,20 +346,28 @@ def generate_edginess(array: np.ndarray, angle: np.ndarray, edginess: float = 0.
         Tuple[np.array, np.array]: Lame tranformed x- and y-arrays.
     """
 
+    # Large exponents overflow in single precision, hence compute the Lamé curve in double precision
+    angle = angle.astype(np.float64, copy=False)
+
     x = array * np.sign(np.cos(angle)) * \
         np.abs(np.cos(angle)) ** (1 / (1 + edginess))
 
     y = array * np.sign(np.sin(angle)) * \
         np.abs(np.sin(angle)) ** (1 / (1 + edginess))
 
-    return x, y
+    # Negative exponents may exceed the range of the input precision, then keep double precision
+    if max(np.abs(x).max(), np.abs(y).max()) > np.finfo(array.dtype).max:
+        return x, y
+
+    return x.astype(array.dtype, copy=False), y.astype(array.dtype, copy=False)
 
 
-def generate_modulator(array: np.ndarray, scaler: float = 1, offset: int = 0) -> np.ndarray:
+def generate_modulator(array: np.ndarray, rng: np.random.Generator, scaler: float = 1, offset: int = 0) -> np.ndarray:
     """Generate scaled spline transformed modulator.
 
     Args:
         array (np.array): Input array which needs to be spline transformed and scaled.
+        rng (np.random.Generator): Random generator of the stage.
         scaler (float, optional): Scaler factor. Defaults to 1.
         offset (float, optional): Offset value adde to spline transform. Defaults to 0.
 
@@ -229,7 +376,7 @@ def generate_modulator(array: np.ndarray, scaler: float = 1, offset: int = 0) ->
     """
 
     # Gernerate modulator by spline transformed array
-    modulator = generate_spline(array, offset=offset)
+    modulator = generate_spline(array, rng, offset=offset)
 
     # Scale modulator to scaler
     modulator /= modulator.max()
@@ -238,12 +385,13 @@ def generate_modulator(array: np.ndarray, scaler: float = 1, offset: int = 0) ->
     return modulator
 
 
-def generate_texture(array: np.ndarray, texture_type: int = 0, amplitude: float = 0.1, frequency: float = 1., duty_cycle: float = 0.5) -> np.ndarray:
+def generate_texture(array: np.ndarray, rng: np.random.Generator, texture_type: int = 0, amplitude: float = 0.1, frequency: float = 1., duty_cycle: float = 0.5) -> np.ndarray:
     """Generate surface texture from input array which are 
        generated by a sine-, sawtooth-, square- and gausspulse function (Encoding = 0, 1, 2, 3).
 
     Args:
         array (np.ndarray): Input array which is used to generate feature.
+        rng (np.random.Generator): Random generator of the stage.
         texture_type (int, optional): Choose feature type. Defaults to 0.
         amplitude (float, optional): Feature amplitude. Defaults to 0.1.
         frequency (float, optional): Freature frequency. Defaults to 1..
@@ -253,8 +401,11 @@ def generate_texture(array: np.ndarray, texture_type: int = 0, amplitude: float
         np.ndarray: Return surface texture from input array. 
     """
 
+    # Imported on first use, which keeps the startup of the app fast
+    from scipy import signal
+
     # Init feature
-    texture = np.ones(len(array))
+    texture = np.ones(len(array), dtype=array.dtype)
 
     # Sine texture
     if texture_type == 0:
@@ -270,18 +421,19 @@ def generate_texture(array: np.ndarray, texture_type: int = 0, amplitude: float
     # Gausspulse texture
     elif texture_type == 3:
         texture += amplitude * \
-            signal.gausspulse(frequency * array, fc=np.random.randint(2, 20)) # type: ignore # there seems to be datatype bug in scipy
+            signal.gausspulse(frequency * array, fc=int(rng.integers(2, 20))) # type: ignore # there seems to be datatype bug in scipy
 
     return texture
 
 
-def generate_angular_texture(theta: np.ndarray, phi: np.ndarray, parameters: dict) -> dict:
+def generate_angular_texture(theta: np.ndarray, phi: np.ndarray, parameters: dict, rng: np.random.Generator) -> dict:
     """Generates random angular textures.
 
     Args:
         theta (np.ndarray): Theta angle used in angular coordinate systems.
         phi (np.ndarray): Theta angle used in angular coordinate systems.
         parameters (dict): Configuration paramters from yaml-file.
+        rng (np.random.Generator): Random generator of the stage.
 
     Returns:
         dict: Texture dictionary for each feature.
@@ -299,11 +451,12 @@ def generate_angular_texture(theta: np.ndarray, phi: np.ndarray, parameters: dic
     # Create textures along coordinates
     for f in coordinate_labels:
         # Randomly choose angle along the texture propagates
-        ridx = np.random.randint(2)
+        ridx = int(rng.integers(2))
         label = labels[ridx]
         # Generate texture from config
         texture = generate_texture(
             array=anlges[ridx],
+            rng=rng,
             texture_type=parameters[f"{label}_texture_type"],
             amplitude=parameters[f"{label}_amplitude"],
             frequency=parameters[f"{label}_frequency"],
@@ -329,92 +482,178 @@ def design_rsym(parameters: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, m
         Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
         x,y,z- coordinates of the design as well as the corresponding trianglations.
     """
-    # Print design type
-    print("Design type: RSYM")
+    # Evaluate the stages of the design, reusing unchanged stages
+    geometry, _ = evaluate_design(parameters, "rsym")
 
-    # Generate grid used in for angular coordinate systems
-    theta, phi, triangles = generate_grid(num_points=parameters["num_points"])
+    return geometry
 
-    # Randomly pick ellipsoid or torus base design
-    ridx = np.random.randint(2)
-    if ridx == 0:
-        x, y, z = generate_ellipsoid(theta, phi)
-    else:
-        x, y, z = generate_torus(theta, phi, parameters["r_ratio"])
 
-    # Generate angular textures
-    textures = generate_angular_texture(theta, phi, parameters)
+def design_csym(parameters: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Generates a desgin based on cylindrical coordiantes
+       which are randomly transform by parameters specified in the config yaml.
 
-    # Transform x,y,z corrdinates
-    x *= textures["x"]
-    y *= textures["y"]
-    z *= textures["z"]
+    Args:
+        parameters (dict): Randomly generated parameter space.
 
-    # Generate roations along the e1,e2,e3 unit vectors
-    x, y = generate_twist(
-        x, y, parameters["e1_twist"], num_points=parameters["num_points"])
-    x, z = generate_twist(
-        x, z, parameters["e2_twist"], num_points=parameters["num_points"])
-    y, z = generate_twist(
-        y, z, parameters["e3_twist"], num_points=parameters["num_points"])
+    Returns:
+        Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
+        x,y,z- coordinates of the design as well as the corresponding trianglations.
+    """
+    # Evaluate the stages of the design, reusing unchanged stages
+    geometry, _ = evaluate_design(parameters, "csym")
 
-    return x, y, z, triangles
+    return geometry
 
 
-def design_csym(parameters: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
-    """Generates a desgin based on cylindrical coordiantes
-       which are randomly transform by parameters specified in the config yaml.
+def generate_base(grid: tuple, r_ratio: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Randomly picks an ellipsoid or torus base design.
 
     Args:
-        parameters (dict): Randomly generated parameter space.
+        grid (tuple): Theta, phi and triangulation of the angular grid.
+        r_ratio (float): Ratio of the torus radii.
+        rng (np.random.Generator): Random generator of the stage.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: x,y,z-coordinates of the base design.
+    """
+
+    theta, phi, _ = grid
+    if rng.integers(2) == 0:
+        return generate_ellipsoid(theta, phi)
+
+    return generate_torus(theta, phi, r_ratio)
+
+
+def generate_tilt_stage(twist: tuple, grid: tuple, tilt_x: float, tilt_y: float, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Tilts the twisted x,y-coordinates along the z-axis without modifying the memoized twist stage.
+
+    Args:
+        twist (tuple): Twisted x,y-coordinates.
+        grid (tuple): z-axis, phi and triangulation of the cylindrical grid.
+        tilt_x (float): Tilt factor of x-coordinate of the points.
+        tilt_y (float): Tilt factor of y-coordinate of the points.
+        rng (np.random.Generator): Random generator of the stage.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Tilted x- and y-coordinates.
+    """
+
+    x, y = twist
+    return generate_tilt(x.copy(), y.copy(), grid[0], rng, tilt_x, tilt_y)
+
+
+def generate_output(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, dtype: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Casts the coordinates of a design to the engine precision,
+       as scipy and sklearn may return double precision.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the design.
+        y (np.ndarray): y-coordinates of the points of the design.
+        z (np.ndarray): z-coordinates of the points of the design.
+        triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
+        dtype (str): Floating point type of the design.
 
     Returns:
         Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
         x,y,z- coordinates of the design as well as the corresponding trianglations.
     """
-    # Print design type
-    print("Design type: CSYM")
 
-    # Generate grid used in for cylindrical coordinate systems
-    z, phi, triangles = generate_grid(
-        a_max=parameters["height"],
-        num_points=parameters["num_points"]
-    )
+    return x.astype(dtype), y.astype(dtype), z.astype(dtype), triangles
+
+
+# Stage graph of the cylindrical design, each stage only depends on the listed parameters and stages
+PIPELINE_CSYM = Pipeline([
+    Stage("grid", lambda height, num_points, dtype: generate_grid(a_max=height, num_points=num_points, dtype=dtype),
+          ["height", "num_points", "dtype"]),
+    Stage("modulator", lambda grid, radius, radius_offset, rng: generate_modulator(grid[0], rng, radius, offset=radius_offset),
+          ["radius", "radius_offset"], ["grid"], random=True),
+    Stage("phi_texture", lambda grid, phi_texture_type, phi_amplitude, phi_frequency, phi_duty_cycle, rng: generate_texture(
+          grid[1], rng, phi_texture_type, phi_amplitude, phi_frequency, phi_duty_cycle),
+          ["phi_texture_type", "phi_amplitude", "phi_frequency", "phi_duty_cycle"], ["grid"], random=True),
+    Stage("z_texture", lambda grid, height, radius, z_texture_type, z_amplitude, z_frequency, z_duty_cycle, rng: generate_texture(
+          height / (2 * radius * np.pi) * grid[0], rng, z_texture_type, z_amplitude, z_frequency, z_duty_cycle),
+          ["height", "radius", "z_texture_type", "z_amplitude", "z_frequency", "z_duty_cycle"], ["grid"], random=True),
+    Stage("edginess", lambda grid, modulator, phi_texture, z_texture, edginess: generate_edginess(
+          modulator * phi_texture * z_texture, grid[1], edginess),
+          ["edginess"], ["grid", "modulator", "phi_texture", "z_texture"]),
+    Stage("twist", lambda edginess, twist, num_points, rng: generate_twist(*edginess, twist, rng, num_points),
+          ["twist", "num_points"], ["edginess"], random=True),
+    Stage("tilt", generate_tilt_stage, ["tilt_x", "tilt_y"], ["twist", "grid"], random=True),
+    Stage("scale", lambda tilt, grid, radius, dtype: generate_output(
+          *scale_xy(tilt[0].copy(), tilt[1].copy(), radius), grid[0], grid[2], dtype),
+          ["radius", "dtype"], ["tilt", "grid"]),
+])
+
+# Stage graph of the angular design, each stage only depends on the listed parameters and stages
+PIPELINE_RSYM = Pipeline([
+    Stage("grid", lambda num_points, dtype: generate_grid(num_points=num_points, dtype=dtype),
+          ["num_points", "dtype"]),
+    Stage("base", generate_base, ["r_ratio"], ["grid"], random=True),
+    Stage("textures", lambda grid, rng, **parameters: generate_angular_texture(grid[0], grid[1], parameters, rng),
+          [f"{label}_{name}" for label in ["theta", "phi"] for name in ["texture_type", "amplitude", "frequency", "duty_cycle"]]
+          + ["x_scaler", "y_scaler", "z_scaler"], ["grid"], random=True),
+    Stage("textured", lambda base, textures: tuple(c * textures[f] for c, f in zip(base, ["x", "y", "z"])),
+          stages=["base", "textures"]),
+    Stage("twist_e1", lambda textured, e1_twist, num_points, rng: generate_twist(textured[0], textured[1], e1_twist, rng, num_points) + (textured[2],),
+          ["e1_twist", "num_points"], ["textured"], random=True),
+    Stage("twist_e2", lambda twist_e1, e2_twist, num_points, rng: generate_twist(twist_e1[0], twist_e1[2], e2_twist, rng, num_points),
+          ["e2_twist", "num_points"], ["twist_e1"], random=True),
+    Stage("twist_e3", lambda twist_e1, twist_e2, e3_twist, num_points, rng: generate_twist(twist_e1[1], twist_e2[1], e3_twist, rng, num_points),
+          ["e3_twist", "num_points"], ["twist_e1", "twist_e2"], random=True),
+    Stage("output", lambda grid, twist_e2, twist_e3, dtype: generate_output(twist_e2[0], twist_e3[0], twist_e3[1], grid[2], dtype),
+          ["dtype"], ["grid", "twist_e2", "twist_e3"]),
+])
+
+
+# Registry of the design functions and stage graphs of the models
+DESIGNS = {"csym": design_csym, "rsym": design_rsym}
+PIPELINES = {"csym": PIPELINE_CSYM, "rsym": PIPELINE_RSYM}
+
+# Models compiled from the config
+PLANS: Dict[str, ModelPlan] = {}
+
+
+def evaluate_design(parameters: dict, model: str = "csym") -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], Dict[str, str]]:
+    """Evaluates the stage graph of a model, only recomputing stages whose parameters changed since a previous evaluation.
 
-    # Generate base design radius modulator as a function of the z-axis
-    modulator = generate_modulator(
-        z, parameters["radius"],
-        offset=parameters["radius_offset"]
-    )
+    Args:
+        parameters (dict): Parameters of the design including the seed of the random stages.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
 
-    # Generate texture alone phi angle
-    modulator *= generate_texture(
-        array=phi,
-        texture_type=parameters["phi_texture_type"],
-        amplitude=parameters["phi_amplitude"],
-        frequency=parameters["phi_frequency"],
-        duty_cycle=parameters["phi_duty_cycle"],
-    )
+    Returns:
+        Tuple[Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation], Dict[str, str]]:
+        Read-only x,y,z- coordinates and trianglations of the design as well as whether each stage was "computed" or "reused".
+    """
 
-    # Generate texture alone the z-axis
-    modulator *= generate_texture(
-        array=parameters["height"] / (2 * parameters["radius"] * np.pi) * z,
-        texture_type=parameters["z_texture_type"],
-        amplitude=parameters["z_amplitude"],
-        frequency=parameters["z_frequency"],
-        duty_cycle=parameters["z_duty_cycle"],
-    )
+    timings = {}
+    geometry, report = PIPELINES[model].evaluate(parameters, timings)
 
-    x, y = generate_edginess(modulator, phi, parameters["edginess"])
+    # Trace the stages of captured requests
+    add_stages(report)
+    for name, seconds in timings.items():
+        add_timing(f"stage.{name}", seconds)
 
-    x, y = generate_twist(
-        x, y, parameters["twist"], parameters["num_points"])
+    return geometry, report
 
-    x, y = generate_tilt(x, y, z, parameters["tilt_x"], parameters["tilt_y"])
 
-    x, y = scale_xy(x, y, parameters["radius"])
+def get_plan(config: dict, model: str = "csym") -> ModelPlan:
+    """Gets the compiled plan of a model, which is compiled again only if the settings of the model change.
+       Plans are compared by digest, as configs read again or copied are equal but not identical.
 
-    return x, y, z, triangles
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        ModelPlan: Compiled model.
+    """
+
+    plan = PLANS.get(model)
+    if plan is None or plan.digest != get_plan_digest(config, model):
+        plan = ModelPlan(config, model)
+        PLANS[model] = plan
+
+    return plan
 
 
 def generate_parameters(config: dict, model: str = "csym") -> dict:
@@ -428,56 +667,384 @@ def generate_parameters(config: dict, model: str = "csym") -> dict:
     Returns:
         dict: A dictionary containing the generated parameters for the model.
     """
-    
-    # Init dict
-    parameters = {}
 
-    # Generate random parameter from list or value
-    for key, val in config["models"][model]["parameters"].items():
-        if isinstance(val, list):
-            parameters[key] = np.random.uniform(val[0], val[1])
-        else:
-            parameters[key] = val
+    return get_plan(config, model).sample()
+
+
+def sample_parameters(config: dict, model: str = "csym", seed: Optional[int] = None) -> dict:
+    """Samples the parameters of a design, optionally reproducible by a seed.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (Optional[int], optional): Seed of the random generator to reproduce a design. Defaults to None.
+
+    Returns:
+        dict: A dictionary containing the generated parameters for the model.
+    """
+
+    return get_plan(config, model).sample(seed)
 
-    # Add phi texture type
-    parameters["phi_texture_type"] = np.random.randint(
-        config["models"][model]["num_texture_types"])
 
-    # Add z texture type in case of cylindrical coordinates
-    if model == "csym":
-        parameters["z_texture_type"] = np.random.randint(
-            config["models"][model]["num_texture_types"])
+def get_max_seed(config: dict) -> int:
+    """Gets the largest seed of a design, the attempts of resample_seed stay below 2**31.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        int: Largest seed.
+    """
 
-    # Add theta texture time in case of angular coordinates
-    elif model == "rsym":
-        parameters["theta_texture_type"] = np.random.randint(
-            config["models"][model]["num_texture_types"])
+    return 2 ** 31 - 1 - config["engine"]["validation"]["max_attempts"]
+
+
+def generate_seed(config: dict) -> int:
+    """Draws the seed of a new design from fresh entropy, so forked workers do not repeat the same sequence of designs.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        int: Seed, leaving room for the increments of resample_seed.
+    """
 
-    return parameters
+    return int(np.random.default_rng().integers(get_max_seed(config) + 1))
 
 
-def design(config: dict, model: str = "csym") -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+def design(config: dict, model: str = "csym", seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
     """Desgins a specifed model based on a configuration space provides in the yaml file.
 
     Args:
         config (dict): Config of the paramter space read from the yaml file.
         model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (Optional[int], optional): Seed of the random generator to reproduce a design. Defaults to None.
 
     Returns:
         Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
         x,y,z- coordinates of the design as well as the corresponding trianglations.
     """
 
-    # Generates a random set of parameters within
-    # a the specified paramter space taken from the config yaml-file.
-    parameters = generate_parameters(config, model)
+    parameters = sample_parameters(config, model, seed)
 
     # Generate coordinates and trinagles
-    x, y, z, triangles = globals()[f"design_{model}"](parameters)
+    x, y, z, triangles = DESIGNS[model](parameters)
 
     return x, y, z, triangles
 
 
+def create_mesh(geometry: Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], config: dict, model: str = "csym", purpose: str = "render", reference: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]] = None, grid: Optional[Tuple[np.ndarray, np.ndarray, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Creates a decimated watertight mesh from a design for rendering or file export.
+
+    Args:
+        geometry (Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]):
+        x,y,z- coordinates of the design as well as the corresponding trianglations.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        purpose (str, optional): Selects the decimation settings (render or export). Defaults to "render".
+        reference (Optional[Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]], optional):
+        Design whose decimation is reused, which keeps the topology of the mesh while the design is adjusted. Defaults to None.
+        grid (Optional[Tuple[np.ndarray, np.ndarray, float]], optional): Decimation of the reference design if already selected,
+                                                                         see select_reference_grid. Defaults to None.
+
+    Returns:
+        Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
+        x,y,z- coordinates of the mesh as well as the corresponding trianglations.
+    """
+
+    # Keep the raw design if meshing is switched off
+    mesh_config = config["engine"]["mesh"]
+    if not mesh_config["close"]:
+        return geometry
+
+    # Select the rows and columns kept by the decimation of the reference design
+    periodic = config["models"][model]["periodic"]
+    if grid is None and reference is not None:
+        grid = select_grid(
+            *reference,
+            periodic=periodic,
+            tolerance=mesh_config[purpose]["tolerance"],
+            max_triangles=mesh_config[purpose]["max_triangles"]
+        )
+
+    # Close seams and open ends and decimate flat regions
+    with timed(f"mesh.{purpose}"):
+        x, y, z, triangles = close_mesh(
+            *geometry,
+            periodic=periodic,
+            cap=mesh_config["cap"],
+            weld_tolerance=mesh_config["weld_tolerance"],
+            tolerance=mesh_config[purpose]["tolerance"],
+            max_triangles=mesh_config[purpose]["max_triangles"],
+            grid=grid
+        )
+
+    return x, y, z, triangles
+
+
+def select_reference_grid(reference: dict, config: dict, model: str = "csym", purpose: str = "render") -> Tuple[np.ndarray, np.ndarray, float]:
+    """Selects the decimation of a design once, every adjustment of the design reuses it.
+       The decimation is shared with the other workers through the store.
+
+    Args:
+        reference (dict): Parameters of the design whose decimation is reused.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        purpose (str, optional): Selects the decimation settings (render or export). Defaults to "render".
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: Indices of the kept rows and columns and their error, see select_grid.
+    """
+
+    # Identify the decimation by the design and the mesh settings
+    mesh_config = config["engine"]["mesh"]
+    periodic = config["models"][model]["periodic"]
+    key = get_key("grid", model, purpose, reference, mesh_config[purpose], periodic)
+
+    arrays = STORE.get_arrays(key) if STORE is not None else None
+    if arrays is not None:
+        return arrays["rows"], arrays["cols"], float(arrays["error"][0])
+
+    geometry, _ = evaluate_design(reference, model)
+    with timed(f"grid.{purpose}"):
+        rows, cols, error = select_grid(
+            *geometry,
+            periodic=periodic,
+            tolerance=mesh_config[purpose]["tolerance"],
+            max_triangles=mesh_config[purpose]["max_triangles"]
+        )
+
+    if STORE is not None:
+        STORE.put(key, {"rows": rows, "cols": cols, "error": np.array([error])})
+
+    return rows, cols, error
+
+
+def mesh_design(parameters: dict, config: dict, model: str = "csym", purpose: str = "render", reference: Optional[dict] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Creates the mesh of a design, which is shared with the other workers through the store.
+
+    Args:
+        parameters (dict): Parameters of the design including the seed of the random stages.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        purpose (str, optional): Selects the decimation settings (render or export). Defaults to "render".
+        reference (Optional[dict], optional): Parameters of the design whose decimation is reused. Defaults to None.
+
+    Returns:
+        Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
+        x,y,z- coordinates of the mesh as well as the corresponding trianglations.
+    """
+
+    # Identify the mesh by the design and the mesh settings
+    key = get_key("mesh", model, purpose, parameters, reference, config["engine"]["mesh"], config["models"][model]["periodic"])
+
+    # Map the mesh created by any worker
+    arrays = STORE.get_arrays(key) if STORE is not None else None
+    if arrays is not None:
+        x, y, z = arrays["x"], arrays["y"], arrays["z"]
+        return x, y, z, share_triangulation(x, y, arrays["triangles"])
+
+    # Decimate the reference design once instead of on every adjustment
+    grid = select_reference_grid(reference, config, model, purpose) if reference is not None else None
+    geometry, _ = evaluate_design(parameters, model)
+    x, y, z, triangles = create_mesh(geometry, config, model, purpose, grid=grid)
+
+    if STORE is not None:
+        STORE.put(key, {"x": x, "y": y, "z": z, "triangles": triangles.triangles})
+
+    return x, y, z, triangles
+
+
+def is_finite_design(parameters: dict, model: str = "csym") -> bool:
+    """Checks if the coordinates of a design are finite. Extreme parameters can overflow them,
+       such designs cannot be meshed.
+
+    Args:
+        parameters (dict): Parameters of the design including the seed of the random stages.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        bool: True if every point of the design is finite.
+    """
+
+    # The stages are memoized, hence meshing the design afterwards does not evaluate it again
+    geometry = DESIGNS[model](parameters)
+
+    return all(np.isfinite(coordinates).all() for coordinates in geometry[:3])
+
+
+def validate_design(parameters: dict, config: dict, model: str = "csym") -> Optional[bool]:
+    """Checks if the exported mesh of a design is printable, i.e. watertight and free of self-intersections.
+       The result is shared with the other workers through the store.
+
+    Args:
+        parameters (dict): Parameters of the design including the seed of the random stages.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        Optional[bool]: True if the design is printable, None if the model is not validated.
+    """
+
+    if not config["models"][model]["validate"]:
+        return None
+
+    # Identify the result by the exported mesh
+    key = get_key("valid", model, parameters, config["engine"]["mesh"], config["models"][model]["periodic"])
+    arrays = STORE.get_arrays(key) if STORE is not None else None
+    if arrays is not None:
+        return bool(arrays["valid"][0])
+
+    # Designs with non-finite points cannot be meshed, let alone printed
+    if not is_finite_design(parameters, model):
+        return False
+
+    # Validate the mesh which is downloaded
+    mesh = mesh_design(parameters, config, model, "export")
+    with timed("validate"):
+        valid = is_watertight(mesh[3].triangles) and len(find_self_intersections(*mesh, max_pairs=1)) == 0
+
+    if STORE is not None:
+        STORE.put(key, {"valid": np.array([valid])})
+
+    return valid
+
+
+def resample_seed(config: dict, model: str = "csym", seed: Optional[int] = None, num_points: Optional[int] = None) -> Tuple[int, Optional[bool]]:
+    """Finds the first seed from a seed on whose design has finite points and a printable exported mesh, see validate_design.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (Optional[int], optional): Seed of the first attempt, further attempts increment it. Defaults to a fresh seed.
+        num_points (Optional[int], optional): Overrides the resolution of the model, e.g. for previews.
+                                              The random choices do not depend on it, hence a seed gives the same design
+                                              at every resolution. Defaults to None.
+
+    Returns:
+        Tuple[int, Optional[bool]]: Seed of the accepted or, if no attempt is printable, the last attempt
+        as well as whether its design is printable, which is None if the model is not validated.
+    """
+
+    if seed is None:
+        seed = generate_seed(config)
+
+    max_attempts = config["engine"]["validation"]["max_attempts"]
+    for attempt in range(max_attempts):
+        parameters = sample_parameters(config, model, seed + attempt)
+        if num_points is not None:
+            parameters["num_points"] = num_points
+
+        # Reject designs whose coordinates overflowed, they cannot be meshed
+        if not is_finite_design(parameters, model):
+            print("Design rejected: non-finite points")
+            valid = False
+            continue
+
+        # Accept the design if its exported mesh is printable or the model is not validated
+        valid = validate_design(parameters, config, model)
+        if valid is not False:
+            break
+        print("Design rejected: exported mesh is not printable")
+
+    # Let the caller tell the user instead of handing out an unprintable design silently
+    if valid is False:
+        print(f"No printable design found in {max_attempts} attempts")
+
+    return seed + attempt, valid
+
+
+def resample_design(config: dict, model: str = "csym", seed: Optional[int] = None, num_points: Optional[int] = None) -> Tuple[dict, Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], Optional[bool]]:
+    """Designs a model and resamples it until its points are finite and its exported mesh is printable, see resample_seed.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (Optional[int], optional): Seed of the first attempt, further attempts increment it. Defaults to a fresh seed.
+        num_points (Optional[int], optional): Overrides the resolution of the model, e.g. for previews. Defaults to None.
+
+    Returns:
+        Tuple[dict, Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation], Optional[bool]]:
+        Parameters of the accepted attempt, which reproduce it with evaluate_design,
+        its x,y,z- coordinates and the corresponding trianglations as well as
+        whether it is printable, which is None if the model is not validated.
+    """
+
+    seed, valid = resample_seed(config, model, seed, num_points)
+
+    # Design the accepted attempt again, its stages are memoized
+    parameters = sample_parameters(config, model, seed)
+    if num_points is not None:
+        parameters["num_points"] = num_points
+    geometry = DESIGNS[model](parameters)
+
+    return parameters, geometry, valid
+
+
+def warm_up(config: dict, model: str = "csym", seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Compiles a model and runs a design through the engine, so the first request
+       does not pay for the topology, first calls of numpy, scipy and sklearn and the validation.
+       The warm-up design draws from generators of its own, hence it does not change the seeds served afterwards.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the warm-up design. Defaults to 0.
+
+    Returns:
+        Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]:
+        x,y,z- coordinates of the render mesh of the warm-up design as well as the corresponding trianglations.
+    """
+
+    start = time.perf_counter()
+
+    # Compile the model and triangulate its grid
+    plan = get_plan(config, model)
+    generate_grid_topology(plan.num_points)
+
+    # Design, validate and mesh
+    parameters, geometry, _ = resample_design(config, model, seed)
+    mesh_design(parameters, config, model, "export")
+    mesh = create_mesh(geometry, config, model, "render")
+
+    print(f"Warm-up {model}: {time.perf_counter() - start:.2f}s")
+
+    return mesh
+
+
+def compare_precision(config: dict, model: str = "csym", seed: int = 0, dtype: str = "float32", tolerance: float = 1e-3, quantile: float = 0.99) -> Tuple[float, bool]:
+    """Compares a design computed with a given precision against the double precision design of the same seed.
+       Points on texture discontinuities or on the zeros of the Lamé curve may jump in single precision,
+       hence the deviation is taken at a high quantile instead of the maximum.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the random generator used for both designs. Defaults to 0.
+        dtype (str, optional): Floating point type to compare against float64. Defaults to "float32".
+        tolerance (float, optional): Allowed deviation relative to the size of the design,
+                                     1e-3 is about one pixel at the default figure height. Defaults to 1e-3.
+        quantile (float, optional): Quantile of the point deviations which is compared. Defaults to 0.99.
+
+    Returns:
+        Tuple[float, bool]: Relative deviation and whether it is within the tolerance.
+    """
+
+    # Design the same seed with double and reduced precision
+    reference = design({**config, "engine": {**config["engine"], "dtype": "float64"}}, model, seed)
+    candidate = design({**config, "engine": {**config["engine"], "dtype": dtype}}, model, seed)
+
+    # Stack coordinates to points
+    points_reference = np.stack(reference[:3], axis=-1)
+    points_candidate = np.stack(candidate[:3], axis=-1).astype(np.float64)
+
+    # Relate the point deviations to the diagonal of the bounding box
+    size = np.linalg.norm(points_reference.max(axis=0) - points_reference.min(axis=0))
+    deviation = np.quantile(np.linalg.norm(points_reference - points_candidate, axis=-1), quantile) / size
+
+    return float(deviation), bool(deviation <= tolerance)
+
+
 def get_ijk(triangles: mtri.triangulation.Triangulation) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Get the vertex indices.
 
@@ -494,7 +1061,8 @@ def get_ijk(triangles: mtri.triangulation.Triangulation) -> Tuple[np.ndarray, np
 
 
 def export_stl(path: str, x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation):
-    """Exports a STL file from a generated desgin.
+    """Exports a STL file from a generated desgin. STL stores single precision,
+       hence float32 designs are written without an intermediate double precision copy.
 
     Args:
         path (str): Path to file location.
@@ -504,6 +1072,9 @@ def export_stl(path: str, x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles
         triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
     """
 
+    # Imported on first use, which keeps the startup of the app fast
+    from stl import mesh
+
     # Create mesh
     design_mesh = mesh.Mesh(
         np.zeros(len(triangles.triangles), dtype=mesh.Mesh.dtype), remove_empty_areas=False)
@@ -514,3 +1085,20 @@ def export_stl(path: str, x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles
     design_mesh.z[:] = z[triangles.triangles]
 
     design_mesh.save(path)
+
+
+def export_obj(path: str, x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation):
+    """Exports a Wavefront OBJ file from a generated design. Unlike STL it keeps the shared vertices of the mesh.
+
+    Args:
+        path (str): Path to file location.
+        x (np.ndarray): x-coordinates of the points of the design.
+        y (np.ndarray): y-coordinates of the points of the design.
+        z (np.ndarray): z-coordinates of the points of the design.
+        triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
+    """
+
+    with open(path, "w") as file:
+        np.savetxt(file, np.stack([x, y, z], axis=-1), fmt="v %.7g %.7g %.7g")
+        # Vertex indices of OBJ files start at one
+        np.savetxt(file, triangles.triangles + 1, fmt="f %d %d %d")
@@ -0,0 +1,203 @@
+"""
+Figures of the Leonardo engine, shared by the app, its routes and the scripts.
+Only numpy and plotly are needed, hence scripts like src.morph and src.replay do not import dash.
+"""
+
+from typing import Optional, Tuple, List
+import numpy as np
+import matplotlib.tri as mtri
+import base64
+import hashlib
+import json
+
+from plotly import graph_objs as go
+
+from src.engine import get_ijk
+
+
+def hide_axis() -> dict:
+    """Hides axis information in plotly 3D-mesh plot.
+
+    Returns:
+        dict: Axis configuration.
+    """
+    # Switch off all axis information
+    axis_config = dict(
+        showbackground=False,
+        title='',
+        showticklabels=False,
+        showgrid=False,
+        zeroline=False,
+        showspikes=False
+    )
+
+    return axis_config
+
+
+def quantize(array: np.ndarray, dtype: str = "float32") -> np.ndarray:
+    """Rounds an array to the significant decimal digits of a floating point type.
+       This keeps the JSON payload of the figure free of meaningless digits, binary buffers of
+       encode_geometry are cast to the floating point type instead.
+
+    Args:
+        array (np.ndarray): Input array which needs to be rounded.
+        dtype (str, optional): Floating point type defining the precision. Defaults to "float32".
+
+    Returns:
+        np.ndarray: Rounded array.
+    """
+
+    # Get the number of significant decimal digits of the dtype
+    precision = np.finfo(dtype).precision
+    # Get the number of decimal places needed for the largest magnitude
+    magnitude = np.nanmax(np.abs(array))
+    if np.isfinite(magnitude) and magnitude > 0:
+        decimals = precision - int(np.floor(np.log10(magnitude))) - 1
+    else:
+        decimals = precision
+
+    return np.round(array.astype(np.float64), decimals)
+
+
+def update_figure(geometry: Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], config: dict) -> dict:
+    """Updates the figure according to new geometry data.
+
+    Args:
+        geometry (Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]):
+        x,y,z- coordinates of the design as well as the corresponding trianglations.
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        dict: Figure dictionary
+    """
+
+    # Unpack geometry
+    x, y, z, triangles = geometry
+    i, j, k = get_ijk(triangles)
+
+    # Round coordinates to the precision of the engine
+    dtype = config["engine"]["dtype"]
+    x, y, z = quantize(x, dtype), quantize(y, dtype), quantize(z, dtype)
+
+    color = config["app"]["figure"]["color"]
+    colorscale = [[0, color], [1, color]]
+
+    # Update mesh
+    update_data = go.Mesh3d(
+        x=x,
+        y=y,
+        z=z,
+        i=i,
+        j=j,
+        k=k,
+        intensity=z,
+        hoverinfo='none',
+        flatshading=True,
+        colorscale=colorscale,
+        showscale=False,
+        lighting=config["app"]["figure"]["lighting"],
+        lightposition=config["app"]["figure"]["lightposition"],
+    ) # type: ignore
+
+    # Update layout
+    update_layout = go.Layout(
+        height=config["app"]["figure"]["height"],
+        margin=config["app"]["figure"]["margin"],
+        scene=dict(xaxis=hide_axis(),
+                   yaxis=hide_axis(),
+                   zaxis=hide_axis()),
+        scene_aspectmode='data'
+    ) # type: ignore
+
+    # Update configuration
+    update_config = {
+        'displayModeBar': False,
+        'auto_open': False
+    }
+
+    # Combine information
+    update = {
+        'data': [update_data],
+        'layout': update_layout,
+        'config': update_config}
+
+    return update
+
+
+def create_template(config: dict) -> dict:
+    """Creates the style of the mesh trace and the layout, which the browser combines with the geometry arrays.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        dict: Trace style and layout of the figure.
+    """
+
+    color = config["app"]["figure"]["color"]
+
+    # Mesh style without geometry
+    trace = dict(
+        type="mesh3d",
+        hoverinfo='none',
+        flatshading=True,
+        colorscale=[[0, color], [1, color]],
+        showscale=False,
+        lighting=config["app"]["figure"]["lighting"],
+        lightposition=config["app"]["figure"]["lightposition"],
+    )
+
+    # Layout
+    layout = go.Layout(
+        height=config["app"]["figure"]["height"],
+        margin=config["app"]["figure"]["margin"],
+        scene=dict(xaxis=hide_axis(),
+                   yaxis=hide_axis(),
+                   zaxis=hide_axis()),
+        scene_aspectmode='data'
+    ) # type: ignore
+
+    return {"trace": trace, "layout": layout.to_plotly_json()}
+
+
+def encode_geometry(geometry: Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], config: dict, digests: Optional[List[str]] = None) -> dict:
+    """Encodes a geometry update for the browser. Every array is addressed by a digest of its content
+       and only sent if the browser does not hold it already, hence the triangle indices are only sent
+       if the topology changes and coordinates only if they changed. Arrays are sent as base64 encoded
+       buffers, coordinates in the precision of the engine (engine.dtype) and triangles as 32 bit integers.
+       Single precision is what WebGL renders with and halves the payload of double precision.
+
+    Args:
+        geometry (Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]):
+        x,y,z- coordinates of the design as well as the corresponding trianglations.
+        config (dict): Config of the paramter space read from the yaml file.
+        digests (Optional[List[str]], optional): Digests of the arrays the browser holds. Defaults to None.
+
+    Returns:
+        dict: Digest, type and, if not held by the browser, the encoded data of every array.
+    """
+
+    # Unpack geometry and send the coordinates in the precision of the engine
+    x, y, z, triangles = geometry
+    dtype = np.dtype(config["engine"]["dtype"]).newbyteorder("<")
+    arrays = {
+        "x": x.astype(dtype),
+        "y": y.astype(dtype),
+        "z": z.astype(dtype),
+        "triangles": triangles.triangles.astype("<i4"),
+    }
+    digests = set(digests or [])
+
+    update = {}
+    for name, array in arrays.items():
+        # Address the array by its content
+        digest = hashlib.blake2b(array.tobytes(), digest_size=8).hexdigest()
+        data = None if digest in digests else base64.b64encode(array.tobytes()).decode('ascii')
+        update[name] = {"digest": digest, "type": array.dtype.name, "data": data}
+
+    # The template rarely changes, hence it is addressed by its content as well
+    template = json.dumps(create_template(config), sort_keys=True)
+    digest = hashlib.blake2b(template.encode(), digest_size=8).hexdigest()
+    update["template"] = {"digest": digest, "type": "json", "data": None if digest in digests else json.loads(template)}
+
+    return update
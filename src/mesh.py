@@ -0,0 +1,521 @@
+from typing import Optional, Tuple
+import numpy as np
+import matplotlib.tri as mtri
+
+
+def hash_rows(array: np.ndarray) -> np.ndarray:
+    """Packs rows of non-negative integers into single integer keys, so rows can be compared in one dimension.
+
+    Args:
+        array (np.ndarray): Non-negative integers with shape (num_rows, num_cols).
+
+    Returns:
+        np.ndarray: One key per row. Falls back to the rows themselves if the keys would overflow.
+    """
+
+    # Empty arrays have no values to pack
+    if len(array) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Get the number of distinct values per column
+    sizes = array.max(axis=0).astype(np.int64) + 1
+
+    # Fall back to rows if the packed keys exceed int64
+    if np.sum(np.log2(sizes.astype(np.float64))) >= 62:
+        return array
+
+    return np.ravel_multi_index(array.T, sizes)
+
+
+def unique_rows(array: np.ndarray, **kwargs) -> tuple:
+    """Finds unique rows of non-negative integers by means of hashing.
+
+    Args:
+        array (np.ndarray): Non-negative integers with shape (num_rows, num_cols).
+        **kwargs: Keyword arguments passed to np.unique, e.g. return_index or return_counts.
+
+    Returns:
+        tuple: The outputs of np.unique without the unique values.
+    """
+
+    # Compare packed keys instead of rows
+    keys = hash_rows(array)
+    outputs = np.unique(keys, axis=0 if keys.ndim > 1 else None, **kwargs)
+
+    return tuple(output.reshape(-1) for output in outputs[1:])
+
+
+def get_grid_shape(triangles: mtri.triangulation.Triangulation) -> Tuple[int, int]:
+    """Gets the number of rows and columns of the grid a triangulation was generated from.
+
+    Args:
+        triangles (mtri.triangulation.Triangulation): Triangulation of the flattened grid from generate_grid.
+
+    Returns:
+        Tuple[int, int]: Number of rows (second grid component) and columns (first grid component).
+    """
+
+    # The second grid component is constant along a row
+    num_cols = int(np.flatnonzero(triangles.y != triangles.y[0])[0])
+    num_rows = len(triangles.y) // num_cols
+
+    return num_rows, num_cols
+
+
+def trim_seam(values: np.ndarray, period: float = 2 * np.pi) -> int:
+    """Gets the number of grid values before a periodic grid component overlaps itself.
+
+    Args:
+        values (np.ndarray): Increasing values of the grid component.
+        period (float, optional): Period of the grid component. Defaults to two pi.
+
+    Returns:
+        int: Number of values which are kept.
+    """
+
+    # Drop all values which lie within a quarter spacing of the start of the next period
+    spacing = values[1] - values[0]
+    num_values = int(np.count_nonzero(values - values[0] < period - spacing / 4))
+
+    return num_values
+
+
+def generate_grid_triangles(num_rows: int, num_cols: int, wrap_rows: bool = False, wrap_cols: bool = False) -> np.ndarray:
+    """Generates the triangles of a structured grid by splitting each grid cell into two triangles.
+
+    Args:
+        num_rows (int): Number of grid rows.
+        num_cols (int): Number of grid columns.
+        wrap_rows (bool, optional): Connects the last row with the first row. Defaults to False.
+        wrap_cols (bool, optional): Connects the last column with the first column. Defaults to False.
+
+    Returns:
+        np.ndarray: Vertex indices of the triangles with shape (num_triangles, 3).
+    """
+
+    # Get the lower left corner of each cell
+    rows = np.arange(num_rows if wrap_rows else num_rows - 1)
+    cols = np.arange(num_cols if wrap_cols else num_cols - 1)
+    rows, cols = np.meshgrid(rows, cols, indexing="ij")
+    rows, cols = rows.flatten(), cols.flatten()
+
+    # Get the neighbouring row and column
+    rows_next = (rows + 1) % num_rows
+    cols_next = (cols + 1) % num_cols
+
+    # Get the vertex indices of the cell corners
+    v00 = rows * num_cols + cols
+    v01 = rows * num_cols + cols_next
+    v11 = rows_next * num_cols + cols_next
+    v10 = rows_next * num_cols + cols
+
+    # Split cells counterclockwise in the grid plane
+    triangles = np.concatenate([
+        np.stack([v00, v01, v11], axis=-1),
+        np.stack([v00, v11, v10], axis=-1),
+    ])
+
+    return triangles
+
+
+def cap_columns(points: np.ndarray, triangles: np.ndarray, num_rows: int, num_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Closes the first and last column of a grid which is periodic along the rows by fans around their centroids.
+
+    Args:
+        points (np.ndarray): Points of the grid with shape (num_rows * num_cols, 3).
+        triangles (np.ndarray): Vertex indices of the grid triangles.
+        num_rows (int): Number of grid rows.
+        num_cols (int): Number of grid columns.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Points and triangles including both caps.
+    """
+
+    # Get the rings of the first and last column
+    rows = np.arange(num_rows)
+    rows_next = (rows + 1) % num_rows
+    first = rows * num_cols
+    last = rows * num_cols + num_cols - 1
+
+    # Add the centroids of the rings as new points
+    centers = np.stack([points[first].mean(axis=0), points[last].mean(axis=0)])
+    center_first, center_last = len(points), len(points) + 1
+    points = np.concatenate([points, centers.astype(points.dtype)])
+
+    # Create fans with the orientation of the neighbouring grid triangles
+    caps = np.concatenate([
+        np.stack([first[rows], first[rows_next], np.full(num_rows, center_first)], axis=-1),
+        np.stack([last[rows_next], last[rows], np.full(num_rows, center_last)], axis=-1),
+    ])
+    triangles = np.concatenate([triangles, caps])
+
+    return points, triangles
+
+
+def weld_vertices(points: np.ndarray, triangles: np.ndarray, tolerance: float = 1e-6) -> np.ndarray:
+    """Merges coincident points by hashing their quantized coordinates.
+       Non-finite points cannot be quantized, they keep their own index.
+
+    Args:
+        points (np.ndarray): Points of the mesh with shape (num_points, 3).
+        triangles (np.ndarray): Vertex indices of the triangles.
+        tolerance (float, optional): Quantization step relative to the diagonal of the bounding box. Defaults to 1e-6.
+
+    Returns:
+        np.ndarray: Vertex indices of the triangles pointing to the first of all coincident points.
+    """
+
+    indices = np.arange(len(points))
+    finite = np.flatnonzero(np.isfinite(points).all(axis=-1))
+    if len(finite) == 0:
+        return triangles
+
+    # Quantize finite points to integer coordinates
+    lower = points[finite].min(axis=0)
+    size = np.linalg.norm(points[finite].max(axis=0) - lower)
+    step = tolerance * size if size > 0 else 1.
+    quantized = np.round((points[finite] - lower) / step).astype(np.int64)
+
+    # Find the first point of every group of equal coordinates
+    first, inverse = unique_rows(quantized, return_index=True, return_inverse=True)
+    indices[finite] = finite[first[inverse]]
+
+    return indices[triangles]
+
+
+def remove_degenerate_triangles(triangles: np.ndarray) -> np.ndarray:
+    """Removes collapsed triangles with repeated vertices as well as duplicated triangles.
+
+    Args:
+        triangles (np.ndarray): Vertex indices of the triangles.
+
+    Returns:
+        np.ndarray: Vertex indices of the remaining triangles in their original order.
+    """
+
+    # Remove triangles with repeated vertices
+    collapsed = (triangles[:, 0] == triangles[:, 1]) | \
+        (triangles[:, 1] == triangles[:, 2]) | \
+        (triangles[:, 2] == triangles[:, 0])
+    triangles = triangles[~collapsed]
+
+    # Remove triangles sharing the same vertices by hashing the sorted vertex indices
+    first, = unique_rows(np.sort(triangles, axis=-1), return_index=True)
+    triangles = triangles[np.sort(first)]
+
+    return triangles
+
+
+def remove_unused_vertices(points: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Removes points which are not referenced by any triangle.
+
+    Args:
+        points (np.ndarray): Points of the mesh with shape (num_points, 3).
+        triangles (np.ndarray): Vertex indices of the triangles.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Remaining points and reindexed triangles.
+    """
+
+    # Get used points in their original order
+    used, triangles = np.unique(triangles, return_inverse=True)
+    triangles = triangles.reshape(-1, 3)
+
+    return points[used], triangles
+
+
+def is_watertight(triangles: np.ndarray) -> bool:
+    """Checks if every edge of a mesh is shared by exactly two triangles.
+
+    Args:
+        triangles (np.ndarray): Vertex indices of the triangles.
+
+    Returns:
+        bool: True if the mesh is closed and edge manifold.
+    """
+
+    # Collect undirected edges of all triangles
+    edges = np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]])
+    counts, = unique_rows(np.sort(edges, axis=-1), return_counts=True)
+
+    return bool(np.all(counts == 2))
+
+
+def get_axis_error(points: np.ndarray, values: np.ndarray, kept: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Measures the distance of every grid column to the linear interpolation of its kept neighbours.
+
+    Args:
+        points (np.ndarray): Points of the grid with shape (num_rows, num_cols, 3).
+        values (np.ndarray): Grid values of the columns.
+        kept (np.ndarray): Increasing indices of the kept columns, including the first and last column.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Largest error of every column and the position of its left neighbour in kept.
+    """
+
+    # Get the kept neighbours of every original column
+    columns = np.arange(len(values))
+    right = np.clip(np.searchsorted(kept, columns), 1, len(kept) - 1)
+    left = right - 1
+    t = (values - values[kept[left]]) / (values[kept[right]] - values[kept[left]])
+
+    # Calculate the interpolation error of every original column
+    interpolation = (1 - t[None, :, None]) * points[:, kept[left]] + t[None, :, None] * points[:, kept[right]]
+    error = np.linalg.norm(points - interpolation, axis=-1).max(axis=0)
+
+    return error, left
+
+
+def decimate_axis(points: np.ndarray, values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Removes grid columns which can be linearly interpolated from their neighbours within a tolerance.
+       Every pass tries to remove every other remaining column, as long as the interpolation error of all
+       original columns in the widened interval stays below the tolerance. The first and last column are kept.
+
+    Args:
+        points (np.ndarray): Points of the grid with shape (num_rows, num_cols, 3).
+        values (np.ndarray): Grid values of the columns.
+        tolerance (float): Maximum absolute distance of an original point to the decimated surface.
+
+    Returns:
+        np.ndarray: Indices of the kept columns.
+    """
+
+    # Init with all columns
+    kept = np.arange(len(values))
+
+    while len(kept) > 2:
+        # Tentatively remove every other interior column
+        candidates = kept[1:-1:2]
+        remaining = np.setdiff1d(kept, candidates, assume_unique=True)
+
+        # Calculate the interpolation error of every original column
+        error, left = get_axis_error(points, values, remaining)
+
+        # Get the largest error of the interval around every candidate
+        interval_error = np.zeros(len(remaining))
+        np.maximum.at(interval_error, left, error)
+        candidate_error = interval_error[np.searchsorted(remaining, candidates) - 1]
+
+        # Remove candidates within the tolerance
+        removed = candidates[candidate_error <= tolerance]
+        if len(removed) == 0:
+            break
+        kept = np.setdiff1d(kept, removed, assume_unique=True)
+
+    return kept
+
+
+def decimate_grid(points: np.ndarray, a: np.ndarray, b: np.ndarray, tolerance: float = 1e-3, max_triangles: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduces a grid to the rows and columns needed to represent it within a tolerance or a triangle budget.
+       Flat regions lose their rows and columns while curved regions keep the full resolution.
+
+    Args:
+        points (np.ndarray): Points of the grid with shape (num_rows, num_cols, 3).
+        a (np.ndarray): Grid values of the columns.
+        b (np.ndarray): Grid values of the rows.
+        tolerance (float, optional): Maximum deviation relative to the diagonal of the bounding box. Defaults to 1e-3.
+        max_triangles (Optional[int], optional): Upper limit of the number of grid triangles. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of the kept rows and columns.
+    """
+
+    # Convert relative tolerance to an absolute distance
+    flat = points.reshape(-1, 3)
+    size = np.linalg.norm(flat.max(axis=0) - flat.min(axis=0))
+
+    # The error of non-finite points is undefined, keep the full grid
+    if not np.isfinite(size):
+        return np.arange(points.shape[0]), np.arange(points.shape[1])
+
+    while True:
+        # Split the error budget between both grid components, both measured against the full grid
+        cols = decimate_axis(points, a, tolerance * size / 2)
+        rows = decimate_axis(points.transpose(1, 0, 2), b, tolerance * size / 2)
+
+        # Loosen the tolerance until the triangle budget is met. Interpolated points stay within the bounding box,
+        # hence the decimation stops changing once the tolerance of a component exceeds its diagonal
+        if max_triangles is None or 2 * len(rows) * len(cols) <= max_triangles or len(rows) * len(cols) <= 4 or tolerance >= 2:
+            return rows, cols
+        tolerance = 2 * tolerance if tolerance > 0 else 1e-6
+
+
+def get_grid_error(points: np.ndarray, a: np.ndarray, b: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> float:
+    """Gets the deviation of a grid from its kept rows and columns in the relative units of the tolerance of decimate_grid.
+
+    Args:
+        points (np.ndarray): Points of the grid with shape (num_rows, num_cols, 3).
+        a (np.ndarray): Grid values of the columns.
+        b (np.ndarray): Grid values of the rows.
+        rows (np.ndarray): Indices of the kept rows.
+        cols (np.ndarray): Indices of the kept columns.
+
+    Returns:
+        float: Smallest tolerance of decimate_grid which the kept rows and columns meet, infinite for non-finite points.
+    """
+
+    flat = points.reshape(-1, 3)
+    size = np.linalg.norm(flat.max(axis=0) - flat.min(axis=0))
+    if not np.isfinite(size):
+        return np.inf
+    if size == 0:
+        return 0.
+
+    # Each grid component has half of the error budget, see decimate_grid
+    col_error = get_axis_error(points, a, cols)[0].max()
+    row_error = get_axis_error(points.transpose(1, 0, 2), b, rows)[0].max()
+
+    return float(2 * max(col_error, row_error) / size)
+
+
+def is_collinear(points: np.ndarray, tolerance: float) -> bool:
+    """Checks if points lie on a line, e.g. a grid column at the pole of an ellipsoid which textures stretched along its axis.
+
+    Args:
+        points (np.ndarray): Points with shape (num_points, 3).
+        tolerance (float): Largest distance of a point from the line.
+
+    Returns:
+        bool: True if all points are finite and lie on a line.
+    """
+
+    if not np.isfinite(points).all():
+        return False
+
+    # Measure the distances from the principal axis of the points
+    centered = points.astype(np.float64) - points.astype(np.float64).mean(axis=0)
+    direction = np.linalg.svd(centered, full_matrices=False)[2][0]
+    residual = centered - np.outer(centered @ direction, direction)
+
+    return bool(np.linalg.norm(residual, axis=-1).max() <= tolerance)
+
+
+def get_grid_points(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, periodic: Tuple[bool, bool] = (False, True)) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Arranges the points of a design on its grid and trims periodic components before they overlap.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the design.
+        y (np.ndarray): y-coordinates of the points of the design.
+        z (np.ndarray): z-coordinates of the points of the design.
+        triangles (mtri.triangulation.Triangulation): Triangulation returned by generate_grid.
+        periodic (Tuple[bool, bool], optional): Periodicity of the first and second grid component. Defaults to (False, True).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Points of shape (rows, columns, 3) and the kept values of both grid components.
+    """
+
+    # Get grid values of both components
+    num_rows, num_cols = get_grid_shape(triangles)
+    a = triangles.x[:num_cols]
+    b = triangles.y[::num_cols]
+
+    # Trim periodic components before they overlap
+    num_cols_kept = trim_seam(a) if periodic[0] else num_cols
+    num_rows_kept = trim_seam(b) if periodic[1] else num_rows
+
+    # Stack kept points
+    points = np.stack([x, y, z], axis=-1).reshape(num_rows, num_cols, 3)
+    points = points[:num_rows_kept, :num_cols_kept]
+
+    return points, a[:num_cols_kept], b[:num_rows_kept]
+
+
+def select_grid(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, periodic: Tuple[bool, bool] = (False, True), tolerance: float = 0., max_triangles: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Selects the rows and columns of a design which are kept by the decimation of close_mesh.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the design.
+        y (np.ndarray): y-coordinates of the points of the design.
+        z (np.ndarray): z-coordinates of the points of the design.
+        triangles (mtri.triangulation.Triangulation): Triangulation returned by generate_grid.
+        periodic (Tuple[bool, bool], optional): Periodicity of the first and second grid component. Defaults to (False, True).
+        tolerance (float, optional): Decimation error relative to the diagonal of the bounding box,
+                                     0 keeps the full grid. Defaults to 0..
+        max_triangles (Optional[int], optional): Triangle budget of the decimation. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: Indices of the kept rows and columns and their error, see get_grid_error.
+    """
+
+    points, a, b = get_grid_points(x, y, z, triangles, periodic)
+    if tolerance > 0 or max_triangles is not None:
+        rows, cols = decimate_grid(points, a, b, tolerance, max_triangles)
+        return rows, cols, get_grid_error(points, a, b, rows, cols)
+
+    return np.arange(points.shape[0]), np.arange(points.shape[1]), 0.
+
+
+def close_mesh(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, periodic: Tuple[bool, bool] = (False, True), cap: bool = True, weld_tolerance: float = 1e-6, tolerance: float = 0., max_triangles: Optional[int] = None, grid: Optional[Tuple[np.ndarray, np.ndarray, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+    """Turns a design on the overlapping grid of generate_grid into an indexed mesh.
+       Periodic grid components are trimmed before they overlap and connected at the seam,
+       flat regions are decimated, open ends are capped, coincident points are welded and
+       degenerate triangles are removed.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the design.
+        y (np.ndarray): y-coordinates of the points of the design.
+        z (np.ndarray): z-coordinates of the points of the design.
+        triangles (mtri.triangulation.Triangulation): Triangulation returned by generate_grid.
+        periodic (Tuple[bool, bool], optional): Periodicity of the first and second grid component. Defaults to (False, True).
+        cap (bool, optional): Closes open ends of a grid which is periodic along the second component. Defaults to True.
+        weld_tolerance (float, optional): Welding tolerance relative to the diagonal of the bounding box. Defaults to 1e-6.
+        tolerance (float, optional): Decimation error relative to the diagonal of the bounding box,
+                                     0 keeps the full grid. Defaults to 0..
+        max_triangles (Optional[int], optional): Triangle budget of the decimation. Defaults to None.
+        grid (Optional[Tuple[np.ndarray, np.ndarray, float]], optional): Rows and columns kept instead of decimating
+                                                                         and their error, see select_grid. Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]:
+        x,y,z- coordinates of the mesh as well as the corresponding trianglations.
+
+    Raises:
+        ValueError: If no triangle of the design has finite points.
+    """
+
+    # Arrange points on the trimmed grid
+    points, a, b = get_grid_points(x, y, z, triangles, periodic)
+
+    # A periodic first component which starts at a pole, like the ellipsoid, runs from pole to pole,
+    # hence the pole is collapsed and the last column is capped instead of wrapping around to the pole
+    finite = points[np.isfinite(points).all(axis=-1)]
+    size = float(np.linalg.norm(finite.max(axis=0) - finite.min(axis=0))) if len(finite) else 0.
+    if periodic[0] and is_collinear(points[:, 0], weld_tolerance * size):
+        points[:, 0] = points[:, 0].mean(axis=0)
+        periodic = (False, periodic[1])
+
+    # Reuse the rows and columns of a previous decimation as long as they represent the design as well as the previous one
+    if grid is not None:
+        rows, cols, error = grid
+        if rows[-1] >= points.shape[0] or cols[-1] >= points.shape[1] or get_grid_error(points, a, b, rows, cols) > max(tolerance, error):
+            grid = None
+
+    # Remove rows and columns of flat regions
+    if grid is not None:
+        points = points[rows][:, cols]
+    elif tolerance > 0 or max_triangles is not None:
+        rows, cols = decimate_grid(points, a, b, tolerance, max_triangles)
+        points = points[rows][:, cols]
+    num_rows_kept, num_cols_kept = points.shape[:2]
+    points = points.reshape(-1, 3)
+
+    # Triangulate the grid and connect the seams
+    faces = generate_grid_triangles(num_rows_kept, num_cols_kept, wrap_rows=periodic[1], wrap_cols=periodic[0])
+
+    # Cap the open ends of a tube
+    if cap and periodic[1] and not periodic[0]:
+        points, faces = cap_columns(points, faces, num_rows_kept, num_cols_kept)
+
+    # Weld coincident points e.g. at the poles and remove collapsed triangles
+    # as well as triangles of non-finite points, which cannot be rendered or printed
+    faces = weld_vertices(points, faces, weld_tolerance)
+    faces = faces[np.isfinite(points).all(axis=-1)[faces].all(axis=-1)]
+    faces = remove_degenerate_triangles(faces)
+    points, faces = remove_unused_vertices(points, faces)
+    if len(faces) == 0:
+        raise ValueError("The mesh has no triangles of finite points")
+
+    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+    triangles = mtri.Triangulation(x, y, triangles=faces)
+
+    return x, y, z, triangles
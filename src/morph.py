@@ -0,0 +1,205 @@
+"""
+Morphs between two seeded designs, run it from the repository root with
+
+    python -m src.morph --model csym --first 0 --second 1 --frames 60 --output morph.html
+
+The animation is written to a standalone HTML file, --stl additionally writes every frame to an STL file.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+import argparse
+import os
+import numpy as np
+import matplotlib.tri as mtri
+from plotly import graph_objs as go
+
+from src.common import read_config
+from src.engine import PIPELINES, sample_parameters, create_mesh, export_stl, get_ijk
+from src.mesh import select_grid
+from src.pipeline import Pipeline
+from src.figure import update_figure, quantize
+
+
+def ease(weight: float) -> float:
+    """Eases a linear weight in and out, which slows down the morph at both designs.
+
+    Args:
+        weight (float): Linear weight between 0 and 1.
+
+    Returns:
+        float: Smoothstep of the weight.
+    """
+
+    return weight * weight * (3 - 2 * weight)
+
+
+def interpolate_parameters(first: dict, second: dict, weight: float, config: dict, model: str = "csym") -> Tuple[dict, dict]:
+    """Interpolates the sampled parameters of two designs. Discrete parameters like texture types
+       cannot be interpolated, hence each design keeps its own.
+
+    Args:
+        first (dict): Parameters of the first design.
+        second (dict): Parameters of the second design.
+        weight (float): Weight of the second design between 0 and 1.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        Tuple[dict, dict]: Interpolated parameters of the first and second design.
+    """
+
+    first, second = dict(first), dict(second)
+    for key, val in config["models"][model]["parameters"].items():
+        # Only sampled parameters are continuous
+        if not isinstance(val, list):
+            continue
+
+        # The Lamé curve is singular at an edginess of -1, which must not be crossed
+        if key == "edginess" and (1 + first[key]) * (1 + second[key]) <= 0:
+            continue
+
+        first[key] = second[key] = (1 - weight) * first[key] + weight * second[key]
+
+    return first, second
+
+
+def morph(config: dict, model: str = "csym", first_seed: int = 0, second_seed: int = 1, num_frames: int = 60) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]]:
+    """Lazily generates the frames of a morph between two seeded designs.
+       Both designs are evaluated with the interpolated parameters and cross-faded,
+       so the morph starts and ends exactly at the seeded designs. The grid topology
+       and the spline bases are cached by the engine and reused for every frame.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        first_seed (int, optional): Seed of the first design. Defaults to 0.
+        second_seed (int, optional): Seed of the second design. Defaults to 1.
+        num_frames (int, optional): Number of frames including both designs. Defaults to 60.
+
+    Yields:
+        Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]]:
+        x,y,z- coordinates of the frame as well as the corresponding trianglations.
+    """
+
+    # Sample both designs
+    first = sample_parameters(config, model, first_seed)
+    second = sample_parameters(config, model, second_seed)
+
+    # Use separate memos of a single result, so frames neither evict designs of the app nor pile up
+    stages = PIPELINES[model].stages
+    first_pipeline, second_pipeline = Pipeline(stages, cache_size=1), Pipeline(stages, cache_size=1)
+
+    for frame in range(num_frames):
+        weight = ease(frame / max(num_frames - 1, 1))
+        first_parameters, second_parameters = interpolate_parameters(first, second, weight, config, model)
+
+        # Evaluate both designs and cross-fade them, they share the topology of the grid
+        x_first, y_first, z_first, triangles = first_pipeline.evaluate(first_parameters)[0]
+        x_second, y_second, z_second, _ = second_pipeline.evaluate(second_parameters)[0]
+        x = (1 - weight) * x_first + weight * x_second
+        y = (1 - weight) * y_first + weight * y_second
+        z = (1 - weight) * z_first + weight * z_second
+
+        yield x, y, z, triangles
+
+
+def export_frames(frames: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]], config: dict, model: str = "csym", directory: str = "frames") -> List[str]:
+    """Streams the frames of a morph to STL files, only a single frame is held in memory.
+
+    Args:
+        frames (Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]]): Frames of a morph.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        directory (str, optional): Directory of the STL files. Defaults to "frames".
+
+    Returns:
+        List[str]: Paths of the STL files.
+    """
+
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for frame, geometry in enumerate(frames):
+        path = os.path.join(directory, f"frame_{frame:04d}.stl")
+        export_stl(path, *create_mesh(geometry, config, model, "export"))
+        paths.append(path)
+
+    return paths
+
+
+def animate(frames: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]], config: dict, model: str = "csym", duration: int = 50) -> go.Figure:
+    """Streams the frames of a morph into an animated figure. The first frame selects the decimation,
+       which later frames reuse within its tolerance. Welding merges a different number of points per frame,
+       hence every frame brings its own triangle indices along with its rounded coordinates.
+
+    Args:
+        frames (Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation]]): Frames of a morph.
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        duration (int, optional): Duration of a frame in milliseconds. Defaults to 50.
+
+    Returns:
+        go.Figure: Animated figure.
+    """
+
+    dtype = config["engine"]["dtype"]
+    mesh_config = config["engine"]["mesh"]
+
+    animation, grid = [], None
+    for frame, geometry in enumerate(frames):
+        # Select the decimation of the first frame for all frames
+        if grid is None:
+            grid = select_grid(*geometry, periodic=config["models"][model]["periodic"],
+                               tolerance=mesh_config["render"]["tolerance"], max_triangles=mesh_config["render"]["max_triangles"])
+
+        mesh = create_mesh(geometry, config, model, "render", grid=grid)
+        if frame == 0:
+            figure = update_figure(mesh, config)
+
+        x, y, z, triangles = mesh
+        i, j, k = get_ijk(triangles)
+        x, y, z = quantize(x, dtype), quantize(y, dtype), quantize(z, dtype)
+        animation.append(go.Frame(data=[go.Mesh3d(x=x, y=y, z=z, i=i, j=j, k=k, intensity=z)], name=str(frame)))
+
+    # Add play button
+    layout = go.Layout(figure["layout"])
+    layout.updatemenus = [dict(
+        type="buttons",
+        showactive=False,
+        buttons=[dict(label="Play", method="animate",
+                      args=[None, dict(frame=dict(duration=duration, redraw=True), fromcurrent=True)])]
+    )]
+
+    return go.Figure(data=figure["data"], layout=layout, frames=animation)
+
+
+def main(arguments: Optional[List[str]] = None):
+    """Morphs between two seeded designs from the command line and writes the animation.
+
+    Args:
+        arguments (Optional[List[str]], optional): Command line arguments, read from sys.argv if not given. Defaults to None.
+    """
+
+    parser = argparse.ArgumentParser(description='Morph between two seeded designs')
+    parser.add_argument('-c', '--config', type=str, default="config.yml", help='Path to configuration yaml-file.')
+    parser.add_argument('-m', '--model', type=str, default="csym", help='Model of both designs (csym or rsym).')
+    parser.add_argument('--first', type=int, default=0, help='Seed of the first design.')
+    parser.add_argument('--second', type=int, default=1, help='Seed of the second design.')
+    parser.add_argument('--frames', type=int, default=60, help='Number of frames including both designs.')
+    parser.add_argument('-o', '--output', type=str, default="morph.html", help='Path of the animation.')
+    parser.add_argument('--stl', type=str, default=None, help='Directory of the STL files of the frames, not written if not given.')
+    parsed = parser.parse_args(arguments)
+
+    config = read_config(parsed.config)
+
+    figure = animate(morph(config, parsed.model, parsed.first, parsed.second, parsed.frames), config, parsed.model)
+    figure.write_html(parsed.output)
+    print(f"Wrote {parsed.frames} frames to {parsed.output}")
+
+    if parsed.stl is not None:
+        paths = export_frames(morph(config, parsed.model, parsed.first, parsed.second, parsed.frames), config, parsed.model, parsed.stl)
+        print(f"Wrote {len(paths)} STL files to {parsed.stl}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import numpy as np
+
+from src.engine import resample_seed, sample_parameters, evaluate_design, create_mesh, open_store, generate_grid_topology, generate_seed
+from src.thumbnail import render_thumbnail, encode_png
+
+# Pool of the worker process, see open_pool
+POOL: Optional[ProcessPoolExecutor] = None
+
+
+def init_pool_process(config: dict):
+    """Prepares a process of the pool, which maps the meshes and topology of the store.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+    """
+
+    open_store(config)
+
+    # Triangulate the grid of the previews, the first process shares it through the store
+    generate_grid_topology(config["app"]["multiples"]["num_points"])
+
+
+def get_pool_size(config: dict) -> int:
+    """Gets the number of processes of the pool of a worker, one per core unless set in the config.
+       The previews have an admission control of their own, which keeps the pool from taking the slots of interactive designs.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        int: Number of processes.
+    """
+
+    return config["app"]["multiples"]["max_workers"] or os.cpu_count() or 1
+
+
+def open_pool(config: dict) -> ProcessPoolExecutor:
+    """Opens the process pool which designs previews in parallel, its processes start on first use.
+       Processes are spawned, as forking a worker with running threads may copy held locks.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        ProcessPoolExecutor: The pool.
+    """
+
+    global POOL
+
+    if POOL is None:
+        POOL = ProcessPoolExecutor(
+            max_workers=get_pool_size(config),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_pool_process,
+            initargs=(config,)
+        )
+
+    return POOL
+
+
+def preview_design(config: dict, model: str = "csym", seed: int = 0) -> Tuple[str, int, bytes]:
+    """Designs a seeded model at the reduced resolution of the previews and renders it.
+       The seed of the accepted attempt is returned, as the full resolution design starts resampling from it.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the design, see resample_seed. Defaults to 0.
+
+    Returns:
+        Tuple[str, int, bytes]: Model, accepted seed and PNG file content of the preview.
+    """
+
+    multiples = config["app"]["multiples"]
+
+    # Resample at the resolution of the previews and design the accepted seed
+    seed, _ = resample_seed(config, model, seed, multiples["num_points"])
+    parameters = sample_parameters(config, model, seed)
+    parameters["num_points"] = multiples["num_points"]
+    geometry, _ = evaluate_design(parameters, model)
+
+    image = render_thumbnail(*create_mesh(geometry, config, model, "thumbnail"), config, multiples["size"])
+
+    return model, seed, encode_png(image)
+
+
+def generate_previews(config: dict, num_designs: Optional[int] = None) -> List[Tuple[str, int, bytes]]:
+    """Generates previews of random designs in parallel on the process pool.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        num_designs (Optional[int], optional): Number of designs, defaults to the config. Defaults to None.
+
+    Returns:
+        List[Tuple[str, int, bytes]]: Model, accepted seed and PNG file content of every preview, see preview_design.
+    """
+
+    if num_designs is None:
+        num_designs = config["app"]["multiples"]["num_designs"]
+
+    # Draw the models and seeds, a seed reproduces its design at full resolution
+    models = np.random.default_rng().choice(list(config["models"]), num_designs).tolist()
+    seeds = [generate_seed(config) for _ in range(num_designs)]
+
+    # Design in parallel and keep the order of the seeds
+    pool = open_pool(config)
+    return list(pool.map(preview_design, [config] * num_designs, models, seeds))
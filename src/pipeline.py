@@ -0,0 +1,158 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+import time
+import zlib
+import numpy as np
+
+
+class Stage:
+    """A step of a design pipeline which depends on parameters and on the results of other stages."""
+
+    def __init__(self, name: str, function: Callable, parameters: Optional[List[str]] = None, stages: Optional[List[str]] = None, random: bool = False):
+        """Creates a stage.
+
+        Args:
+            name (str): Name of the stage, used as input name for downstream stages.
+            function (Callable): Function called with the results of the upstream stages and the parameters as keyword arguments.
+            parameters (Optional[List[str]], optional): Names of the parameters the stage depends on. Defaults to None.
+            stages (Optional[List[str]], optional): Names of the upstream stages the stage depends on. Defaults to None.
+            random (bool, optional): Passes a seeded random generator to the function as rng. Defaults to False.
+        """
+        self.name = name
+        self.function = function
+        self.parameters = parameters or []
+        self.stages = stages or []
+        self.random = random
+
+
+def freeze(value: Any) -> Any:
+    """Makes arrays of a stage result read-only, so memoized results cannot be modified by downstream stages.
+
+    Args:
+        value (Any): Result of a stage.
+
+    Returns:
+        Any: The same result with read-only arrays.
+    """
+
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+
+    return value
+
+
+class Pipeline:
+    """A graph of stages whose results are memoized by their inputs.
+       Changing a parameter only recomputes the stages downstream of it.
+       Random stages get a generator of their own seeded from the seed parameter and the stage name,
+       so their random choices stay the same when other parameters change and do not depend on other threads.
+       Stages run outside of the lock of the pipeline, hence designs are evaluated concurrently,
+       a stage requested by several threads at once is computed by the first and awaited by the others.
+    """
+
+    def __init__(self, stages: List[Stage], cache_size: int = 8):
+        """Creates a pipeline.
+
+        Args:
+            stages (List[Stage]): Stages in topological order, the last stage returns the result of the pipeline.
+            cache_size (int, optional): Number of memoized results per stage. Defaults to 8.
+        """
+        self.stages = stages
+        self.cache_size = cache_size
+        self.cache = {stage.name: OrderedDict() for stage in stages}
+        self.pending: Dict[Tuple[str, tuple], Future] = {}
+        self.lock = threading.Lock()
+
+    def get_key(self, stage: Stage, parameters: dict, keys: Dict[str, tuple]) -> tuple:
+        """Gets the memoization key of a stage from its parameters and the keys of its upstream stages.
+
+        Args:
+            stage (Stage): The stage.
+            parameters (dict): Parameters of the design.
+            keys (Dict[str, tuple]): Keys of the already evaluated stages.
+
+        Returns:
+            tuple: Hashable key of the stage inputs.
+        """
+
+        key = tuple((name, parameters[name]) for name in stage.parameters)
+        key += tuple(keys[name] for name in stage.stages)
+        if stage.random:
+            key += (("seed", parameters["seed"]),)
+
+        return key
+
+    def evaluate(self, parameters: dict, timings: Optional[Dict[str, float]] = None) -> Tuple[Any, Dict[str, str]]:
+        """Evaluates all stages, reusing memoized results of unchanged stages.
+
+        Args:
+            parameters (dict): Parameters of the design including the seed of random stages.
+            timings (Optional[Dict[str, float]], optional): Receives the seconds of every computed stage. Defaults to None.
+
+        Returns:
+            Tuple[Any, Dict[str, str]]: Result of the last stage and whether each stage was "computed" or "reused".
+        """
+
+        keys, results, report = {}, {}, {}
+
+        for stage in self.stages:
+            key = self.get_key(stage, parameters, keys)
+            keys[stage.name] = key
+
+            # Look up the memoized result or the computation of another thread, else claim the computation
+            with self.lock:
+                cache = self.cache[stage.name]
+                if key in cache:
+                    cache.move_to_end(key)
+                    results[stage.name] = cache[key]
+                    report[stage.name] = "reused"
+                    continue
+                future = self.pending.get((stage.name, key))
+                owner = future is None
+                if owner:
+                    future = self.pending[(stage.name, key)] = Future()
+
+            if not owner:
+                results[stage.name] = future.result()
+                report[stage.name] = "reused"
+                continue
+
+            # Compute the stage without holding the lock
+            inputs = {name: results[name] for name in stage.stages}
+            inputs.update({name: parameters[name] for name in stage.parameters})
+
+            # Seed random choices of the stage independently of other stages and threads
+            if stage.random:
+                inputs["rng"] = np.random.default_rng((int(parameters["seed"]) + zlib.crc32(stage.name.encode())) % 2 ** 32)
+
+            start = time.perf_counter()
+            try:
+                result = freeze(stage.function(**inputs))
+            except BaseException as error:
+                # Let waiting threads fail like this one, a later call computes the stage again
+                with self.lock:
+                    del self.pending[(stage.name, key)]
+                future.set_exception(error)
+                raise
+            if timings is not None:
+                timings[stage.name] = time.perf_counter() - start
+
+            # Memoize the result, evicting the least recently used result
+            with self.lock:
+                cache[key] = result
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+                del self.pending[(stage.name, key)]
+            future.set_result(result)
+            results[stage.name] = result
+            report[stage.name] = "computed"
+
+        return results[self.stages[-1].name], report
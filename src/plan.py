@@ -0,0 +1,106 @@
+from typing import Optional
+import numpy as np
+
+from src.store import get_key
+
+
+def get_plan_digest(config: dict, model: str = "csym") -> str:
+    """Gets the digest of the settings a model is compiled from, which identifies its plan.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        str: Hex digest of the model config and the engine precision.
+    """
+
+    return get_key("plan", model, config["models"][model], config["engine"]["dtype"])
+
+
+class ModelPlan:
+    """A model of the config compiled once, so sampling a design does not walk the config."""
+
+    def __init__(self, config: dict, model: str = "csym"):
+        """Compiles a model of the config.
+
+        Args:
+            config (dict): Config of the paramter space read from the yaml file.
+            model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        """
+        self.config = config
+        self.model = model
+        self.digest = get_plan_digest(config, model)
+        model_config = config["models"][model]
+
+        # Split sampled parameters given as [low, high] from constant parameters
+        parameters = model_config["parameters"]
+        self.names = [key for key, val in parameters.items() if isinstance(val, list)]
+        self.low = np.array([parameters[key][0] for key in self.names], dtype=np.float64)
+        self.high = np.array([parameters[key][1] for key in self.names], dtype=np.float64)
+        self.constants = {key: val for key, val in parameters.items() if not isinstance(val, list)}
+
+        # Texture types are drawn for phi and the second angle of the model
+        self.num_texture_types = model_config["num_texture_types"]
+        self.texture_types = ["phi_texture_type", "z_texture_type" if model == "csym" else "theta_texture_type"]
+
+        self.num_points = parameters["num_points"]
+        self.dtype = config["engine"]["dtype"]
+
+    def sample(self, seed: Optional[int] = None) -> dict:
+        """Samples the parameters of a design from a generator of its own, which other threads cannot reseed.
+
+        Args:
+            seed (Optional[int], optional): Seed of the random generator to reproduce a design. Defaults to None.
+
+        Returns:
+            dict: A dictionary containing the generated parameters for the model.
+        """
+
+        # Seed the random generator to make the design reproducible
+        rng = np.random.default_rng(seed)
+
+        # Draw all bounded parameters at once
+        parameters = dict(self.constants)
+        parameters.update(zip(self.names, rng.uniform(self.low, self.high).tolist()))
+
+        # Add texture types
+        for key in self.texture_types:
+            parameters[key] = int(rng.integers(self.num_texture_types))
+
+        # Add floating point precision used throughout the engine
+        parameters["dtype"] = self.dtype
+
+        # Add seed of the random choices of the design stages
+        parameters["seed"] = int(rng.integers(2 ** 31))
+
+        return parameters
+
+    @property
+    def dimensions(self) -> int:
+        """Number of sampled dimensions, the bounded parameters followed by the texture types."""
+
+        return len(self.names) + len(self.texture_types)
+
+    def scale(self, unit: np.ndarray, seed: int = 0) -> dict:
+        """Maps a point of the unit hypercube to the parameters of a design, e.g. a point of a stratified sample.
+
+        Args:
+            unit (np.ndarray): Point with a coordinate between 0 and 1 for every dimension, see dimensions.
+            seed (int, optional): Seed of the random choices of the design stages. Defaults to 0.
+
+        Returns:
+            dict: A dictionary containing the parameters for the model.
+        """
+
+        parameters = dict(self.constants)
+        parameters.update(zip(self.names, (self.low + unit[:len(self.names)] * (self.high - self.low)).tolist()))
+
+        # Texture types split their coordinate into equal intervals
+        for key, value in zip(self.texture_types, unit[len(self.names):]):
+            parameters[key] = min(int(value * self.num_texture_types), self.num_texture_types - 1)
+
+        parameters["dtype"] = self.dtype
+        parameters["seed"] = int(seed)
+
+        return parameters
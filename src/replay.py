@@ -0,0 +1,190 @@
+"""
+Replays captured design requests against the engine, run it from the repository root with
+
+    python -m src.replay logs/requests-*.jsonl --concurrency 4
+
+Requests are captured by the app if app.capture.enabled is set in the config (see src.capture).
+Every admitted request is designed, meshed, analyzed and encoded again like its callback did,
+requests run on a thread pool like the threads of a gunicorn worker. Seeds and parameters
+are recorded, hence the replayed designs are the captured designs.
+
+The report compares the recorded and replayed durations by callback and by engine step.
+A request may have been served from the shared store or the stage caches when it was captured,
+hence steps are only compared if they ran in both, which keeps cache hits from hiding regressions.
+"""
+
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+from src.common import read_config
+from src.engine import resample_design, validate_design, mesh_design, export_stl
+from src.analytics import analyze_design
+from src.capture import trace, timed
+from src.figure import encode_geometry
+
+
+def read_entries(paths: List[str]) -> List[dict]:
+    """Reads the admitted requests of request logs, including rotated logs, in the order they were captured.
+
+    Args:
+        paths (List[str]): Paths of the logs.
+
+    Returns:
+        List[dict]: Captured requests.
+    """
+
+    entries = []
+    for path in paths:
+        with open(path, "r") as file:
+            entries.extend(json.loads(line) for line in file if line.strip())
+
+    # Rejected requests did not call the engine
+    entries = [entry for entry in entries if entry["status"] == "admitted"]
+
+    return sorted(entries, key=lambda entry: entry["time"])
+
+
+def replay_entry(entry: dict, config: dict) -> Dict[str, object]:
+    """Replays a captured request like its callback.
+
+    Args:
+        entry (dict): Captured request.
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        Dict[str, object]: Duration in seconds as well as the traced timings and stages of the replay.
+    """
+
+    model = entry["model"]
+    start = time.perf_counter()
+
+    with trace() as record:
+        if entry["callback"] == "generate":
+            resample_design(config, model, entry["seed"])
+        elif entry["callback"] == "update":
+            mesh = mesh_design(entry["parameters"], config, model, "render", entry["reference"])
+            valid = validate_design(entry["parameters"], config, model)
+            analyze_design(entry["parameters"], config, model, valid)
+            with timed("encode"):
+                encode_geometry(mesh, config, entry.get("digests"))
+        elif entry["callback"] == "download":
+            validate_design(entry["parameters"], config, model)
+            mesh = mesh_design(entry["parameters"], config, model, "export")
+            with tempfile.TemporaryDirectory() as directory, timed("export"):
+                export_stl(os.path.join(directory, "export.stl"), *mesh)
+        else:
+            raise ValueError(f"Unknown callback {entry['callback']}")
+
+    return {"duration": time.perf_counter() - start, **record}
+
+
+def run_replay(entries: List[dict], config: dict, concurrency: int = 1) -> List[Dict[str, object]]:
+    """Replays captured requests at a concurrency.
+
+    Args:
+        entries (List[dict]): Captured requests, see read_entries.
+        config (dict): Config of the paramter space read from the yaml file.
+        concurrency (int, optional): Number of requests replayed at once. Defaults to 1.
+
+    Returns:
+        List[Dict[str, object]]: Replay of every request, see replay_entry.
+    """
+
+    # Keep the rejected designs of the engine out of the report
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(replay_entry, entries, [config] * len(entries)))
+
+
+def compare(recorded: List[float], replayed: List[float]) -> str:
+    """Formats the medians and 95th percentiles of recorded and replayed durations and the change of the median.
+
+    Args:
+        recorded (List[float]): Recorded durations in seconds.
+        replayed (List[float]): Replayed durations in seconds.
+
+    Returns:
+        str: Line of the report.
+    """
+
+    medians = np.median(recorded) * 1000, np.median(replayed) * 1000
+    tails = np.percentile(recorded, 95) * 1000, np.percentile(replayed, 95) * 1000
+    change = (medians[1] / medians[0] - 1) if medians[0] > 0 else np.nan
+
+    return f"{len(recorded):>6} {medians[0]:>10.1f} {medians[1]:>10.1f} {tails[0]:>10.1f} {tails[1]:>10.1f} {change:>+9.0%}"
+
+
+def report_replay(entries: List[dict], results: List[Dict[str, object]], num_slowest: int = 5) -> List[str]:
+    """Reports the timing differences between captured and replayed requests.
+
+    Args:
+        entries (List[dict]): Captured requests.
+        results (List[Dict[str, object]]): Replays of the requests, see run_replay.
+        num_slowest (int, optional): Number of requests with the largest slowdown listed. Defaults to 5.
+
+    Returns:
+        List[str]: Lines of the report.
+    """
+
+    header = f"{'':<24}{'count':>6} {'rec p50':>10} {'rep p50':>10} {'rec p95':>10} {'rep p95':>10} {'change':>9}"
+    lines = ["Durations in ms by callback", header]
+
+    # End to end by callback
+    for callback in sorted({entry["callback"] for entry in entries}):
+        pairs = [(entry["duration"], result["duration"]) for entry, result in zip(entries, results) if entry["callback"] == callback]
+        lines.append(f"{callback:<24}" + compare(*zip(*pairs)))
+
+    # By engine step, only if the step ran in both
+    lines += ["", "Durations in ms by step", header]
+    steps: Dict[str, list] = {}
+    for entry, result in zip(entries, results):
+        for name, seconds in entry.get("timings", {}).items():
+            if name in result["timings"]:
+                steps.setdefault(name, []).append((seconds, result["timings"][name]))
+    for name in sorted(steps):
+        lines.append(f"{name:<24}" + compare(*zip(*steps[name])))
+
+    # Requests which slowed down most
+    lines += ["", "Largest slowdowns"]
+    ratios = [result["duration"] / max(entry["duration"], 1e-9) for entry, result in zip(entries, results)]
+    for index in np.argsort(ratios)[::-1][:num_slowest]:
+        entry, result = entries[index], results[index]
+        lines.append(f"{entry['time']} {entry['callback']:<9} {entry['model']} {entry['duration'] * 1000:8.1f} -> {result['duration'] * 1000:8.1f} ms")
+
+    return lines
+
+
+def main(arguments: Optional[List[str]] = None):
+    """Replays request logs from the command line and prints the report.
+
+    Args:
+        arguments (Optional[List[str]], optional): Command line arguments, read from sys.argv if not given. Defaults to None.
+    """
+
+    parser = argparse.ArgumentParser(description='Replay captured design requests against the engine')
+    parser.add_argument('logs', type=str, nargs='+', help='Paths of the request logs.')
+    parser.add_argument('-c', '--config', type=str, default="config.yml", help='Path to configuration yaml-file.')
+    parser.add_argument('--concurrency', type=int, default=1, help='Number of requests replayed at once.')
+    parsed = parser.parse_args(arguments)
+
+    config = read_config(parsed.config)
+    entries = read_entries(parsed.logs)
+    if not entries:
+        print("No admitted requests in the logs")
+        return
+
+    start = time.perf_counter()
+    results = run_replay(entries, config, parsed.concurrency)
+    print(f"Replayed {len(entries)} requests at concurrency {parsed.concurrency} in {time.perf_counter() - start:.1f}s\n")
+    print("\n".join(report_replay(entries, results)))
+
+
+if __name__ == "__main__":
+    main()
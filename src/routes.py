@@ -0,0 +1,156 @@
+from typing import Optional, Tuple
+import json
+import os
+import tempfile
+import numpy as np
+import matplotlib.tri as mtri
+import flask
+import dash
+
+from src.admission import AdmissionController, get_client
+from src.engine import GEOMETRY_VERSION, resample_design, mesh_design, export_stl, export_obj, get_store, get_max_seed
+from src.store import get_key
+from src.thumbnail import create_thumbnail, read_thumbnail, get_gallery
+
+# Mimetype and mesh purpose of the formats of a design
+FORMATS = {
+    "json": ("application/json", "render"),
+    "stl": ("model/stl", "export"),
+    "obj": ("model/obj", "export"),
+}
+
+
+def get_design_digest(config: dict, model: str = "csym") -> str:
+    """Gets the digest of the settings and the engine version which a seeded design depends on,
+       so the URL of a design changes with them. Settings like the store or the warm-up do not change the URL.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+
+    Returns:
+        str: Hex digest of the geometry version, the model, the precision, meshes and validation of the engine
+             and the figure config of the JSON format.
+    """
+
+    engine = config["engine"]
+    return get_key("design", GEOMETRY_VERSION, config["models"][model], engine["dtype"], engine["mesh"], engine["validation"],
+                   config["app"]["figure"])[:16]
+
+
+def get_design_url(config: dict, model: str = "csym", seed: int = 0, format: str = "stl") -> str:
+    """Gets the URL of a seeded design, its content never changes.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the design, see resample_design. Defaults to 0.
+        format (str, optional): Format of the design, see FORMATS. Defaults to "stl".
+
+    Returns:
+        str: URL of the design.
+    """
+
+    return f"/designs/{model}/{seed}/{get_design_digest(config, model)}.{format}"
+
+
+def encode_design(mesh: Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], config: dict, format: str = "stl") -> bytes:
+    """Encodes the mesh of a design in a format.
+
+    Args:
+        mesh (Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]):
+        x,y,z- coordinates of the mesh as well as the corresponding trianglations.
+        config (dict): Config of the paramter space read from the yaml file.
+        format (str, optional): Format of the design, see FORMATS. Defaults to "stl".
+
+    Returns:
+        bytes: File content.
+    """
+
+    if format == "json":
+        # Imported on use, plotly is only needed for figures
+        from plotly.utils import PlotlyJSONEncoder
+        from src.figure import update_figure
+
+        return json.dumps(update_figure(mesh, config), cls=PlotlyJSONEncoder).encode()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"design.{format}")
+        {"stl": export_stl, "obj": export_obj}[format](path, *mesh)
+        with open(path, "rb") as file:
+            return file.read()
+
+
+def create_routes(app: dash.Dash, config: dict, admission: Optional[AdmissionController] = None):
+    """Creates the routes of the server next to the dash app.
+
+    Args:
+        app (dash.Dash): Dash app.
+        config (dict): Config of the paramter space read from the yaml file.
+        admission (Optional[AdmissionController], optional): Limits the engine calls of the designs,
+                                                             created from the config if not given. Defaults to None.
+    """
+
+    if admission is None:
+        admission = AdmissionController(**config["app"]["admission"])
+
+    # Thumbnails are rendered one after another without a queue, the browser retries rejected thumbnails
+    gallery_admission = AdmissionController(**config["app"]["gallery"]["admission"])
+    gallery = set(get_gallery(config))
+
+    @app.server.route('/thumbnails/<model>/<int:seed>.png')
+    def thumbnail(model: str, seed: int) -> flask.Response:
+        # Only the thumbnails of the gallery are rendered, which bounds the cache on disk
+        if (model, seed) not in gallery:
+            flask.abort(404)
+
+        # Render the thumbnail if it is not cached yet
+        data = read_thumbnail(config, model, seed)
+        if data is None:
+            with gallery_admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+                if status != "admitted":
+                    return flask.Response(status=503, headers={"Retry-After": "1", "Cache-Control": "no-store"})
+                data = create_thumbnail(config, model, seed)
+
+        response = flask.Response(data, mimetype="image/png")
+        response.headers["Cache-Control"] = f"public, max-age={config['app']['assets_max_age']}"
+
+        return response
+
+    @app.server.route('/designs/<model>/<int:seed>/<digest>.<format>')
+    def design(model: str, seed: int, digest: str, format: str) -> flask.Response:
+        # URLs of changed settings are gone, as their designs cannot be reproduced
+        if model not in config["models"] or format not in FORMATS or digest != get_design_digest(config, model):
+            flask.abort(404)
+
+        # Seeds are bounded like the seeds of generated designs
+        if seed > get_max_seed(config):
+            flask.abort(404)
+
+        # The URL identifies the content, hence its key is a strong ETag known without the engine
+        etag = get_key("design", model, seed, digest, format)
+        headers = {
+            "ETag": f'"{etag}"',
+            "Cache-Control": f"public, max-age={config['app']['designs_max_age']}, immutable",
+        }
+        if flask.request.if_none_match.contains(etag):
+            return flask.Response(status=304, headers=headers)
+
+        # Serve the design encoded by any worker or design and encode it
+        mimetype, purpose = FORMATS[format]
+        store = get_store()
+        data = store.get_bytes(etag) if store is not None else None
+        if data is None:
+            with admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+                if status != "admitted":
+                    return flask.Response(status=503, headers={"Retry-After": "1", "Cache-Control": "no-store"})
+                parameters, _, _ = resample_design(config, model, seed)
+                data = encode_design(mesh_design(parameters, config, model, purpose), config, format)
+            if store is not None:
+                store.put(etag, data=data)
+
+        response = flask.Response(data, mimetype=mimetype, headers=headers)
+        if format != "json":
+            response.headers["Content-Disposition"] = f"attachment; filename=leonardo-{model}-{seed}.{format}"
+
+        return response
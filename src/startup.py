@@ -0,0 +1,94 @@
+"""
+Profiles the startup of the app, run it from the repository root with
+
+    python -m src.startup
+
+Modules are imported one after another, hence every import time only
+contains the submodules which were not imported before. Modules imported
+by the app come first, engine-only modules which are imported on first use follow.
+"""
+
+from typing import Callable, List, Tuple
+import importlib
+import time
+
+# Modules imported when the app boots
+APP_MODULES = [
+    "numpy",
+    "yaml",
+    "matplotlib.tri",
+    "plotly.graph_objs",
+    "dash",
+    "dash_bootstrap_components",
+    "src.engine",
+    "src.ui",
+]
+
+# Modules imported on first use of the engine
+ENGINE_MODULES = [
+    "scipy.signal",
+    "scipy.spatial",
+    "sklearn.preprocessing",
+    "stl",
+]
+
+
+def measure(function: Callable, *args) -> Tuple[object, float]:
+    """Measures the wall time of a function call.
+
+    Args:
+        function (Callable): Function to call.
+
+    Returns:
+        Tuple[object, float]: Result of the function and wall time in seconds.
+    """
+
+    start = time.perf_counter()
+    result = function(*args)
+
+    return result, time.perf_counter() - start
+
+
+def profile_startup(path: str = "config.yml") -> List[Tuple[str, float]]:
+    """Profiles the imports and boot steps of the app and prints a report.
+
+    Args:
+        path (str, optional): Path to config yaml file. Defaults to "config.yml".
+
+    Returns:
+        List[Tuple[str, float]]: Name and wall time in seconds of each step.
+    """
+
+    report = []
+
+    # Import modules of the app and of the engine
+    for name in APP_MODULES + ENGINE_MODULES:
+        _, duration = measure(importlib.import_module, name)
+        report.append((f"import {name}", duration))
+
+    from src.common import read_config
+    from src.ui import create_app, create_callbacks
+    from src.engine import warm_up
+
+    # Boot the app
+    config, duration = measure(read_config, path)
+    report.append(("read_config", duration))
+    app, duration = measure(create_app, config)
+    report.append(("create_app", duration))
+    _, duration = measure(create_callbacks, app, config)
+    report.append(("create_callbacks", duration))
+    for model in config["models"]:
+        _, duration = measure(warm_up, config, model)
+        report.append((f"warm_up {model}", duration))
+
+    # Print report
+    width = max(len(name) for name, _ in report)
+    for name, duration in report:
+        print(f"{name:<{width}} {duration * 1000:10.1f} ms")
+    print(f"{'total':<{width}} {sum(duration for _, duration in report) * 1000:10.1f} ms")
+
+    return report
+
+
+if __name__ == "__main__":
+    profile_startup()
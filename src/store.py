@@ -0,0 +1,209 @@
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import uuid
+import numpy as np
+
+# Version of the layout of the entries, keys of other versions never match
+FORMAT_VERSION = 2
+
+
+def get_key(*parts) -> str:
+    """Gets a store key from JSON serializable parts, e.g. the model and parameters of a design.
+       The key includes the format version of the store.
+
+    Args:
+        parts: JSON serializable parts of the key.
+
+    Returns:
+        str: Hex digest of the parts.
+    """
+
+    return hashlib.blake2b(json.dumps([FORMAT_VERSION, parts], sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+class SharedStore:
+    """A store of read-only arrays and bytes shared by all worker processes of the app.
+       Entries are directories of .npy files which are memory-mapped on read, hence workers share
+       the pages of an entry instead of holding copies. On /dev/shm the pages are kept in memory.
+       Entries are written to a temporary directory and renamed, so readers never see partial entries.
+       Entries are removed the same way, they are renamed out of the store before their files are deleted.
+       The least recently used entries are evicted once the store exceeds its size, pinned entries are kept.
+       Eviction scans all entries, hence a process only scans once it wrote scan_bytes since its last scan,
+       which keeps writes cheap while the store may exceed its size by scan_bytes per process in between.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 500_000_000, scan_bytes: Optional[int] = None):
+        """Opens or creates a store.
+
+        Args:
+            directory (Optional[str], optional): Directory of the store, defaults to /dev/shm
+                                                 or the temporary directory. Defaults to None.
+            max_bytes (int, optional): Size of the unpinned entries which triggers eviction. Defaults to 500_000_000.
+            scan_bytes (Optional[int], optional): Bytes written by a process between two evictions,
+                                                  a tenth of the size if not given. Defaults to None.
+        """
+        if directory is None:
+            directory = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "leonardo")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.scan_bytes = max_bytes // 10 if scan_bytes is None else scan_bytes
+
+        # Bytes written by this process since its last eviction
+        self.written = 0
+
+        os.makedirs(os.path.join(directory, "entries"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "pinned"), exist_ok=True)
+
+    def get_path(self, key: str, pinned: bool = False) -> str:
+        """Gets the directory of an entry.
+
+        Args:
+            key (str): Key of the entry.
+            pinned (bool, optional): Whether the entry is excluded from eviction. Defaults to False.
+
+        Returns:
+            str: Directory of the entry.
+        """
+
+        return os.path.join(self.directory, "pinned" if pinned else "entries", key)
+
+    def get_arrays(self, key: str, pinned: bool = False) -> Optional[Dict[str, np.ndarray]]:
+        """Gets read-only memory-mapped arrays of an entry.
+
+        Args:
+            key (str): Key of the entry.
+            pinned (bool, optional): Whether the entry is excluded from eviction. Defaults to False.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: Arrays by name or None if the entry does not exist.
+        """
+
+        path = self.get_path(key, pinned)
+        try:
+            arrays = {name[:-4]: np.load(os.path.join(path, name), mmap_mode="r")
+                      for name in os.listdir(path) if name.endswith(".npy")}
+            # Mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            # Missing or evicted by another worker
+            return None
+
+        return arrays
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Gets the bytes of an entry, e.g. a serialized figure.
+
+        Args:
+            key (str): Key of the entry.
+
+        Returns:
+            Optional[bytes]: Bytes or None if the entry does not exist.
+        """
+
+        path = self.get_path(key)
+        try:
+            with open(os.path.join(path, "data.bin"), "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return data
+
+    def put(self, key: str, arrays: Optional[Dict[str, np.ndarray]] = None, data: Optional[bytes] = None, pinned: bool = False):
+        """Writes an entry of arrays and/or bytes. An existing entry is kept, as entries of the same key are equal.
+
+        Args:
+            key (str): Key of the entry.
+            arrays (Optional[Dict[str, np.ndarray]], optional): Arrays by name. Defaults to None.
+            data (Optional[bytes], optional): Bytes. Defaults to None.
+            pinned (bool, optional): Excludes the entry from eviction. Defaults to False.
+        """
+
+        path = self.get_path(key, pinned)
+        if os.path.exists(path):
+            return
+
+        # Write to a temporary directory next to the entry
+        temporary = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(path))
+        for name, array in (arrays or {}).items():
+            np.save(os.path.join(temporary, f"{name}.npy"), np.ascontiguousarray(array))
+        if data is not None:
+            with open(os.path.join(temporary, "data.bin"), "wb") as file:
+                file.write(data)
+
+        # Publish the entry at once, another worker may have published it in the meantime
+        try:
+            os.rename(temporary, path)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+            return
+
+        # Evict once enough was written since the last scan
+        if not pinned:
+            self.written += sum(array.nbytes for array in (arrays or {}).values()) + len(data or b"")
+            if self.written >= self.scan_bytes:
+                self.evict()
+
+    def remove(self, path: str):
+        """Removes an entry at once. Readers which listed its files before fail to load them and treat the entry as missing,
+           instead of reading the part of its files which was not deleted yet.
+
+        Args:
+            path (str): Directory of the entry.
+        """
+
+        trash = os.path.join(os.path.dirname(path), f".trash-{uuid.uuid4().hex}")
+        try:
+            os.rename(path, trash)
+        except OSError:
+            # Removed by another worker
+            return
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def clear(self):
+        """Removes all entries including pinned entries, e.g. those of a previous deploy,
+           as /dev/shm outlives the processes of the app.
+        """
+
+        for folder in ["entries", "pinned"]:
+            with os.scandir(os.path.join(self.directory, folder)) as iterator:
+                paths = [entry.path for entry in iterator]
+            for path in paths:
+                if os.path.basename(path).startswith("."):
+                    # Leftovers of interrupted writes and removals
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    self.remove(path)
+
+    def evict(self):
+        """Removes the least recently used unpinned entries until the store fits its size.
+           Workers which mapped an evicted entry keep their pages until they release the arrays.
+        """
+
+        self.written = 0
+
+        # Get size and last use of the entries
+        entries = []
+        with os.scandir(os.path.join(self.directory, "entries")) as iterator:
+            for entry in iterator:
+                # Skip entries which are written or removed
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    size = sum(file.stat().st_size for file in os.scandir(entry.path))
+                    entries.append((entry.stat().st_mtime, size, entry.path))
+                except FileNotFoundError:
+                    continue
+
+        # Remove the oldest entries
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
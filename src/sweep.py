@@ -0,0 +1,235 @@
+"""
+Sweeps the parameter space of a model, run it from the repository root with
+
+    python -m src.sweep --model csym --method sobol --num-designs 256 --output sweep.npz
+
+The ranges of the config are sampled by a Latin hypercube or a Sobol sequence,
+which cover them much more evenly than independent uniform draws. Designs are
+evaluated in parallel and their metrics are written column wise to a .npz file,
+one array per parameter or metric, e.g.
+
+    columns = np.load("sweep.npz")
+    columns["edginess"][columns["validated"] & ~columns["valid"]]
+
+A summary of the validity and design time by quartile of every parameter is printed,
+which shows the ranges to tighten. Designs of models which are not validated are counted
+as not validated rather than invalid, designs which fail are counted as failed and invalid.
+"""
+
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+from src.common import read_config
+from src.engine import evaluate_design, create_mesh, get_plan
+from src.validation import find_self_intersections
+from src.mesh import is_watertight
+from src.analytics import analyze_mesh
+
+# Samplers of the unit hypercube
+METHODS = ["lhs", "sobol", "uniform"]
+
+
+def sample_unit(dimensions: int, num_designs: int, method: str = "lhs", seed: Optional[int] = None) -> np.ndarray:
+    """Samples points of the unit hypercube.
+
+    Args:
+        dimensions (int): Number of dimensions.
+        num_designs (int): Number of points, Sobol sequences are balanced for powers of two.
+        method (str, optional): Latin hypercube (lhs), Sobol sequence (sobol) or independent draws (uniform). Defaults to "lhs".
+        seed (Optional[int], optional): Seed of the sampler. Defaults to None.
+
+    Returns:
+        np.ndarray: Points with shape (num_designs, dimensions).
+    """
+
+    # Imported on first use, like the other scipy modules of the engine
+    from scipy.stats import qmc
+
+    if method == "lhs":
+        return qmc.LatinHypercube(dimensions, seed=seed).random(num_designs)
+    if method == "sobol":
+        return qmc.Sobol(dimensions, seed=seed).random(num_designs)
+    if method == "uniform":
+        return np.random.default_rng(seed).uniform(size=(num_designs, dimensions))
+
+    raise ValueError(f"Unknown sampling method {method}, expected one of {METHODS}")
+
+
+def evaluate_sample(config: dict, model: str, parameters: dict) -> Dict[str, float]:
+    """Evaluates a sampled design, see measure_sample. A design which fails is recorded as failed and invalid
+       with missing metrics, so a single design does not abort the sweep.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str): Specifies the model string (csym or rsym).
+        parameters (dict): Parameters of the design including the seed of the random stages.
+
+    Returns:
+        Dict[str, float]: Metrics of the design, missing metrics of a failed design are added as nan by run_sweep.
+    """
+
+    try:
+        return {"failed": False, **measure_sample(config, model, parameters)}
+    except Exception as error:
+        print(f"Design with seed {parameters['seed']} failed: {error!r}")
+        return {"failed": True, "validated": bool(config["models"][model]["validate"]), "valid": False,
+                "watertight": False, "closed": False}
+
+
+def measure_sample(config: dict, model: str, parameters: dict) -> Dict[str, float]:
+    """Designs, meshes, validates and analyzes a sampled design and measures the time of every step.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str): Specifies the model string (csym or rsym).
+        parameters (dict): Parameters of the design including the seed of the random stages.
+
+    Returns:
+        Dict[str, float]: Metrics of the design.
+    """
+
+    metrics = {}
+
+    start = time.perf_counter()
+    geometry, _ = evaluate_design(parameters, model)
+    metrics["design_time"] = time.perf_counter() - start
+
+    # Mesh as rendered
+    start = time.perf_counter()
+    mesh = create_mesh(geometry, config, model, "render")
+    metrics["mesh_time"] = time.perf_counter() - start
+    metrics["num_triangles"] = len(mesh[3].triangles)
+
+    # Validate the exported mesh like validate_design, but count all intersections.
+    # Designs of models which are not validated are neither valid nor invalid.
+    start = time.perf_counter()
+    export = create_mesh(geometry, config, model, "export")
+    metrics["watertight"] = is_watertight(export[3].triangles)
+    metrics["validated"] = bool(config["models"][model]["validate"])
+    intersections = find_self_intersections(*export) if metrics["validated"] else None
+    metrics["validate_time"] = time.perf_counter() - start
+    metrics["num_intersections"] = np.nan if intersections is None else len(intersections)
+    metrics["valid"] = metrics["validated"] and metrics["watertight"] and len(intersections) == 0
+
+    # Print metrics of the exported mesh like analyze_design, missing volumes of open meshes become nan
+    start = time.perf_counter()
+    closed = metrics["valid"] if metrics["validated"] else metrics["watertight"]
+    analytics = analyze_mesh(*export, config, closed=closed)
+    metrics["analytics_time"] = time.perf_counter() - start
+    metrics.update({key: np.nan if value is None else value for key, value in analytics.items()})
+
+    return metrics
+
+
+def run_sweep(config: dict, model: str = "csym", num_designs: int = 256, method: str = "lhs", seed: Optional[int] = None, max_workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Samples designs of a model and evaluates them in parallel.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        num_designs (int, optional): Number of designs. Defaults to 256.
+        method (str, optional): Sampling method, see sample_unit. Defaults to "lhs".
+        seed (Optional[int], optional): Seed of the sampler and the random stages. Defaults to None.
+        max_workers (Optional[int], optional): Number of processes, one per core if not given. Defaults to None.
+
+    Returns:
+        Dict[str, np.ndarray]: One column per parameter and metric with a row per design.
+    """
+
+    # Map stratified points to parameters, every design gets its own seed for the random stages
+    plan = get_plan(config, model)
+    unit = sample_unit(plan.dimensions, num_designs, method, seed)
+    seeds = np.random.default_rng(seed).integers(2 ** 31, size=num_designs)
+    samples = [plan.scale(point, stage_seed) for point, stage_seed in zip(unit, seeds)]
+
+    # Evaluate in parallel, chunks keep the overhead of small designs low
+    start = time.perf_counter()
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, num_designs // (4 * max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(evaluate_sample, [config] * num_designs, [model] * num_designs, samples, chunksize=chunksize))
+    print(f"Evaluated {num_designs} {model} designs in {time.perf_counter() - start:.1f}s")
+
+    # Transpose rows to columns, failed designs miss most metrics
+    columns = {key: np.array([sample[key] for sample in samples]) for key in plan.names + plan.texture_types + ["seed"]}
+    keys = list(dict.fromkeys(key for result in results for key in result))
+    columns.update({key: np.array([result.get(key, np.nan) for result in results]) for key in keys})
+
+    return columns
+
+
+def summarize_sweep(columns: Dict[str, np.ndarray], names: List[str]) -> List[str]:
+    """Summarizes the validity rate and median design time by quartile of every parameter.
+       The validity rate only counts validated designs, it is n/a if none is validated.
+       Failed designs are counted as invalid.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Columns of a sweep, see run_sweep.
+        names (List[str]): Names of the parameters.
+
+    Returns:
+        List[str]: Lines of the summary.
+    """
+
+    def get_rate(selected: np.ndarray) -> str:
+        validated = selected & columns["validated"]
+        return f"{columns['valid'][validated].mean():.0%}" if validated.any() else "n/a"
+
+    # Failed designs count as invalid and have no time
+    times = columns["design_time"] + columns["mesh_time"] + columns["validate_time"]
+    def get_time(selected: np.ndarray) -> str:
+        finished = selected & np.isfinite(times)
+        return f"{np.median(times[finished]) * 1000:.0f}" if finished.any() else "-"
+
+    everything = np.ones(len(columns["valid"]), dtype=bool)
+    lines = [f"valid {get_rate(everything)}, not validated {(~columns['validated']).mean():.0%}, failed {columns['failed'].sum()}, "
+             f"median time {get_time(everything)} ms",
+             f"{'parameter':<18}" + "".join(f"{f'Q{quartile + 1} valid/ms':>16}" for quartile in range(4))]
+
+    for name in names:
+        # Split the designs at the quartiles of the parameter
+        quartile = np.searchsorted(np.quantile(columns[name], [0.25, 0.5, 0.75]), columns[name], side="right")
+        cells = []
+        for index in range(4):
+            selected = quartile == index
+            if selected.any():
+                cells.append(f"{get_rate(selected)}/{get_time(selected)}")
+            else:
+                cells.append("-")
+        lines.append(f"{name:<18}" + "".join(f"{cell:>16}" for cell in cells))
+
+    return lines
+
+
+def main():
+    """Runs a sweep from the command line and writes its columns."""
+
+    parser = argparse.ArgumentParser(description='Sweep the parameter space of a model')
+    parser.add_argument('-c', '--config', type=str, default="config.yml", help='Path to configuration yaml-file.')
+    parser.add_argument('-m', '--model', type=str, default="csym", help='Model to sweep (csym or rsym).')
+    parser.add_argument('-n', '--num-designs', type=int, default=256, help='Number of designs.')
+    parser.add_argument('--method', type=str, default="lhs", choices=METHODS, help='Sampling method.')
+    parser.add_argument('--seed', type=int, default=None, help='Seed of the sweep.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes, one per core by default.')
+    parser.add_argument('-o', '--output', type=str, default="sweep.npz", help='Path of the columnar output file.')
+    arguments = parser.parse_args()
+
+    config = read_config(arguments.config)
+    columns = run_sweep(config, arguments.model, arguments.num_designs, arguments.method, arguments.seed, arguments.workers)
+
+    # Keep the settings of the sweep with its columns
+    settings = {"model": arguments.model, "method": arguments.method, "seed": arguments.seed, "config": config}
+    np.savez_compressed(arguments.output, settings=np.array(json.dumps(settings)), **columns)
+    print(f"Wrote {len(columns)} columns to {arguments.output}")
+
+    plan = get_plan(config, arguments.model)
+    print("\n".join(summarize_sweep(columns, plan.names + plan.texture_types)))
+
+
+if __name__ == "__main__":
+    main()
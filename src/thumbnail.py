@@ -0,0 +1,265 @@
+from typing import List, Optional, Tuple
+import io
+import os
+import tempfile
+import numpy as np
+import matplotlib.tri as mtri
+
+from src.engine import resample_design, create_mesh
+from src.store import get_key
+
+
+def get_view(eye: Tuple[float, float, float] = (1.25, 1.25, 1.25)) -> np.ndarray:
+    """Gets the orthonormal view basis of a camera looking at the origin with the z-axis up,
+       the default eye is the default camera of plotly.
+
+    Args:
+        eye (Tuple[float, float, float], optional): Position of the camera. Defaults to (1.25, 1.25, 1.25).
+
+    Returns:
+        np.ndarray: Right, up and towards-camera unit vectors as rows.
+    """
+
+    towards = np.asarray(eye, dtype=np.float64)
+    towards /= np.linalg.norm(towards)
+    right = np.cross([0., 0., 1.], towards)
+    right /= np.linalg.norm(right)
+    up = np.cross(towards, right)
+
+    return np.stack([right, up, towards])
+
+
+def shade(normals: np.ndarray, view: np.ndarray, config: dict) -> np.ndarray:
+    """Shades flat triangles with the lighting of the figure config by means of Blinn-Phong.
+
+    Args:
+        normals (np.ndarray): Unit normals of the triangles in view coordinates facing the camera.
+        view (np.ndarray): View basis, see get_view.
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        np.ndarray: RGB colors of the triangles between 0 and 1.
+    """
+
+    figure = config["app"]["figure"]
+    lighting = figure["lighting"]
+    color = np.array([int(figure["color"][n:n + 2], 16) for n in (1, 3, 5)]) / 255
+
+    # Light direction in view coordinates
+    position = figure["lightposition"]
+    light = view @ np.array([position["x"], position["y"], position["z"]], dtype=np.float64)
+    light /= np.linalg.norm(light)
+    camera = np.array([0., 0., 1.])
+    halfway = (light + camera) / np.linalg.norm(light + camera)
+
+    # Blinn-Phong terms, the roughness is turned into a shininess exponent
+    diffuse = np.maximum(normals @ light, 0)
+    shininess = 2 / max(lighting["roughness"], 1e-3) ** 2
+    specular = np.maximum(normals @ halfway, 0) ** shininess
+    fresnel = (1 - np.abs(normals @ camera)) ** 5
+
+    rgb = color * (lighting["ambient"] + lighting["diffuse"] * diffuse)[:, None]
+    rgb += (lighting["specular"] * specular + lighting["fresnel"] * fresnel)[:, None]
+
+    return np.clip(rgb, 0, 1)
+
+
+def sample_triangles(corners: np.ndarray, spacing: float = 0.7) -> Tuple[np.ndarray, np.ndarray]:
+    """Samples points on triangles which are dense enough to cover every pixel. Every triangle is spanned
+       by the two edges at the vertex opposite its longest edge, a lattice of the parallelogram of these
+       edges is enumerated and the points within the triangle are kept. Hence the number of points
+       is proportional to the area of a triangle, even for long and thin triangles of decimated meshes.
+
+    Args:
+        corners (np.ndarray): Corners of the triangles in pixels of shape (triangles, 3, 3).
+        spacing (float, optional): Largest step between points along the edges in pixels. Defaults to 0.7.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Points of shape (points, 3) and the index of their triangle.
+    """
+
+    # Start at the vertex opposite the longest edge
+    lengths = np.linalg.norm(np.roll(corners[:, :, :2], -1, axis=1) - np.roll(corners[:, :, :2], 1, axis=1), axis=-1)
+    start = np.argmax(lengths, axis=-1)
+    index = np.arange(len(corners))
+    origin = corners[index, start]
+    first = corners[index, (start + 1) % 3] - origin
+    second = corners[index, (start + 2) % 3] - origin
+
+    # Number of steps along both edges
+    steps_first = np.maximum(np.ceil(np.linalg.norm(first[:, :2], axis=-1) / spacing).astype(int), 1)
+    steps_second = np.maximum(np.ceil(np.linalg.norm(second[:, :2], axis=-1) / spacing).astype(int), 1)
+
+    # Enumerate the lattice points of all triangles at once
+    counts = (steps_first + 1) * (steps_second + 1)
+    triangle = np.repeat(index, counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    u = (local // (steps_second[triangle] + 1)) / steps_first[triangle]
+    v = (local % (steps_second[triangle] + 1)) / steps_second[triangle]
+
+    # Drop points of the parallelogram beyond the triangle, their reflections are lattice points within it
+    inside = u + v <= 1 + 1e-9
+    u, v, triangle = u[inside], v[inside], triangle[inside]
+
+    points = origin[triangle] + u[:, None] * first[triangle] + v[:, None] * second[triangle]
+
+    return points, triangle
+
+
+def render_thumbnail(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, config: dict, size: int = 128, supersampling: int = 2) -> np.ndarray:
+    """Renders a shaded image of a mesh without a browser. Triangles are splatted as points
+       which are dense enough to cover every pixel, the nearest point of every pixel is kept.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the mesh.
+        y (np.ndarray): y-coordinates of the points of the mesh.
+        z (np.ndarray): z-coordinates of the points of the mesh.
+        triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
+        config (dict): Config of the paramter space read from the yaml file.
+        size (int, optional): Width and height of the image in pixels. Defaults to 128.
+        supersampling (int, optional): Samples per pixel along each axis against aliasing. Defaults to 2.
+
+    Returns:
+        np.ndarray: RGBA image of shape (size, size, 4) and type uint8, the background is transparent.
+    """
+
+    # Transform points to view coordinates
+    view = get_view()
+    points = np.stack([x, y, z], axis=-1).astype(np.float64)
+    points = (points - (points.max(axis=0) + points.min(axis=0)) / 2) @ view.T
+
+    # Scale the projection to the supersampled image with a margin
+    resolution = size * supersampling
+    extent = np.abs(points[:, :2]).max()
+    points[:, :2] = (points[:, :2] / extent * 0.45 + 0.5) * resolution
+    points[:, 1] = resolution - points[:, 1]
+
+    # Shade triangles with normals facing the camera
+    corners = points[triangles.triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals[:, 1] *= -1
+    normals /= np.maximum(np.linalg.norm(normals, axis=-1, keepdims=True), 1e-12)
+    normals *= np.where(normals[:, 2:] < 0, -1, 1)
+    colors = shade(normals, view, config)
+
+    # Splat the triangles
+    samples, indices = sample_triangles(corners)
+    column = np.clip(samples[:, 0].astype(int), 0, resolution - 1)
+    row = np.clip(samples[:, 1].astype(int), 0, resolution - 1)
+    pixels, depths = row * resolution + column, samples[:, 2]
+
+    # Keep the point nearest to the camera for every pixel, the first of a pixel after sorting by depth
+    order = np.argsort(-depths)
+    pixels, first = np.unique(pixels[order], return_index=True)
+    image = np.zeros((resolution * resolution, 4))
+    image[pixels, :3] = colors[indices[order][first]]
+    image[pixels, 3] = 1
+
+    # Average the supersamples
+    image = image.reshape(size, supersampling, size, supersampling, 4).mean(axis=(1, 3))
+    image[..., :3] /= np.maximum(image[..., 3:], 1e-12)
+
+    return np.round(image * 255).astype(np.uint8)
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encodes an image as PNG.
+
+    Args:
+        image (np.ndarray): RGBA image of type uint8.
+
+    Returns:
+        bytes: PNG file content.
+    """
+
+    # Imported on first use, which keeps the startup of the app fast
+    import matplotlib.image
+
+    buffer = io.BytesIO()
+    matplotlib.image.imsave(buffer, image, format="png")
+
+    return buffer.getvalue()
+
+
+def get_gallery(config: dict) -> List[Tuple[str, int]]:
+    """Gets the seeded designs of the gallery, the models alternate. Only these thumbnails are rendered and cached.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        List[Tuple[str, int]]: Model and seed of every thumbnail.
+    """
+
+    models = list(config["models"])
+
+    return [(models[seed % len(models)], seed) for seed in range(config["app"]["gallery"]["num_thumbnails"])]
+
+
+def get_thumbnail_path(config: dict, model: str = "csym", seed: int = 0) -> str:
+    """Gets the cache path of the thumbnail of a seeded design, which is a digest
+       of everything the thumbnail depends on, hence changed settings never return stale thumbnails.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the design, see resample_design. Defaults to 0.
+
+    Returns:
+        str: Path of the PNG file.
+    """
+
+    gallery = config["app"]["gallery"]
+    key = get_key("thumbnail", model, seed, config["models"][model], config["engine"], config["app"]["figure"], gallery["size"])
+
+    return os.path.join(gallery["directory"], f"{key}.png")
+
+
+def read_thumbnail(config: dict, model: str = "csym", seed: int = 0) -> Optional[bytes]:
+    """Reads the cached thumbnail of a seeded design.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the design, see resample_design. Defaults to 0.
+
+    Returns:
+        Optional[bytes]: PNG file content or None if it is not cached.
+    """
+
+    try:
+        with open(get_thumbnail_path(config, model, seed), "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def create_thumbnail(config: dict, model: str = "csym", seed: int = 0) -> bytes:
+    """Creates the PNG thumbnail of a seeded design and caches it on disk.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+        model (str, optional): Specifies the model string (csym or rsym). Defaults to "csym".
+        seed (int, optional): Seed of the design, see resample_design. Defaults to 0.
+
+    Returns:
+        bytes: PNG file content.
+    """
+
+    data = read_thumbnail(config, model, seed)
+    if data is not None:
+        return data
+
+    # Render the design of the seed
+    _, geometry, _ = resample_design(config, model, seed)
+    data = encode_png(render_thumbnail(*create_mesh(geometry, config, model, "thumbnail"), config, config["app"]["gallery"]["size"]))
+
+    # Write atomically, as other workers may read the cache
+    path = get_thumbnail_path(config, model, seed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+    return data
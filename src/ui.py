@@ -5,46 +5,40 @@ The app is created using the Dash framework and uses Plotly for visualization.
 The app consists of an initial loading screen with a loader animation and a jumbotron with a "GO!" button to generate a new design.
 The app also includes a checkbox to export the design as an STL file.
 The app is created using the create_app() function, which initializes the figure and creates the layout of the app.
-The update_figure() function updates the figure according to new geometry data.
-The hide_axis() function hides axis information in the 3D-mesh plot.
+The figure of a design is created and encoded for the browser by src.figure.
+The create_analytics() function shows the print metrics of the current design next to the download button.
+The create_previews() function creates the clickable previews of designs generated in parallel, see src.multiples.
+The create_gallery() function creates the thumbnails of seeded designs, a click on a thumbnail generates its design.
 The init_figure() function initializes the figure for the initial loading screen.
-The get_ijk() function returns the indices of the triangles in the triangulation.
 The design() function generates a new 3D design using the Leonardo engine. 
 The export_stl() function exports the design as an STL file. 
 """
 
-from typing import Tuple, List
+from typing import Optional, Tuple, List
 import numpy as np
 import matplotlib.tri as mtri
 import base64
 import datetime
+import json
+import os
+import tempfile
+import time
 
 from plotly import graph_objs as go
+import flask
 import dash
 from dash import dcc, html
-from dash.dependencies import Input, Output, State
+from dash.dependencies import Input, Output, State, ALL, ClientsideFunction
 import dash_bootstrap_components as dbc
 
-from src.engine import get_ijk, design, export_stl
-
-
-def hide_axis() -> dict:
-    """Hides axis information in plotly 3D-mesh plot.
-
-    Returns:
-        dict: Axis configuration.
-    """
-    # Switch off all axis information
-    axis_config = dict(
-        showbackground=False,
-        title='',
-        showticklabels=False,
-        showgrid=False,
-        zeroline=False,
-        showspikes=False
-    )
-
-    return axis_config
+from src.figure import hide_axis, update_figure, encode_geometry
+from src.engine import resample_design, validate_design, is_finite_design, mesh_design, export_stl, warm_up, open_store, generate_seed
+from src.admission import AdmissionController, check_threads, get_client
+from src.routes import create_routes, get_design_url
+from src.multiples import open_pool, generate_previews
+from src.thumbnail import get_gallery
+from src.analytics import analyze_design
+from src.capture import RequestLog, open_request_log, trace, timed
 
 
 def init_figure(config: dict) -> dcc.Loading:
@@ -99,65 +93,56 @@ def init_figure(config: dict) -> dcc.Loading:
     return figure
 
 
-def update_figure(geometry: Tuple[np.ndarray, np.ndarray, np.ndarray, mtri.triangulation.Triangulation], config: dict) -> dict:
-    """Updates the figure according to new geometry data.
+def create_sliders(model: str, parameters: dict, config: dict) -> List[html.Div]:
+    """Creates sliders to adjust single parameters of the current design within their configured range.
 
     Args:
-        geometry (Tuple[np.array, np.array, np.array, mtri.triangulation.Triangulation]):
-        x,y,z- coordinates of the design as well as the corresponding trianglations.
+        model (str): Specifies the model string (csym or rsym).
+        parameters (dict): Parameters of the current design.
         config (dict): Config of the paramter space read from the yaml file.
 
     Returns:
-        dict: Figure dictionary
+        List[html.Div]: Labeled sliders of the parameters listed in the app config.
     """
 
-    # Unpack geometry
-    x, y, z, triangles = geometry
-    i, j, k = get_ijk(triangles)
+    sliders = []
+    for name in config["app"]["sliders"][model]:
+        # Use the sampling range of the parameter as slider range
+        low, high = config["models"][model]["parameters"][name]
+        sliders.append(html.Div([
+            html.Small(name.replace("_", " ").capitalize(), className="text-muted"),
+            dcc.Slider(
+                id={"type": "slider", "parameter": name},
+                min=low,
+                max=high,
+                step=(high - low) / config["app"]["slider_steps"],
+                value=parameters[name],
+                marks=None,
+                updatemode="mouseup",
+            ),
+        ]))
 
-    color = config["app"]["figure"]["color"]
-    colorscale = [[0, color], [1, color]]
-
-    # Update mesh
-    update_data = go.Mesh3d(
-        x=x,
-        y=y,
-        z=z,
-        i=i,
-        j=j,
-        k=k,
-        intensity=z,
-        hoverinfo='none',
-        flatshading=True,
-        colorscale=colorscale,
-        showscale=False,
-        lighting=config["app"]["figure"]["lighting"],
-        lightposition=config["app"]["figure"]["lightposition"],
-    ) # type: ignore
+    return sliders
 
-    # Update layout
-    update_layout = go.Layout(
-        height=config["app"]["figure"]["height"],
-        margin=config["app"]["figure"]["margin"],
-        scene=dict(xaxis=hide_axis(),
-                   yaxis=hide_axis(),
-                   zaxis=hide_axis()),
-        scene_aspectmode='data'
-    ) # type: ignore
 
-    # Update configuration
-    update_config = {
-        'displayModeBar': False,
-        'auto_open': False
-    }
+def merge_parameters(design: dict, values: List[float], ids: List[dict]) -> dict:
+    """Merges the slider values into the parameters of the current design.
 
-    # Combine information
-    update = {
-        'data': [update_data],
-        'layout': update_layout,
-        'config': update_config}
+    Args:
+        design (dict): Model and parameters of the current design.
+        values (List[float]): Values of the sliders.
+        ids (List[dict]): Pattern matching ids of the sliders.
+
+    Returns:
+        dict: Parameters of the adjusted design.
+    """
 
-    return update
+    parameters = dict(design["parameters"])
+    for value, slider in zip(values, ids):
+        if value is not None:
+            parameters[slider["parameter"]] = value
+
+    return parameters
 
 
 def create_app(config: dict) -> dash.Dash:
@@ -171,20 +156,25 @@ def create_app(config: dict) -> dash.Dash:
    Returns:
         dash.App: The dash app.
     """
+    # Create app
+    app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+    app.title = 'Leonardo Engine'
+
+    # Let browsers cache the assets like the card image
+    app.server.config["SEND_FILE_MAX_AGE_DEFAULT"] = config["app"]["assets_max_age"]
+
     # Initialize figure
     figure = init_figure(config)
 
     
     # the style arguments for the sidebar. We use position:fixed and a fixed width
 
-    card_png = './imgs/sample02.jpg'
-    card_base64 = base64.b64encode(open(card_png, 'rb').read()).decode('ascii')
 
     card = dbc.Card(
         [
             dbc.CardBody(
                 [
-                    dbc.CardImg(src=f'data:image/png;base64,{card_base64}', top=True),
+                    dbc.CardImg(src=app.get_asset_url('card.jpg'), top=True),
                     html.H4("Generative Design Engine Leonardo", className="card-title"),
                     html.P(
                         "Create unique 3D designs.",
@@ -193,8 +183,15 @@ def create_app(config: dict) -> dash.Dash:
                 html.Div([
                     dbc.Button('Design', id='generate', n_clicks=0, outline=True, color="dark"),
                     dbc.Button('Download file', id='download-button',n_clicks=0, outline=True, color="primary"),
+                    dbc.Button(f'Design {config["app"]["multiples"]["num_designs"]} at once', id='multiples-button', n_clicks=0, outline=True, color="dark"),
+                    dbc.Button('Gallery', id='gallery-button', n_clicks=0, outline=True, color="secondary"),
                 ],className="d-grid gap-2",
                 ),
+                html.Div(id='analytics', className="mt-2"),
+                html.Div(id='generate-status', className="mt-2"),
+                html.Div(id='download-status', className="mt-2"),
+                dcc.Loading(html.Div(id='multiples', className="d-flex flex-wrap gap-2 mt-2"), type="circle"),
+                html.Div(id='sliders', className="mt-3"),
                 ]
             ),
         ],
@@ -233,6 +230,19 @@ def create_app(config: dict) -> dash.Dash:
         [
             card,
             dcc.Download(id='download'),
+            dcc.Store(id='design'),
+            dcc.Store(id='geometry'),
+            dcc.Store(id='digests'),
+            dcc.Store(id='resend'),
+            dbc.Modal(
+                [
+                    dbc.ModalHeader("Gallery"),
+                    dbc.ModalBody(html.Div(id='gallery-tiles', className="d-flex flex-wrap gap-2")),
+                ],
+                id='gallery',
+                size="xl",
+                is_open=False,
+            ),
             author
     
         ],
@@ -241,9 +251,6 @@ def create_app(config: dict) -> dash.Dash:
 
 
 
-    # Create app
-    app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-    app.title = 'Leonardo Engine'
     app.layout = html.Div(children=[
                                 dbc.Container(children=[
                                                 dbc.Row([
@@ -259,42 +266,329 @@ def create_app(config: dict) -> dash.Dash:
 
 
 
-def create_callbacks(app: dash.Dash, config: dict) -> List[dict]: # type: ignore
+def create_previews(previews: List[Tuple[str, int, bytes]], config: dict) -> List[html.Img]:
+    """Creates the clickable previews of designs, a click generates the design at full resolution.
+
+    Args:
+        previews (List[Tuple[str, int, bytes]]): Model, seed and PNG file content of every preview, see generate_previews.
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        List[html.Img]: Previews with the ids of the thumbnails of the gallery.
+    """
+
+    size = config["app"]["multiples"]["size"]
+
+    return [
+        html.Img(
+            src="data:image/png;base64," + base64.b64encode(data).decode(),
+            id={"type": "thumbnail", "model": model, "seed": seed},
+            n_clicks=0,
+            width=size,
+            height=size,
+            style={"cursor": "pointer"},
+        )
+        for model, seed, data in previews
+    ]
+
+
+def create_gallery(config: dict) -> List[html.Div]:
+    """Creates the thumbnails of the gallery. The images are requested by the browser once they scroll into view
+       and rendered by the server on first request, see create_routes. html.Img has no loading attribute,
+       hence the images are plain HTML in clickable tiles.
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        List[html.Div]: Clickable thumbnails of seeded designs, see get_gallery.
+    """
+
+    size = config["app"]["gallery"]["size"]
+
+    thumbnails = []
+    for model, seed in get_gallery(config):
+        image = f'<img class="thumbnail" src="/thumbnails/{model}/{seed}.png" loading="lazy" width="{size}" height="{size}" alt="{model} {seed}">'
+        thumbnails.append(html.Div(
+            dcc.Markdown(image, dangerously_allow_html=True),
+            id={"type": "thumbnail", "model": model, "seed": seed},
+            n_clicks=0,
+            style={"cursor": "pointer", "width": size, "height": size},
+        ))
+
+    return thumbnails
+
+
+def create_analytics(metrics: dict, valid: Optional[bool] = None) -> dbc.Table:
+    """Creates the table of the print metrics of a design.
+
+    Args:
+        metrics (dict): Print metrics, see analyze_mesh.
+        valid (Optional[bool], optional): Validation of the exported mesh, see validate_design. Defaults to None.
+
+    Returns:
+        dbc.Table: Table of the metrics.
+    """
+
+    # Self-intersecting models enclose no well-defined volume
+    volume = "n/a" if metrics["volume"] is None else f"{metrics['volume'] / 1000:.1f} cm³"
+    if metrics["thinnest"] is None:
+        walls = "No thin walls"
+    else:
+        walls = f"{metrics['thin_fraction']:.0%} of the surface, down to {metrics['thinnest']:.2f} mm"
+
+    rows = [
+        ("Size", f"{metrics['size_x']:.1f} × {metrics['size_y']:.1f} × {metrics['size_z']:.1f} mm"),
+        ("Volume", volume),
+        ("Surface", f"{metrics['area'] / 100:.1f} cm²"),
+        ("Material", f"{metrics['material']:.1f} g ({metrics['filament']:.1f} m filament)"),
+        ("Thin walls", walls),
+    ]
+    if valid is not None:
+        rows.append(("Printable", "Yes" if valid else "No, the surface is open or intersects itself"))
+
+    return dbc.Table(html.Tbody([html.Tr([html.Th(name), html.Td(value)]) for name, value in rows]),
+                     size="sm", borderless=True, className="small mb-0")
+
+
+def create_links(model: str, seed: int, config: dict) -> html.Small:
+    """Creates the links of a generated design, which can be shared and cached by browsers and proxies.
+
+    Args:
+        model (str): Specifies the model string (csym or rsym).
+        seed (int): Seed of the design, see resample_design.
+        config (dict): Config of the paramter space read from the yaml file.
+
+    Returns:
+        html.Small: Links of the design in every format.
+    """
+
+    links = ["Links of the design: "]
+    for format, label in [("json", "Figure"), ("stl", "STL"), ("obj", "OBJ")]:
+        if len(links) > 1:
+            links.append(" · ")
+        links.append(html.A(label, href=get_design_url(config, model, seed, format), target="_blank"))
+
+    return html.Small(links, className="text-muted")
+
+
+def create_unprintable_alert() -> dbc.Alert:
+    """Creates the alert shown if the exported mesh of a design failed the validation.
+
+    Returns:
+        dbc.Alert: Alert.
+    """
+
+    return dbc.Alert("This design is not printable, its surface is open or intersects itself.", color="warning", dismissable=True)
+
+
+def create_overflow_alert() -> dbc.Alert:
+    """Creates the alert shown if the points of an adjusted design are not finite.
+
+    Returns:
+        dbc.Alert: Alert.
+    """
+
+    return dbc.Alert("These settings overflow the design, it cannot be shown or printed.", color="warning", dismissable=True)
+
+
+def create_busy_alert(status: str) -> dbc.Alert:
+    """Creates the alert shown if an engine call is not admitted.
+
+    Args:
+        status (str): Status of the admission, see AdmissionController.acquire.
+
+    Returns:
+        dbc.Alert: Alert.
+    """
+
+    if status == "rate_limited":
+        message = "Slow down a little, please try again in a moment."
+    else:
+        message = "The engine is busy, please try again in a moment."
+
+    return dbc.Alert(message, color="warning", duration=4000, dismissable=True)
+
+
+def create_callbacks(app: dash.Dash, config: dict, admission: Optional[AdmissionController] = None, request_log: Optional[RequestLog] = None) -> List[dict]: # type: ignore
     """Create the app callbacks the app.
 
     Args:
         app (dash.Dash): Dash app.
         config (dict): Config of the paramter space read from the yaml file.
+        admission (Optional[AdmissionController], optional): Limits the engine calls,
+                                                             created from the config if not given. Defaults to None.
+        request_log (Optional[RequestLog], optional): Captures the design requests for replay, see src.replay. Defaults to None.
 
     Returns:
         List[dict]: Returns the updated figure with a random design.
     """
 
+    if admission is None:
+        admission = AdmissionController(**config["app"]["admission"])
+
+    # Previews run on the process pool, one batch at a time next to the interactive designs
+    preview_admission = AdmissionController(**config["app"]["multiples"]["admission"])
+
+    def capture(callback: str, status: str, start: float, record: dict, **fields):
+        # Write the request with its traced timings and stages to the log
+        if request_log is not None:
+            request_log.write({
+                "time": datetime.datetime.now().isoformat(),
+                "callback": callback,
+                "status": status,
+                "duration": time.perf_counter() - start,
+                **fields,
+                **record,
+            })
+
     # Button click callback for the design generation.
-    @app.callback([Output('graph', 'figure')],
-                  [Input('generate', 'n_clicks')])
-    def update(generate_button): # type: ignore
-        # Select random model
-        model = np.random.choice([
-            "csym",
-            "rsym",
-        ])
-
-        # Generate the geometry
-        geometry = design(config, model)
-        update_graph = update_figure(geometry, config)
-        x, y, z, triangles = geometry
-        
-        if generate_button is not None and generate_button > 0:
-            export_stl('export.stl', x, y, z, triangles)
-        return [update_graph]
-    
-    
-    @app.callback([Output('download', 'data')],
-                  [Input('download-button', 'n_clicks')])
-    def update(download_button):
-        if download_button is not None and download_button > 0:
-            return [dcc.send_file('export.stl')]
+    # A click on a thumbnail of the gallery or on a preview generates the design of its seed at full resolution.
+    @app.callback([Output('design', 'data'), Output('sliders', 'children'), Output('generate-status', 'children')],
+                  [Input('generate', 'n_clicks'), Input({"type": "thumbnail", "model": ALL, "seed": ALL}, 'n_clicks')])
+    def generate(generate_button, thumbnail_clicks): # type: ignore
+        triggered = dash.callback_context.triggered[0]
+        prop_id = triggered["prop_id"].rsplit(".", 1)[0]
+        if prop_id.startswith("{"):
+            # Thumbnails are created with n_clicks=0 when the gallery opens
+            if not triggered["value"]:
+                return [dash.no_update, dash.no_update, dash.no_update]
+            thumbnail = json.loads(prop_id)
+            model, seed = thumbnail["model"], thumbnail["seed"]
+        else:
+            # Select random model and seed, the seed makes the design addressable by its URLs
+            model = str(np.random.default_rng().choice([
+                "csym",
+                "rsym",
+            ]))
+            seed = generate_seed(config)
+
+        # Generate the geometry and resample unprintable designs
+        start = time.perf_counter()
+        with trace() as record, admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+            if status != "admitted":
+                print(f"Design rejected: {status}")
+                capture("generate", status, start, record, model=model, seed=seed)
+                return [dash.no_update, dash.no_update, create_busy_alert(status)]
+            parameters, _, valid = resample_design(config, model, seed)
+
+        # Store JSON serializable parameters to reproduce the design
+        parameters = {key: value.item() if isinstance(value, np.generic) else value for key, value in parameters.items()}
+        capture("generate", status, start, record, model=model, seed=seed, parameters=parameters, num_points=parameters["num_points"])
+
+        # Tell the user if all attempts were unprintable
+        links = create_links(model, seed, config)
+        status = [create_unprintable_alert(), links] if valid is False else links
+        return [{"model": model, "parameters": parameters}, create_sliders(model, parameters, config), status]
+
+    # Design several previews at once on the process pool, all of them are sent in one response
+    @app.callback([Output('multiples', 'children')],
+                  [Input('multiples-button', 'n_clicks')])
+    def multiples(multiples_button): # type: ignore
+        if not multiples_button:
+            return [dash.no_update]
+
+        # A batch of previews takes the whole process pool, further batches are rejected until it is done
+        with preview_admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+            if status != "admitted":
+                print(f"Previews rejected: {status}")
+                return [create_busy_alert(status)]
+            previews = generate_previews(config)
+
+        return [create_previews(previews, config)]
+
+    # Open the gallery with its thumbnails and close it once a thumbnail is clicked
+    @app.callback([Output('gallery', 'is_open'), Output('gallery-tiles', 'children')],
+                  [Input('gallery-button', 'n_clicks'), Input({"type": "thumbnail", "model": ALL, "seed": ALL}, 'n_clicks')])
+    def gallery(gallery_button, thumbnail_clicks): # type: ignore
+        triggered = dash.callback_context.triggered[0]
+        if triggered["prop_id"] == "gallery-button.n_clicks" and gallery_button:
+            return [True, create_gallery(config)]
+        if triggered["prop_id"].startswith("{") and triggered["value"]:
+            return [False, dash.no_update]
+        return [dash.no_update, dash.no_update]
+
+    # Slider callback, only the stages downstream of the changed parameter are recomputed
+    # and only changed arrays are sent to the browser.
+    # The print metrics of the design are updated with it.
+    @app.callback([Output('geometry', 'data'), Output('analytics', 'children')],
+                  [Input('design', 'data'), Input({"type": "slider", "parameter": ALL}, 'value'), Input('resend', 'data')],
+                  [State({"type": "slider", "parameter": ALL}, 'id'), State('digests', 'data')])
+    def update(design, values, resend, ids, digests): # type: ignore
+        if design is None:
+            return [dash.no_update, dash.no_update]
+
+        # The browser missed an array it was told it holds, send all arrays again
+        if dash.callback_context.triggered[0]["prop_id"] == "resend.data":
+            digests = None
+
+        # Reuse the decimation of the sampled design to keep the triangle indices while adjusting it,
+        # a rejected update keeps the current figure until the next slider move
+        start = time.perf_counter()
+        parameters = merge_parameters(design, values, ids)
+        with trace() as record:
+            with admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+                if status != "admitted":
+                    print(f"Update rejected: {status}")
+                    capture("update", status, start, record, model=design["model"], parameters=parameters, reference=design["parameters"])
+                    return [dash.no_update, dash.no_update]
+                # Extreme slider values can overflow the design, keep the current figure
+                if not is_finite_design(parameters, design["model"]):
+                    print("Update rejected: non-finite points")
+                    return [dash.no_update, create_overflow_alert()]
+                mesh = mesh_design(parameters, config, design["model"], "render", design["parameters"])
+                # Slider edits can make a design unprintable, the metrics describe the downloaded mesh
+                valid = validate_design(parameters, config, design["model"])
+                metrics = analyze_design(parameters, config, design["model"], valid)
+
+            with timed("encode"):
+                geometry = encode_geometry(mesh, config, digests)
+
+        if request_log is not None:
+            capture("update", status, start, record, model=design["model"], parameters=parameters, reference=design["parameters"],
+                    num_points=parameters["num_points"], digests=digests, payload_bytes=len(json.dumps(geometry)))
+        return [geometry, create_analytics(metrics, valid)]
+
+    # Decode the arrays in the browser and combine them with the arrays it holds
+    app.clientside_callback(
+        ClientsideFunction(namespace='leonardo', function_name='update_figure'),
+        [Output('graph', 'figure'), Output('digests', 'data'), Output('resend', 'data')],
+        [Input('geometry', 'data')]
+    )
+
+    @app.callback([Output('download', 'data'), Output('download-status', 'children')],
+                  [Input('download-button', 'n_clicks')],
+                  [State('design', 'data'), State({"type": "slider", "parameter": ALL}, 'value'),
+                   State({"type": "slider", "parameter": ALL}, 'id')])
+    def download(download_button, design, values, ids): # type: ignore
+        if download_button is None or download_button == 0 or design is None:
+            return [dash.no_update, dash.no_update]
+
+        # Reuse the memoized design and export its full resolution mesh
+        start = time.perf_counter()
+        parameters = merge_parameters(design, values, ids)
+        with trace() as record:
+            with admission.admit(get_client(config["app"]["trusted_proxies"])) as status:
+                if status != "admitted":
+                    print(f"Download rejected: {status}")
+                    capture("download", status, start, record, model=design["model"], parameters=parameters)
+                    return [dash.no_update, create_busy_alert(status)]
+                if not is_finite_design(parameters, design["model"]):
+                    print("Download rejected: non-finite points")
+                    return [dash.no_update, create_overflow_alert()]
+                valid = validate_design(parameters, config, design["model"])
+                x, y, z, triangles = mesh_design(parameters, config, design["model"], "export")
+
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'export.stl')
+                with timed("export"):
+                    export_stl(path, x, y, z, triangles)
+                    data = dcc.send_file(path)
+
+        capture("download", status, start, record, model=design["model"], parameters=parameters,
+                num_points=parameters["num_points"], payload_bytes=len(data["content"]))
+        # Download unprintable designs too, but tell the user
+        return [data, create_unprintable_alert() if valid is False else None]
     
     
 
@@ -307,13 +601,45 @@ def run_app(config: dict) -> dash.Dash:
     Returns:
         dash.App: The dash app.
     """
+    # Open the store shared by the workers
+    open_store(config)
+
     # Initialize app
     app = create_app(config)
 
-    # Create callbacks
+    # Limit the engine calls of the worker, shared by the callbacks and routes,
+    # a thread of the worker stays free to answer requests beyond the limits
+    check_threads([config["app"]["admission"], config["app"]["gallery"]["admission"], config["app"]["multiples"]["admission"]], config["app"]["threads"])
+    admission = AdmissionController(**config["app"]["admission"])
+
+    # Create callbacks, capturing the design requests if enabled
     create_callbacks(
         app,
-        config
+        config,
+        admission,
+        open_request_log(config)
     )
 
+    # Serve the thumbnails of the gallery and the designs by their URLs
+    create_routes(app, config, admission)
+
+    # Design previews in parallel, the processes start on first use
+    open_pool(config)
+
+    # Report the load and rejections of the worker
+    app.server.add_url_rule('/status', 'status', lambda: flask.jsonify(admission.get_metrics()))
+
     return app
+
+
+def warm_up_app(config: dict):
+    """Compiles the models and warms up the engine before the server accepts requests.
+       Gunicorn calls it in every worker process (see gunicorn.conf.py).
+
+    Args:
+        config (dict): Config of the paramter space read from the yaml file.
+    """
+
+    if config["engine"]["warm_up"]:
+        for model in config["models"]:
+            encode_geometry(warm_up(config, model), config)
@@ -0,0 +1,352 @@
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+import matplotlib.tri as mtri
+
+from src.mesh import weld_vertices
+
+
+def get_morton_codes(points: np.ndarray, bits: int = 10) -> np.ndarray:
+    """Calculates Morton codes (z-order curve) of points to sort them spatially.
+
+    Args:
+        points (np.ndarray): Points with shape (num_points, 3).
+        bits (int, optional): Number of bits per coordinate. Defaults to 10.
+
+    Returns:
+        np.ndarray: Morton code of every point.
+    """
+
+    # Quantize points to integer coordinates within the bounding box in double precision,
+    # axes without extent are quantized to 0
+    points = points.astype(np.float64)
+    lower, upper = points.min(axis=0), points.max(axis=0)
+    span = upper - lower
+    scale = np.where(span > 0, (2 ** bits - 1) / np.where(span > 0, span, 1), 0)
+    quantized = ((points - lower) * scale).astype(np.int64)
+
+    # Interleave the bits of the three coordinates
+    codes = np.zeros(len(points), dtype=np.int64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((quantized[:, axis] >> bit) & 1) << (3 * bit + axis)
+
+    return codes
+
+
+def build_bvh(lower: np.ndarray, upper: np.ndarray, leaf_size: int = 1) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Builds a linear bounding volume hierarchy over bounding boxes.
+       Boxes are sorted along a z-order curve and grouped into leaves of equal size,
+       which are merged pairwise into a complete binary tree stored level by level.
+
+    Args:
+        lower (np.ndarray): Lower corners of the boxes with shape (num_boxes, 3).
+        upper (np.ndarray): Upper corners of the boxes with shape (num_boxes, 3).
+        leaf_size (int, optional): Number of boxes per leaf. Defaults to 1.
+
+    Returns:
+        Tuple[np.ndarray, List[np.ndarray]]: Order of the boxes along the z-order curve and node boxes per level
+        from the root to the leaves. Node boxes are stored component wise with shape (6, num_nodes),
+        first the lower and then the upper corners, which makes gathering them faster.
+    """
+
+    # Sort boxes along a z-order curve of their centers
+    order = np.argsort(get_morton_codes((lower + upper) / 2), kind="stable")
+
+    # Pad leaves to a power of two, padded entries get empty boxes
+    num_leaves = 2 ** int(np.ceil(np.log2(max(1, -(-len(order) // leaf_size)))))
+    boxes = np.empty((6, num_leaves * leaf_size), dtype=lower.dtype)
+    boxes[:3], boxes[3:] = np.inf, -np.inf
+    boxes[:3, :len(order)], boxes[3:, :len(order)] = lower[order].T, upper[order].T
+
+    # Merge neighbouring boxes up to the root
+    levels = [np.concatenate([
+        boxes[:3].reshape(3, num_leaves, leaf_size).min(axis=-1),
+        boxes[3:].reshape(3, num_leaves, leaf_size).max(axis=-1),
+    ])]
+    while levels[0].shape[1] > 1:
+        children = levels[0].reshape(6, -1, 2)
+        levels.insert(0, np.concatenate([children[:3].min(axis=-1), children[3:].max(axis=-1)]))
+
+    return order, levels
+
+
+def overlap(boxes: np.ndarray, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Keeps pairs of axis aligned boxes which overlap. Pairs are dropped axis by axis,
+       so every further axis only gathers the boxes of the remaining pairs.
+
+    Args:
+        boxes (np.ndarray): Lower and upper corners of the boxes with shape (6, num_boxes).
+        a (np.ndarray): Indices of the first boxes.
+        b (np.ndarray): Indices of the second boxes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of the first and second boxes of all overlapping pairs.
+    """
+
+    for axis in range(3):
+        mask = (boxes[axis][a] <= boxes[axis + 3][b]) & (boxes[axis][b] <= boxes[axis + 3][a])
+        a, b = a[mask], b[mask]
+
+    return a, b
+
+
+def expand_pairs(levels: List[np.ndarray], a: np.ndarray, b: np.ndarray, level: int = 1, chunk_size: int = 2 ** 18) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Expands pairs of overlapping nodes down to the leaves. All pairs of nodes of one level are expanded at once,
+       more pairs than the chunk size are split and expanded one chunk after the other.
+
+    Args:
+        levels (List[np.ndarray]): Node boxes per level, see build_bvh.
+        a (np.ndarray): Indices of the first nodes of the pairs.
+        b (np.ndarray): Indices of the second nodes of the pairs.
+        level (int, optional): Level of the children of the nodes. Defaults to 1.
+        chunk_size (int, optional): Maximum number of pairs expanded at once. Defaults to 2 ** 18.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Indices of the first and second leaves of overlapping pairs.
+    """
+
+    # Children of a node paired with itself and of a pair of different nodes
+    same_a, same_b = np.array([0, 0, 1], dtype=np.int32), np.array([0, 1, 1], dtype=np.int32)
+    other_a, other_b = np.array([0, 0, 1, 1], dtype=np.int32), np.array([0, 1, 0, 1], dtype=np.int32)
+
+    for nodes in levels[level:]:
+        # Split large levels, so the pairs of the first chunk reach the leaves before the others are expanded
+        if len(a) > chunk_size:
+            for start in range(0, len(a), chunk_size):
+                yield from expand_pairs(levels, a[start:start + chunk_size], b[start:start + chunk_size], level, chunk_size)
+            return
+
+        # Expand pairs to the pairs of their children
+        same = a == b
+        a, b = (
+            np.concatenate([(2 * a[same, None] + same_a).ravel(), (2 * a[~same, None] + other_a).ravel()]),
+            np.concatenate([(2 * a[same, None] + same_b).ravel(), (2 * b[~same, None] + other_b).ravel()]),
+        )
+
+        # Keep overlapping nodes
+        a, b = overlap(nodes, a, b)
+        level += 1
+
+    yield a, b
+
+
+def iterate_candidate_pairs(lower: np.ndarray, upper: np.ndarray, leaf_size: int = 1, chunk_size: int = 2 ** 18) -> Iterator[np.ndarray]:
+    """Finds pairs of overlapping boxes by traversing a bounding volume hierarchy with itself, chunk by chunk.
+       The memory is bounded by the chunk size and a caller may stop as soon as it found what it needs.
+
+    Args:
+        lower (np.ndarray): Lower corners of the boxes with shape (num_boxes, 3).
+        upper (np.ndarray): Upper corners of the boxes with shape (num_boxes, 3).
+        leaf_size (int, optional): Number of boxes per leaf. Defaults to 1.
+        chunk_size (int, optional): Maximum number of node pairs expanded at once, see expand_pairs. Defaults to 2 ** 18.
+
+    Yields:
+        np.ndarray: Index pairs of overlapping boxes with shape (num_pairs, 2), first index smaller than second.
+    """
+
+    order, levels = build_bvh(lower, upper, leaf_size)
+    boxes = np.concatenate([lower[order].T, upper[order].T])
+
+    # Start with the root paired with itself
+    root = np.zeros(1, dtype=np.int32)
+    for a, b in expand_pairs(levels, root, root, 1, chunk_size):
+        # Expand leaf pairs to pairs of sorted boxes, each pair of a leaf with itself only once
+        if leaf_size > 1:
+            offsets = np.arange(leaf_size, dtype=np.int32)
+            i = (leaf_size * a[:, None, None] + offsets[None, :, None]).repeat(leaf_size, axis=2).reshape(-1)
+            j = (leaf_size * b[:, None, None] + offsets[None, None, :]).repeat(leaf_size, axis=1).reshape(-1)
+            mask = (j < len(order)) & ((i < j) | np.repeat(a != b, leaf_size * leaf_size))
+            i, j = i[mask], j[mask]
+
+            # Keep overlapping boxes
+            a, b = overlap(boxes, i, j)
+        else:
+            mask = a != b
+            a, b = a[mask], b[mask]
+
+        # Map back to the original order
+        a, b = order[a], order[b]
+        yield np.stack([np.minimum(a, b), np.maximum(a, b)], axis=-1)
+
+
+def find_candidate_pairs(lower: np.ndarray, upper: np.ndarray, leaf_size: int = 1) -> np.ndarray:
+    """Finds all pairs of overlapping boxes by traversing a bounding volume hierarchy with itself.
+
+    Args:
+        lower (np.ndarray): Lower corners of the boxes with shape (num_boxes, 3).
+        upper (np.ndarray): Upper corners of the boxes with shape (num_boxes, 3).
+        leaf_size (int, optional): Number of boxes per leaf. Defaults to 1.
+
+    Returns:
+        np.ndarray: Index pairs of overlapping boxes with shape (num_pairs, 2), first index smaller than second.
+    """
+
+    return np.concatenate(list(iterate_candidate_pairs(lower, upper, leaf_size)) + [np.zeros((0, 2), dtype=np.int64)])
+
+
+def separate(corners: np.ndarray, normals: np.ndarray, offsets: np.ndarray, first: np.ndarray, second: np.ndarray, epsilon: float = 1e-9) -> np.ndarray:
+    """Checks if triangles lie strictly on one side of the plane of other triangles.
+
+    Args:
+        corners (np.ndarray): Corners of all triangles stored component wise with shape (3, 3, num_triangles).
+        normals (np.ndarray): Normals of all triangles stored component wise with shape (3, num_triangles).
+        offsets (np.ndarray): Offsets of all triangle planes along their normals.
+        first (np.ndarray): Indices of the triangles defining the planes.
+        second (np.ndarray): Indices of the triangles which are tested.
+        epsilon (float, optional): Tolerance which treats touching triangles as separated. Defaults to 1e-9.
+
+    Returns:
+        np.ndarray: True for every triangle which does not cross the plane.
+    """
+
+    # Gather plane of the first triangles
+    normal = [normals[axis][first] for axis in range(3)]
+    offset = offsets[first]
+
+    # Get signed distances of the corners of the second triangles to the plane
+    above = np.ones(len(first), dtype=bool)
+    below = np.ones(len(first), dtype=bool)
+    for corner in range(3):
+        distance = sum(normal[axis] * corners[corner, axis][second] for axis in range(3)) - offset
+        above &= distance > -epsilon
+        below &= distance < epsilon
+
+    return above | below
+
+
+def intersect_segments(start: np.ndarray, end: np.ndarray, triangles: np.ndarray, epsilon: float = 1e-9) -> np.ndarray:
+    """Checks if segments cross triangles (Möller-Trumbore).
+
+    Args:
+        start (np.ndarray): Start points of the segments with shape (num_pairs, 3).
+        end (np.ndarray): End points of the segments with shape (num_pairs, 3).
+        triangles (np.ndarray): Corners of the triangles with shape (num_pairs, 3, 3).
+        epsilon (float, optional): Tolerance which excludes touching segments. Defaults to 1e-9.
+
+    Returns:
+        np.ndarray: True for every segment crossing its triangle.
+    """
+
+    # Get edges of the triangles and the direction of the segment
+    edge_1 = triangles[:, 1] - triangles[:, 0]
+    edge_2 = triangles[:, 2] - triangles[:, 0]
+    direction = end - start
+
+    # Calculate barycentric coordinates and segment parameter
+    h = np.cross(direction, edge_2)
+    determinant = np.einsum("ij,ij->i", edge_1, h)
+    parallel = np.abs(determinant) < epsilon
+    inverse = 1 / np.where(parallel, 1, determinant)
+
+    s = start - triangles[:, 0]
+    u = inverse * np.einsum("ij,ij->i", s, h)
+    q = np.cross(s, edge_1)
+    v = inverse * np.einsum("ij,ij->i", direction, q)
+    t = inverse * np.einsum("ij,ij->i", edge_2, q)
+
+    return ~parallel & (u > epsilon) & (v > epsilon) & (u + v < 1 - epsilon) & (t > epsilon) & (t < 1 - epsilon)
+
+
+def find_intersecting_pairs(faces: np.ndarray, corners: np.ndarray, corners_t: np.ndarray, normals: np.ndarray, offsets: np.ndarray, first: np.ndarray, second: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Keeps candidate pairs of triangles which intersect each other, neighbours sharing a vertex are dropped.
+
+    Args:
+        faces (np.ndarray): Vertex indices of all triangles stored component wise with shape (3, num_triangles).
+        corners (np.ndarray): Corners of all triangles with shape (num_triangles, 3, 3).
+        corners_t (np.ndarray): The same corners stored component wise with shape (3, 3, num_triangles).
+        normals (np.ndarray): Normals of all triangles stored component wise with shape (3, num_triangles).
+        offsets (np.ndarray): Offsets of all triangle planes along their normals.
+        first (np.ndarray): Indices of the first triangles of the candidate pairs.
+        second (np.ndarray): Indices of the second triangles of the candidate pairs.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of the first and second triangles of all intersecting pairs.
+    """
+
+    # Remove neighbouring triangles sharing a vertex
+    vertices_second = [faces[corner][second] for corner in range(3)]
+    shared = np.zeros(len(first), dtype=bool)
+    for corner_first in range(3):
+        vertex = faces[corner_first][first]
+        for vertex_second in vertices_second:
+            shared |= vertex == vertex_second
+    first, second = first[~shared], second[~shared]
+
+    # Remove pairs where one triangle lies on one side of the plane of the other
+    separated = separate(corners_t, normals, offsets, first, second)
+    first, second = first[~separated], second[~separated]
+    separated = separate(corners_t, normals, offsets, second, first)
+    first, second = first[~separated], second[~separated]
+
+    # Check if any edge of one triangle crosses the other triangle
+    corners_first, corners_second = corners[first], corners[second]
+    intersecting = np.zeros(len(first), dtype=bool)
+    for edge in [(0, 1), (1, 2), (2, 0)]:
+        intersecting |= intersect_segments(corners_first[:, edge[0]], corners_first[:, edge[1]], corners_second)
+        intersecting |= intersect_segments(corners_second[:, edge[0]], corners_second[:, edge[1]], corners_first)
+
+    return first[intersecting], second[intersecting]
+
+
+def find_self_intersections(x: np.ndarray, y: np.ndarray, z: np.ndarray, triangles: mtri.triangulation.Triangulation, leaf_size: int = 1, max_pairs: Optional[int] = None, chunk_size: int = 2 ** 18, weld_tolerance: float = 1e-9) -> np.ndarray:
+    """Finds pairs of triangles of a mesh which intersect each other.
+       Triangles sharing a vertex are neighbours and are not reported.
+
+    Args:
+        x (np.ndarray): x-coordinates of the points of the mesh.
+        y (np.ndarray): y-coordinates of the points of the mesh.
+        z (np.ndarray): z-coordinates of the points of the mesh.
+        triangles (mtri.triangulation.Triangulation): Correspoinding triangulation.
+        leaf_size (int, optional): Number of triangles per leaf of the bounding volume hierarchy. Defaults to 1.
+        max_pairs (Optional[int], optional): Stops once at least this many pairs are found,
+                                             e.g. 1 to reject a mesh as soon as possible. Defaults to None.
+        chunk_size (int, optional): Number of candidate pairs found and tested at once. Defaults to 2 ** 18.
+        weld_tolerance (float, optional): Distance relative to the diagonal of the bounding box
+                                          below which points are the same. Defaults to 1e-9.
+
+    Returns:
+        np.ndarray: Index pairs of intersecting triangles with shape (num_pairs, 2).
+    """
+
+    # Get corners of all triangles relative to the size of the mesh
+    points = np.stack([x, y, z], axis=-1).astype(np.float64)
+    points = (points - points.min(axis=0)) / np.linalg.norm(np.ptp(points, axis=0))
+
+    # Weld points closer than the tolerance of the tests, triangles collapsing to a segment or a point
+    # cannot cross others and are dropped. Designs with overflowing radii collapse most triangles
+    # into long slivers, whose boxes would overlap each other.
+    faces = weld_vertices(points, triangles.triangles, weld_tolerance)
+    kept = np.flatnonzero((faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0]))
+
+    # Sort triangles along a z-order curve, so candidate pairs access memory coherently
+    order = kept[np.argsort(get_morton_codes(points[faces[kept]].mean(axis=1)), kind="stable")]
+    faces = faces[order]
+    corners = points[faces]
+
+    # Get the planes of all triangles
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=-1, keepdims=True), np.finfo(np.float64).tiny)
+    offsets = np.einsum("ij,ij->i", normals, corners[:, 0])
+
+    # Find overlapping bounding boxes in single precision and test them chunk by chunk as they are found,
+    # which bounds the memory and allows to stop before all candidates are found
+    faces_t = np.ascontiguousarray(faces.T)
+    corners_t = np.ascontiguousarray(corners.transpose(1, 2, 0))
+    normals_t = np.ascontiguousarray(normals.T)
+    found, num_found = [], 0
+    candidates = iterate_candidate_pairs(corners.min(axis=1).astype(np.float32), corners.max(axis=1).astype(np.float32), leaf_size, chunk_size)
+    for pairs in candidates:
+        for start in range(0, len(pairs), chunk_size):
+            found.append(find_intersecting_pairs(faces_t, corners, corners_t, normals_t, offsets, pairs[start:start + chunk_size, 0], pairs[start:start + chunk_size, 1]))
+            num_found += len(found[-1][0])
+            if max_pairs is not None and num_found >= max_pairs:
+                break
+        if max_pairs is not None and num_found >= max_pairs:
+            break
+    first = np.concatenate([first for first, _ in found] + [np.zeros(0, dtype=np.int64)])
+    second = np.concatenate([second for _, second in found] + [np.zeros(0, dtype=np.int64)])
+
+    # Map back to the original triangle indices
+    first, second = order[first], order[second]
+
+    return np.stack([np.minimum(first, second), np.maximum(first, second)], axis=-1)
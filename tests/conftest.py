@@ -0,0 +1,18 @@
+import os
+import pytest
+
+from src.common import read_config
+
+# Root of the repository, which holds the config of the app
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def config() -> dict:
+    """Reads the config of the app, a fresh copy per test so tests may change it.
+
+    Returns:
+        dict: Config of the paramter space read from the yaml file.
+    """
+
+    return read_config(os.path.join(ROOT, "config.yml"))
@@ -0,0 +1,81 @@
+import threading
+import time
+import flask
+import pytest
+
+from src.admission import AdmissionController, check_threads, get_client
+
+
+def test_admission_rejects_calls_beyond_the_queue():
+    admission = AdmissionController(max_concurrent=1, max_queued=0, rate=100., burst=100)
+
+    with admission.admit("a") as first:
+        start = time.perf_counter()
+        with admission.admit("b") as second:
+            pass
+
+    assert (first, second) == ("admitted", "busy")
+    assert time.perf_counter() - start < 0.1
+    assert admission.get_metrics()["active"] == 0
+
+
+def test_admission_queues_calls_until_a_slot_is_free():
+    admission = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=5., rate=100., burst=100)
+    statuses = []
+
+    with admission.admit("a"):
+        waiting = threading.Thread(target=lambda: statuses.append(admission.acquire("b")))
+        waiting.start()
+        time.sleep(0.05)
+        assert admission.acquire("c") == "busy"
+    waiting.join(5)
+
+    assert statuses == ["admitted"]
+
+
+def test_admission_times_out_queued_calls():
+    admission = AdmissionController(max_concurrent=1, max_queued=1, queue_timeout=0.05, rate=100., burst=100)
+
+    with admission.admit("a"):
+        assert admission.acquire("b") == "timeout"
+
+
+def test_admission_limits_the_rate_of_a_client():
+    admission = AdmissionController(max_concurrent=10, rate=0.001, burst=2)
+
+    statuses = [admission.acquire("a") for _ in range(3)]
+
+    assert statuses == ["admitted", "admitted", "rate_limited"]
+    assert admission.acquire("b") == "admitted"
+
+
+def test_check_threads(config):
+    app = config["app"]
+    check_threads([app["admission"], app["gallery"]["admission"], app["multiples"]["admission"]], app["threads"])
+
+    with pytest.raises(ValueError):
+        check_threads([{"max_concurrent": 2, "max_queued": 4}], 4)
+
+
+def test_get_client_trusts_forwarded_addresses_behind_proxies():
+    app = flask.Flask(__name__)
+    headers = {"X-Forwarded-For": "10.0.0.1, 192.0.2.7", "X-Client-IP": "10.0.0.2"}
+
+    with app.test_request_context(headers=headers, environ_base={"REMOTE_ADDR": "192.0.2.100"}):
+        assert get_client() == "192.0.2.100"
+        assert get_client(1) == "192.0.2.7"
+        assert get_client(2) == "10.0.0.1"
+        assert get_client(3) == "192.0.2.100"
+
+
+def test_admission_takes_a_slot_per_process():
+    admission = AdmissionController(max_concurrent=2, max_queued=0, rate=100., burst=100)
+
+    with admission.admit("a", 2) as previews:
+        assert admission.acquire("b") == "busy"
+    with admission.admit("a") as design:
+        assert admission.acquire("b", 2) == "busy"
+
+    assert (previews, design) == ("admitted", "admitted")
+    with pytest.raises(ValueError):
+        admission.acquire("a", 3)
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import matplotlib.tri as mtri
+
+import src.analytics as analytics
+from src.analytics import analyze_mesh, analyze_design, find_thin_walls
+from src.engine import resample_design, mesh_design, sample_parameters
+
+
+def create_cube(size: float = 10.0):
+    """Creates a closed cube with outward facing triangles."""
+
+    points = np.array([[x, y, z] for x in (0, size) for y in (0, size) for z in (0, size)], dtype=np.float64)
+    triangles = np.array([[0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5], [0, 4, 5], [0, 5, 1],
+                          [2, 3, 7], [2, 7, 6], [0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3]])
+    x, y, z = points.T
+
+    return x, y, z, mtri.Triangulation(x, y, triangles)
+
+
+def test_analyze_mesh_measures_a_closed_cube(config):
+    metrics = analyze_mesh(*create_cube(), config)
+
+    assert np.isclose(abs(metrics["volume"]), 1000)
+    assert np.isclose(metrics["area"], 600)
+    assert metrics["closed"]
+
+    metrics = analyze_mesh(*create_cube(), config, closed=False)
+    assert metrics["volume"] is None
+    assert not metrics["closed"]
+
+
+def test_thin_walls_of_a_degenerate_mesh():
+    points = np.zeros((3, 3))
+    normals = np.tile([0.0, 0.0, 1.0], (3, 1))
+
+    fraction, thinnest = find_thin_walls(points, np.zeros(3), normals)
+
+    assert np.isnan(fraction) and thinnest is None
+
+
+def test_thin_walls_sample_only_vertices_with_area():
+    points = np.random.default_rng(0).uniform(0, 100, size=(2000, 3))
+    normals = np.tile([0.0, 0.0, 1.0], (2000, 1))
+    areas = np.zeros(2000)
+    areas[:3] = 1.0
+
+    fraction, thinnest = find_thin_walls(points, areas, normals, num_samples=1000)
+
+    assert fraction == 0.0 and thinnest is None
+
+
+@pytest.mark.parametrize("seed", [18, 49])
+def test_analyze_design_of_meshes_with_degenerate_triangles(config, seed):
+    metrics = analyze_design(sample_parameters(config, "csym", seed), config, "csym")
+
+    assert 0 <= metrics["thin_fraction"] <= 1
+
+
+def test_analyze_design_measures_the_exported_mesh(config, monkeypatch):
+    parameters, _, _ = resample_design(config, "csym", 7)
+    purposes = []
+    def record(parameters, config, model, purpose, reference=None):
+        purposes.append(purpose)
+        return mesh_design(parameters, config, model, purpose, reference)
+    monkeypatch.setattr(analytics, "mesh_design", record)
+
+    metrics = analyze_design(parameters, config, "csym", True)
+    expected = analyze_mesh(*mesh_design(parameters, config, "csym", "export"), config)
+
+    assert purposes == ["export"]
+    assert metrics == expected
+
+
+def test_analyze_design_reports_the_validation(config):
+    parameters, _, _ = resample_design(config, "csym", 7)
+
+    # An invalid design encloses no volume even if its model is validated
+    assert analyze_design(parameters, config, "csym", False)["volume"] is None
+
+    # Without validation the watertightness of the exported mesh decides
+    config["models"]["csym"]["validate"] = False
+    metrics = analyze_design(parameters, config, "csym")
+    assert metrics["closed"] and metrics["volume"] is not None
@@ -0,0 +1,56 @@
+import glob
+import json
+import threading
+import numpy as np
+
+from src.capture import RequestLog, trace, add_timing, add_stages, timed, open_request_log
+
+
+def test_trace_is_local_to_its_thread():
+    records = {}
+    barrier = threading.Barrier(2, timeout=5)
+    def handle(name):
+        with trace() as record:
+            with timed(name):
+                barrier.wait()
+            add_stages({name: "computed"})
+        records[name] = record
+    threads = [threading.Thread(target=handle, args=(name,)) for name in ["first", "second"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert list(records["first"]["timings"]) == ["first"]
+    assert records["second"]["stages"] == {"second": "computed"}
+    assert records["first"]["timings"]["first"] >= 0
+
+
+def test_untraced_calls_are_ignored():
+    add_timing("design", 1.0)
+
+    with trace() as record:
+        add_timing("design", 0.5)
+        add_timing("design", 0.25)
+
+    assert record["timings"] == {"design": 0.75}
+
+
+def test_request_log_rotates(tmp_path):
+    log = RequestLog(str(tmp_path / "requests-{pid}.jsonl"), max_bytes=200, backup_count=2)
+    for index in range(30):
+        log.write({"index": np.int64(index), "duration": np.float32(0.5)})
+
+    paths = sorted(glob.glob(str(tmp_path / "requests-*.jsonl*")))
+    entries = [json.loads(line) for path in paths for line in open(path)]
+
+    # The log and two backups are kept, the oldest entries are dropped
+    indices = sorted(entry["index"] for entry in entries)
+    assert len(paths) == 3
+    assert all(isinstance(index, int) for index in indices)
+    assert indices[-1] == 29 and indices[0] > 0
+    assert indices == list(range(indices[0], 30))
+
+
+def test_request_log_is_disabled_by_default(config):
+    assert open_request_log(config) is None
@@ -0,0 +1,161 @@
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import pytest
+import numpy as np
+
+from src.engine import evaluate_design, sample_parameters, get_plan, generate_seed, warm_up, resample_design, validate_design, mesh_design, is_finite_design, compare_precision, generate_grid, generate_grid_topology
+from src.validation import find_self_intersections
+from src.store import SharedStore
+import src.engine as engine
+
+
+def design(config: dict, model: str, seed: int) -> tuple:
+    """Designs a small grid of a model, which keeps the tests fast."""
+
+    parameters = sample_parameters(config, model, seed)
+    parameters["num_points"] = 48
+    x, y, z, _ = evaluate_design(parameters, model)[0]
+
+    return np.array(x), np.array(y), np.array(z)
+
+
+def test_sample_parameters_is_reproducible(config):
+    assert sample_parameters(config, "csym", 7) == sample_parameters(config, "csym", 7)
+    assert sample_parameters(config, "csym", 7) != sample_parameters(config, "csym", 8)
+
+
+def test_sample_parameters_keeps_global_random_state(config):
+    np.random.seed(1)
+    expected = np.random.uniform()
+    np.random.seed(1)
+    sample_parameters(config, "rsym", 3)
+
+    assert np.random.uniform() == expected
+
+
+def test_designs_are_deterministic_under_threads(config):
+    jobs = [(model, seed) for seed in range(100, 112) for model in ["csym", "rsym"]]
+
+    # Reference designs computed one at a time
+    expected = [design(config, model, seed) for model, seed in jobs]
+
+    # The same designs of both models interleaved on the threads of a worker
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for _ in range(2):
+            results = list(pool.map(lambda job: design(config, *job), jobs))
+            for job, result, reference in zip(jobs, results, expected):
+                for actual, wanted in zip(result, reference):
+                    np.testing.assert_array_equal(actual, wanted, err_msg=str(job))
+
+
+def test_get_plan_compares_settings(config):
+    plan = get_plan(config, "csym")
+
+    # An equal config read again reuses the plan
+    assert get_plan(copy.deepcopy(config), "csym") is plan
+
+    # Changed settings compile the model again
+    changed = copy.deepcopy(config)
+    changed["models"]["csym"]["parameters"]["edginess"] = [0.0, 0.5]
+    recompiled = get_plan(changed, "csym")
+    assert recompiled is not plan
+    assert recompiled.high[recompiled.names.index("edginess")] == 0.5
+
+
+def test_warm_up_keeps_global_random_state(config):
+    config["models"]["csym"]["parameters"]["num_points"] = 48
+    np.random.seed(1)
+    expected = np.random.uniform()
+    np.random.seed(1)
+    warm_up(config, "csym")
+
+    assert np.random.uniform() == expected
+
+
+def test_generate_seed_is_fresh(config):
+    assert len({generate_seed(config) for _ in range(8)}) > 1
+
+
+def test_validate_design_checks_export_mesh(config):
+    parameters = sample_parameters(config, "csym", 9)
+    mesh = mesh_design(parameters, config, "csym", "export")
+
+    assert validate_design(parameters, config, "csym") is False
+    assert len(find_self_intersections(*mesh)) > 0
+
+
+def test_resample_design_reports_unprintable_designs(config):
+    config = copy.deepcopy(config)
+    config["engine"]["validation"]["max_attempts"] = 1
+
+    parameters, _, valid = resample_design(config, "csym", 9)
+
+    assert valid is False
+    assert parameters == sample_parameters(config, "csym", 9)
+
+
+def test_resample_design_validates_rsym_if_enabled(config):
+    config["models"]["rsym"]["validate"] = True
+    parameters, _, valid = resample_design(config, "rsym", 0)
+
+    assert valid is validate_design(parameters, config, "rsym")
+
+
+def test_validate_design_skips_unvalidated_models(config):
+    config = copy.deepcopy(config)
+    config["models"]["rsym"]["validate"] = False
+
+    assert validate_design(sample_parameters(config, "rsym", 0), config, "rsym") is None
+
+
+def test_select_reference_grid_is_memoized(config, monkeypatch, tmp_path):
+    calls, original = [], engine.select_grid
+
+    def select_grid(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(engine, "STORE", SharedStore(str(tmp_path)))
+    monkeypatch.setattr(engine, "select_grid", select_grid)
+    reference = sample_parameters(config, "csym", 3)
+    reference["num_points"] = 48
+
+    first = engine.select_reference_grid(reference, config, "csym")
+    second = engine.select_reference_grid(reference, config, "csym")
+
+    assert len(calls) == 1
+    np.testing.assert_array_equal(first[0], second[0])
+    np.testing.assert_array_equal(first[1], second[1])
+
+
+def test_validate_design_rejects_non_finite_designs(config):
+    # The design of the seed overflows to nan at the export resolution
+    parameters = sample_parameters(config, "csym", 36)
+
+    assert not is_finite_design(parameters, "csym")
+    assert validate_design(parameters, config, "csym") is False
+
+
+@pytest.mark.parametrize("model", ["csym", "rsym"])
+@pytest.mark.parametrize("seed", [0, 1, 2, 3, 4])
+def test_single_precision_designs_stay_within_tolerance(config, model, seed):
+    deviation, within = compare_precision(config, model, seed, "float32")
+
+    assert within, f"{model} seed {seed} deviates by {deviation:.2e}"
+
+
+def test_grids_share_their_topology():
+    first, second = generate_grid(num_points=40), generate_grid(a_max=10.0, num_points=40)
+
+    assert np.shares_memory(first[2].triangles, generate_grid_topology(40))
+    assert np.shares_memory(first[2].triangles, second[2].triangles)
+
+
+def test_stored_meshes_are_mapped(config, monkeypatch, tmp_path):
+    monkeypatch.setattr(engine, "STORE", SharedStore(str(tmp_path)))
+    parameters, _, _ = resample_design(config, "csym", 7)
+
+    mesh_design(parameters, config, "csym", "export")
+    x, _, _, triangles = mesh_design(parameters, config, "csym", "export")
+
+    assert isinstance(x, np.memmap) and isinstance(triangles.triangles, np.memmap)
@@ -0,0 +1,37 @@
+import base64
+import copy
+import numpy as np
+import matplotlib.tri as mtri
+
+from src.figure import encode_geometry
+
+
+def generate_mesh() -> tuple:
+    """Generates a single triangle with coordinates which need double precision."""
+
+    x = np.array([0., 1., 0.]) + 1e-9
+    y = np.array([0., 0., 1.])
+    z = np.array([0., 0., 0.])
+
+    return x, y, z, mtri.Triangulation(x, y, triangles=np.array([[0, 1, 2]]))
+
+
+def test_encode_geometry_uses_engine_precision(config):
+    for dtype, itemsize in [("float32", 4), ("float64", 8)]:
+        config = copy.deepcopy(config)
+        config["engine"]["dtype"] = dtype
+
+        update = encode_geometry(generate_mesh(), config)
+
+        assert update["x"]["type"] == dtype
+        assert len(base64.b64decode(update["x"]["data"])) == 3 * itemsize
+
+
+def test_encode_geometry_skips_held_arrays(config):
+    update = encode_geometry(generate_mesh(), config)
+    held = [item["digest"] for item in update.values()]
+
+    resent = encode_geometry(generate_mesh(), config, held)
+
+    assert all(item["data"] is None for item in resent.values())
+    assert all(item["data"] is not None for item in encode_geometry(generate_mesh(), config, None).values())
@@ -0,0 +1,155 @@
+import threading
+import pytest
+import numpy as np
+
+from src.engine import generate_grid, generate_ellipsoid, resample_design, sample_parameters, evaluate_design
+from src.mesh import close_mesh, decimate_grid, is_watertight, select_grid, weld_vertices, remove_degenerate_triangles, unique_rows
+from src.validation import find_self_intersections
+
+
+def generate_tube(num_points: int = 32) -> tuple:
+    """Generates a cylinder on the grid of the cylindrical model."""
+
+    z, phi, triangles = generate_grid(a_max=1., num_points=num_points)
+
+    return np.cos(phi), np.sin(phi), z, triangles
+
+
+def test_close_mesh_closes_tube():
+    x, y, z, triangles = close_mesh(*generate_tube())
+
+    assert is_watertight(triangles.triangles)
+
+
+def test_close_mesh_closes_ellipsoid_at_its_poles():
+    # Textures along phi stretch the pole of the ellipsoid along its axis
+    theta, phi, triangles = generate_grid(num_points=40)
+    x, y, z = generate_ellipsoid(np.minimum(theta / 2, np.pi), phi)
+    z = z * (1 + 0.1 * np.cos(3 * phi))
+
+    x, y, z, triangles = close_mesh(x, y, z, triangles, periodic=(True, True))
+
+    assert is_watertight(triangles.triangles)
+    assert len(find_self_intersections(x, y, z, triangles)) == 0
+
+
+def test_weld_vertices_keeps_non_finite_points():
+    points = np.array([[0., 0., 0.], [0., 0., 0.], [np.nan, 0., 0.], [1., 1., 1.]])
+    triangles = np.array([[0, 2, 3], [1, 3, 2]])
+
+    np.testing.assert_array_equal(weld_vertices(points, triangles), [[0, 2, 3], [0, 3, 2]])
+
+
+def test_close_mesh_drops_non_finite_points():
+    x, y, z, triangles = generate_tube()
+    x = x.copy()
+    x[100:140] = np.nan
+
+    x, y, z, triangles = close_mesh(x, y, z, triangles)
+
+    assert np.isfinite(np.stack([x, y, z])).all()
+    assert len(triangles.triangles) > 0
+
+
+def test_empty_faces_are_handled():
+    empty = np.zeros((0, 3), dtype=np.int64)
+
+    assert len(unique_rows(empty, return_index=True)[0]) == 0
+    assert remove_degenerate_triangles(empty).shape == (0, 3)
+
+
+def test_close_mesh_rejects_designs_without_finite_points():
+    x, y, z, triangles = generate_tube()
+
+    with pytest.raises(ValueError):
+        close_mesh(np.full_like(x, np.nan), y, z, triangles)
+
+
+def test_resample_design_rejects_non_finite_designs(config):
+    # The first attempt of the seed overflows to nan at the resolution of the previews
+    first = sample_parameters(config, "csym", 36)
+    first["num_points"] = 80
+    assert not np.isfinite(evaluate_design(first, "csym")[0][0]).all()
+
+    parameters, geometry, _ = resample_design(config, "csym", 36, 80)
+
+    assert parameters != first
+    assert all(np.isfinite(coordinates).all() for coordinates in geometry[:3])
+
+
+def generate_surface(num_points: int = 60) -> tuple:
+    """Generates a height field with a smooth wave and a narrow bump."""
+
+    a, b = np.linspace(0, 1, num_points), np.linspace(0, 1, num_points)
+    grid_a, grid_b = np.meshgrid(a, b)
+    z = 0.05 * np.sin(3 * np.pi * grid_a) * np.sin(2 * np.pi * grid_b) \
+        + 0.01 * np.exp(-((grid_a - 0.3) ** 2 + (grid_b - 0.6) ** 2) / 0.001)
+
+    return np.stack([grid_a, grid_b, z], axis=-1), a, b
+
+
+def get_interpolation_error(points: np.ndarray, a: np.ndarray, b: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> float:
+    """Gets the largest distance of the grid to the linear interpolation of its kept rows and columns."""
+
+    kept = points[rows][:, cols]
+    along_a = np.stack([[np.interp(a, a[cols], kept[row, :, k]) for k in range(3)] for row in range(len(rows))])
+    along_b = np.stack([[np.interp(b, b[rows], along_a[:, k, col]) for k in range(3)] for col in range(len(a))])
+
+    return float(np.linalg.norm(along_b.transpose(2, 0, 1) - points, axis=-1).max())
+
+
+def test_decimate_grid_keeps_tolerance():
+    points, a, b = generate_surface()
+    size = np.linalg.norm(np.ptp(points.reshape(-1, 3), axis=0))
+
+    rows, cols = decimate_grid(points, a, b, tolerance=2e-3)
+
+    assert len(rows) * len(cols) < points.shape[0] * points.shape[1]
+    assert get_interpolation_error(points, a, b, rows, cols) <= 2e-3 * size
+
+
+def test_decimate_grid_meets_triangle_budget():
+    points, a, b = generate_surface()
+
+    for tolerance in [1e-3, 0.]:
+        rows, cols = decimate_grid(points, a, b, tolerance, max_triangles=200)
+        assert 2 * len(rows) * len(cols) <= 200
+
+
+def test_decimate_grid_returns_on_non_finite_points():
+    points, a, b = generate_surface()
+    points[10, 10] = np.nan
+    result = []
+
+    # Run in a thread, so a regression fails instead of hanging the suite
+    thread = threading.Thread(target=lambda: result.append(decimate_grid(points, a, b, max_triangles=100)), daemon=True)
+    thread.start()
+    thread.join(10)
+
+    assert result, "decimate_grid did not return"
+    rows, cols = result[0]
+    assert len(rows) == points.shape[0] and len(cols) == points.shape[1]
+
+
+def test_close_mesh_reuses_grid_within_tolerance():
+    x, y, z, triangles = generate_tube(64)
+    z = z + 0.05 * np.sin(4 * x)
+    grid = select_grid(x, y, z, triangles, tolerance=1e-2)
+
+    # A slightly changed design keeps the topology of the reference
+    mesh = close_mesh(x, y, 1.01 * z, triangles, tolerance=1e-2, grid=grid)
+    reference = close_mesh(x, y, z, triangles, tolerance=1e-2, grid=grid)
+
+    np.testing.assert_array_equal(mesh[3].triangles, reference[3].triangles)
+
+
+def test_close_mesh_decimates_again_beyond_tolerance():
+    x, y, z, triangles = generate_tube(64)
+    grid = select_grid(x, y, z, triangles, tolerance=1e-2)
+
+    # Ripples along the axis of a plain tube are lost by its decimation
+    rippled = z + 0.2 * np.sin(40 * np.pi * z)
+    mesh = close_mesh(x, y, rippled, triangles, tolerance=1e-2, grid=grid)
+
+    assert len(mesh[3].triangles) > len(close_mesh(x, y, z, triangles, tolerance=1e-2, grid=grid)[3].triangles)
+    assert is_watertight(mesh[3].triangles)
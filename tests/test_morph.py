@@ -0,0 +1,27 @@
+import copy
+import os
+import subprocess
+import sys
+import numpy as np
+
+from src.morph import animate, morph
+
+
+def test_animate_sends_triangles_of_every_frame(config):
+    config = copy.deepcopy(config)
+    config["models"]["csym"]["parameters"]["num_points"] = 48
+
+    figure = animate(morph(config, "csym", 0, 1, num_frames=4), config, "csym")
+
+    assert len(figure.frames) == 4
+    for frame in figure.frames:
+        mesh = frame.data[0]
+        assert len(mesh.i) > 0
+        assert max(np.max(mesh.i), np.max(mesh.j), np.max(mesh.k)) < len(mesh.x)
+
+
+def test_morph_does_not_import_dash():
+    code = "import sys, src.morph; assert 'dash' not in sys.modules"
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=root)
@@ -0,0 +1,29 @@
+import os
+import numpy as np
+
+from src.engine import resample_seed, sample_parameters, evaluate_design
+from src.multiples import get_pool_size, preview_design
+
+
+def test_preview_design_returns_the_accepted_seed(config):
+    # The first attempt of the seed overflows to nan at the resolution of the previews
+    model, seed, data = preview_design(config, "csym", 36)
+
+    assert (model, data[:4]) == ("csym", b"\x89PNG")
+    assert seed > 36
+    parameters = sample_parameters(config, "csym", seed)
+    parameters["num_points"] = config["app"]["multiples"]["num_points"]
+    assert all(np.isfinite(coordinates).all() for coordinates in evaluate_design(parameters, "csym")[0][:3])
+
+    # Designing the accepted seed starts with the previewed design
+    assert resample_seed(config, "csym", seed, config["app"]["multiples"]["num_points"])[0] == seed
+
+
+def test_pool_scales_with_cores(config, monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+
+    config["app"]["multiples"]["max_workers"] = None
+    assert get_pool_size(config) == 16
+
+    config["app"]["multiples"]["max_workers"] = 4
+    assert get_pool_size(config) == 4
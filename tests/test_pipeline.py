@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import pytest
+
+from src.pipeline import Pipeline, Stage
+
+
+def test_different_designs_are_evaluated_concurrently():
+    # Both threads have to be inside the stage at once to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    def wait(value):
+        barrier.wait()
+        return value
+    pipeline = Pipeline([Stage("wait", wait, parameters=["value"])])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda value: pipeline.evaluate({"value": value})[0], [1, 2]))
+
+    assert results == [1, 2]
+
+
+def test_identical_stages_are_computed_once():
+    calls = []
+    def compute(value):
+        calls.append(value)
+        time.sleep(0.1)
+        return value * 2
+    pipeline = Pipeline([Stage("compute", compute, parameters=["value"])])
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda _: pipeline.evaluate({"value": 3}), range(4)))
+
+    assert calls == [3]
+    assert [result for result, _ in results] == [6] * 4
+    assert sorted(report["compute"] for _, report in results) == ["computed"] + ["reused"] * 3
+
+
+def test_failed_stages_are_computed_again():
+    calls = []
+    def compute(value):
+        calls.append(value)
+        if len(calls) == 1:
+            raise ValueError("first call fails")
+        return value
+    pipeline = Pipeline([Stage("compute", compute, parameters=["value"])])
+
+    with pytest.raises(ValueError):
+        pipeline.evaluate({"value": 1})
+
+    assert pipeline.evaluate({"value": 1}) == (1, {"compute": "computed"})
@@ -0,0 +1,55 @@
+import datetime
+import time
+
+from src.capture import RequestLog, trace
+from src.engine import resample_design, validate_design, mesh_design
+from src.replay import read_entries, run_replay, report_replay
+
+
+def capture_requests(config, path: str):
+    """Captures a design, an adjustment and a download of it like the callbacks of the app."""
+
+    log = RequestLog(path)
+    def write(callback, start, record, **fields):
+        log.write({"time": datetime.datetime.now().isoformat(), "callback": callback, "status": "admitted",
+                   "duration": time.perf_counter() - start, **fields, **record})
+
+    start = time.perf_counter()
+    with trace() as record:
+        parameters, _, _ = resample_design(config, "csym", 7)
+    write("generate", start, record, model="csym", seed=7)
+
+    start = time.perf_counter()
+    adjusted = {**parameters, "edginess": parameters["edginess"] + 0.1}
+    with trace() as record:
+        mesh_design(adjusted, config, "csym", "render", parameters)
+        validate_design(adjusted, config, "csym")
+    write("update", start, record, model="csym", parameters=adjusted, reference=parameters)
+
+    start = time.perf_counter()
+    with trace() as record:
+        mesh_design(parameters, config, "csym", "export")
+    write("download", start, record, model="csym", parameters=parameters)
+
+    # Rejected requests are logged, but never replayed
+    log.write({"time": datetime.datetime.now().isoformat(), "callback": "update", "status": "rate_limited", "duration": 0.0})
+
+
+def test_captured_requests_are_replayed(config, tmp_path):
+    path = str(tmp_path / "requests.jsonl")
+    capture_requests(config, path)
+
+    entries = read_entries([path])
+    results = run_replay(entries, config, concurrency=2)
+    lines = report_replay(entries, results)
+
+    assert [entry["callback"] for entry in entries] == ["generate", "update", "download"]
+    assert all(result["duration"] > 0 for result in results)
+    assert "validate" in results[1]["timings"] and "encode" in results[1]["timings"]
+    assert results[1]["stages"]
+
+    # One line per callback and per step which ran when captured and replayed
+    callbacks = lines[2:lines.index("")]
+    assert [line.split()[0] for line in callbacks] == ["download", "generate", "update"]
+    assert all(line.split()[1] == "1" for line in callbacks)
+    assert lines[-4] == "Largest slowdowns" and len(lines[-3:]) == 3
@@ -0,0 +1,120 @@
+import copy
+import json
+import threading
+import dash
+from dash import html
+import pytest
+
+import src.routes as routes
+from src.engine import get_max_seed
+from src.store import SharedStore
+
+
+@pytest.fixture
+def client(config, monkeypatch, tmp_path):
+    """Serves the routes with thumbnails which are rendered as their model and seed."""
+
+    config = copy.deepcopy(config)
+    config["app"]["gallery"]["directory"] = str(tmp_path)
+    config["app"]["gallery"]["num_thumbnails"] = 4
+
+    rendered = []
+    def create_thumbnail(config, model, seed):
+        rendered.append((model, seed))
+        return f"{model}-{seed}".encode()
+    monkeypatch.setattr(routes, "create_thumbnail", create_thumbnail)
+
+    app = dash.Dash(__name__)
+    app.layout = html.Div()
+    routes.create_routes(app, config)
+    client = app.server.test_client()
+    client.rendered = rendered
+
+    return client
+
+
+def test_thumbnail_serves_gallery_seeds(client):
+    response = client.get("/thumbnails/rsym/1.png")
+
+    assert response.status_code == 200
+    assert response.data == b"rsym-1"
+
+
+@pytest.mark.parametrize("path", ["/thumbnails/csym/4.png", "/thumbnails/rsym/0.png", f"/thumbnails/csym/{2 ** 32}.png", "/thumbnails/other/0.png"])
+def test_thumbnail_rejects_seeds_outside_the_gallery(client, path):
+    assert client.get(path).status_code == 404
+    assert client.rendered == []
+
+
+def test_thumbnail_rejects_requests_while_rendering(client, monkeypatch):
+    rendering, release = threading.Event(), threading.Event()
+    def create_thumbnail(config, model, seed):
+        rendering.set()
+        release.wait(5)
+        return b"png"
+    monkeypatch.setattr(routes, "create_thumbnail", create_thumbnail)
+
+    first = threading.Thread(target=client.get, args=("/thumbnails/csym/0.png",))
+    first.start()
+    rendering.wait(5)
+    response = client.get("/thumbnails/rsym/1.png")
+    release.set()
+    first.join(5)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.fixture
+def designs(client, monkeypatch, tmp_path):
+    """Serves designs from a store, the engine only counts its calls."""
+
+    calls = []
+    def resample_design(config, model, seed):
+        calls.append((model, seed))
+        return {"seed": seed}, None, True
+    monkeypatch.setattr(routes, "resample_design", resample_design)
+    monkeypatch.setattr(routes, "mesh_design", lambda parameters, config, model, purpose: parameters)
+    monkeypatch.setattr(routes, "encode_design", lambda mesh, config, format: json.dumps(mesh).encode())
+    store = SharedStore(str(tmp_path / "store"))
+    monkeypatch.setattr(routes, "get_store", lambda: store)
+    client.calls = calls
+
+    return client
+
+
+def test_design_is_cached_by_its_url(designs, config):
+    url = routes.get_design_url(config, "csym", 7, "stl")
+
+    first = designs.get(url)
+    second = designs.get(url)
+    revalidated = designs.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.status_code == second.status_code == 200
+    assert second.data == first.data == b'{"seed": 7}'
+    assert revalidated.status_code == 304
+    assert designs.calls == [("csym", 7)]
+
+
+def test_design_rejects_unknown_urls(designs, config):
+    digest = routes.get_design_digest(config, "csym")
+
+    assert designs.get(f"/designs/csym/{get_max_seed(config) + 1}/{digest}.stl").status_code == 404
+    assert designs.get(f"/designs/csym/{2 ** 32}/{digest}.stl").status_code == 404
+    assert designs.get("/designs/csym/7/0123456789abcdef.stl").status_code == 404
+    assert designs.calls == []
+
+
+def test_design_digest_depends_on_generation_settings_only(config, monkeypatch):
+    digest = routes.get_design_digest(config, "csym")
+
+    changed = copy.deepcopy(config)
+    changed["engine"]["store"]["max_bytes"] += 1
+    changed["engine"]["warm_up"] = not changed["engine"]["warm_up"]
+    assert routes.get_design_digest(changed, "csym") == digest
+
+    changed["engine"]["mesh"]["export"]["tolerance"] *= 2
+    assert routes.get_design_digest(changed, "csym") != digest
+
+    monkeypatch.setattr(routes, "GEOMETRY_VERSION", routes.GEOMETRY_VERSION + 1)
+    assert routes.get_design_digest(config, "csym") != digest
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+from src.startup import APP_MODULES, ENGINE_MODULES, profile_startup
+
+# Root of the repository, which holds the config and the src package
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_profile_startup_reports_every_step(capsys):
+    report = profile_startup(os.path.join(ROOT, "config.yml"))
+
+    names = [name for name, _ in report]
+    assert names[:len(APP_MODULES + ENGINE_MODULES)] == [f"import {name}" for name in APP_MODULES + ENGINE_MODULES]
+    assert {"read_config", "create_app", "create_callbacks", "warm_up csym", "warm_up rsym"} <= set(names)
+    assert all(duration >= 0 for _, duration in report)
+    assert "total" in capsys.readouterr().out
+
+
+def test_app_does_not_import_engine_only_modules():
+    # A fresh interpreter, the tests have imported the engine-only modules already
+    code = "import sys, src.ui; print(','.join(name for name in ('scipy', 'sklearn', 'stl') if name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == ""
@@ -0,0 +1,81 @@
+import os
+import numpy as np
+
+import src.store as store
+from src.store import SharedStore, get_key
+
+
+def test_put_and_get_arrays(tmp_path):
+    shared = SharedStore(str(tmp_path))
+
+    shared.put("entry", {"x": np.arange(4)})
+
+    np.testing.assert_array_equal(shared.get_arrays("entry")["x"], np.arange(4))
+    assert shared.get_arrays("missing") is None
+
+
+def test_evict_removes_least_recently_used_entries(tmp_path):
+    shared = SharedStore(str(tmp_path), max_bytes=10 ** 9)
+    for index in range(4):
+        shared.put(f"entry-{index}", {"x": np.zeros(1000)})
+        os.utime(shared.get_path(f"entry-{index}"), (index, index))
+
+    shared.max_bytes = 2 * 8200
+    shared.evict()
+
+    assert shared.get_arrays("entry-0") is None and shared.get_arrays("entry-1") is None
+    assert shared.get_arrays("entry-2") is not None and shared.get_arrays("entry-3") is not None
+
+
+def test_remove_takes_entry_out_before_deleting_its_files(tmp_path, monkeypatch):
+    shared = SharedStore(str(tmp_path))
+    shared.put("entry", {"x": np.arange(4), "y": np.arange(4)})
+    path = shared.get_path("entry")
+    visible = []
+
+    # Readers must not find the entry while its files are deleted
+    rmtree = store.shutil.rmtree
+    def record(trash, **kwargs):
+        visible.append(os.path.exists(path))
+        rmtree(trash, **kwargs)
+    monkeypatch.setattr(store.shutil, "rmtree", record)
+
+    shared.remove(path)
+
+    assert visible == [False]
+    assert shared.get_arrays("entry") is None
+    assert os.listdir(os.path.dirname(path)) == []
+
+
+def test_clear_removes_entries_of_previous_runs(tmp_path):
+    shared = SharedStore(str(tmp_path))
+    shared.put("entry", {"x": np.arange(4)})
+    shared.put("topology", {"x": np.arange(4)}, pinned=True)
+
+    SharedStore(str(tmp_path)).clear()
+
+    assert shared.get_arrays("entry") is None
+    assert shared.get_arrays("topology", pinned=True) is None
+
+
+def test_get_key_depends_on_format_version(monkeypatch):
+    key = get_key("mesh", {"seed": 1})
+    monkeypatch.setattr(store, "FORMAT_VERSION", store.FORMAT_VERSION + 1)
+
+    assert get_key("mesh", {"seed": 1}) != key
+
+
+def test_put_evicts_once_enough_was_written(tmp_path, monkeypatch):
+    shared = SharedStore(str(tmp_path), max_bytes=10 ** 9, scan_bytes=3 * 8000)
+    scans = []
+    evict = shared.evict
+    def record():
+        scans.append(len(os.listdir(os.path.join(str(tmp_path), "entries"))))
+        evict()
+    monkeypatch.setattr(shared, "evict", record)
+
+    for index in range(9):
+        shared.put(f"entry-{index}", {"x": np.zeros(1000)})
+    shared.put("entry-0", {"x": np.zeros(1000)})
+
+    assert scans == [3, 6, 9]
@@ -0,0 +1,57 @@
+import numpy as np
+
+import src.sweep as sweep
+
+from src.engine import get_plan
+from src.sweep import evaluate_sample, summarize_sweep
+
+
+def sample_parameters(config: dict, model: str, seed: int = 7) -> dict:
+    """Scales the center of the parameter space of a model."""
+
+    plan = get_plan(config, model)
+    return plan.scale(np.full(plan.dimensions, 0.5), seed)
+
+
+def test_unvalidated_designs_are_not_invalid(config):
+    config["models"]["rsym"]["validate"] = False
+    metrics = evaluate_sample(config, "rsym", sample_parameters(config, "rsym"))
+
+    assert not metrics["validated"] and not metrics["valid"]
+    assert np.isnan(metrics["num_intersections"])
+    assert metrics["closed"] == metrics["watertight"]
+
+
+def test_validated_designs_count_intersections(config):
+    metrics = evaluate_sample(config, "csym", sample_parameters(config, "csym"))
+
+    assert metrics["validated"]
+    assert metrics["valid"] == (metrics["watertight"] and metrics["num_intersections"] == 0)
+    assert metrics["closed"] == metrics["valid"]
+
+
+def test_summary_reports_not_validated_separately():
+    columns = {
+        "width": np.array([0.0, 1.0, 2.0, 3.0]),
+        "valid": np.array([True, False, False, False]),
+        "validated": np.array([True, True, False, False]),
+        "failed": np.array([False, True, False, False]),
+        "design_time": np.array([0.001, np.nan, 0.001, 0.001]),
+        "mesh_time": np.full(4, 0.001),
+        "validate_time": np.full(4, 0.001),
+    }
+
+    lines = summarize_sweep(columns, ["width"])
+
+    assert lines[0].startswith("valid 50%, not validated 50%, failed 1")
+    assert lines[2].split()[1:] == ["100%/3", "0%/-", "n/a/3", "n/a/3"]
+
+
+def test_failed_designs_are_recorded_as_invalid(config, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("degenerate mesh")
+    monkeypatch.setattr(sweep, "analyze_mesh", fail)
+
+    metrics = evaluate_sample(config, "csym", sample_parameters(config, "csym"))
+
+    assert metrics["failed"] and metrics["validated"] and not metrics["valid"]
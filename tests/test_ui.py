@@ -0,0 +1,10 @@
+from src.ui import create_gallery
+
+
+def test_gallery_loads_thumbnails_lazily(config):
+    tiles = create_gallery(config)
+
+    assert len(tiles) == config["app"]["gallery"]["num_thumbnails"]
+    for tile in tiles:
+        assert 'loading="lazy"' in tile.children.children
+        assert f'/thumbnails/{tile.id["model"]}/{tile.id["seed"]}.png' in tile.children.children
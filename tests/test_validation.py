@@ -0,0 +1,68 @@
+import warnings
+import numpy as np
+import matplotlib.tri as mtri
+
+from src.engine import sample_parameters, evaluate_design
+from src.validation import find_self_intersections, find_candidate_pairs, iterate_candidate_pairs, get_morton_codes
+
+
+def generate_crossing_strips(num_strips: int = 8) -> tuple:
+    """Generates pairs of triangles which pierce each other, one pair per strip."""
+
+    x, y, z, faces = [], [], [], []
+    for strip in range(num_strips):
+        offset = 3 * strip
+        # A horizontal triangle and a vertical triangle through its middle
+        x += [offset, offset + 2, offset, offset + 0.5, offset + 0.5, offset + 0.5]
+        y += [0, 0, 2, 0.5, 0.5, 0.5]
+        z += [0, 0, 0, -1, 1, -1]
+        y[-1] = 1.5
+        first = 6 * strip
+        faces += [[first, first + 1, first + 2], [first + 3, first + 4, first + 5]]
+
+    x, y, z = np.array(x, dtype=float), np.array(y, dtype=float), np.array(z, dtype=float)
+
+    return x, y, z, mtri.Triangulation(x, y, triangles=np.array(faces))
+
+
+def test_find_self_intersections_finds_all_pairs():
+    intersections = find_self_intersections(*generate_crossing_strips())
+
+    assert len(intersections) == 8
+
+
+def test_find_self_intersections_stops_at_max_pairs():
+    intersections = find_self_intersections(*generate_crossing_strips(), max_pairs=1, chunk_size=2)
+
+    assert 1 <= len(intersections) < 8
+
+
+def test_morton_codes_of_flat_single_precision_points():
+    points = np.random.default_rng(0).uniform(size=(100, 3)).astype(np.float32)
+    points[:, 2] = 1
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        codes = get_morton_codes(points)
+
+    assert codes.min() >= 0 and codes.max() < 2 ** 30
+
+
+def test_candidate_pairs_are_found_chunk_by_chunk():
+    corners = np.random.default_rng(0).uniform(size=(500, 3))
+    lower, upper = corners - 0.05, corners + 0.05
+
+    chunks = list(iterate_candidate_pairs(lower, upper, chunk_size=16))
+    pairs = find_candidate_pairs(lower, upper)
+
+    assert len(chunks) > 1
+    assert {tuple(pair) for chunk in chunks for pair in chunk} == {tuple(pair) for pair in pairs}
+
+
+def test_find_self_intersections_drops_collapsed_triangles(config):
+    # Edginess below -1 overflows the radius, which collapses most triangles of the raw design
+    parameters = sample_parameters(config, "csym", 3)
+    parameters["edginess"] = -1.2
+    (x, y, z, triangles), _ = evaluate_design(parameters, "csym")
+
+    assert len(find_self_intersections(x, y, z, triangles, max_pairs=1)) == 0